@@ -4,6 +4,12 @@ import json
 import os
 from pathlib import Path
 from streamlit_agraph import agraph, Node, Edge, Config
+from src.graph.graph_index import GraphIndex
+from src.sentiment_rollups import ROLLUP_DIR, SENTIMENTS, load_rollups
+from src.graph.graph_store import graph_binary_dir, graph_binary_exists, load_graph_binary, NodeRecords
+from src.utils.artifact_cache import LiveArtifact
+from src.utils.thumbnail_cache import ThumbnailCache
+from src.utils.title_search import TitleSearchIndex
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -15,105 +21,177 @@ st.set_page_config(
 
 # --- Configuration ---
 DATA_DIR = Path("data")
-ANALYZED_CSV_PATH = DATA_DIR / "analyzed_data.csv"
 GRAPH_JSON_PATH = DATA_DIR / "graph/fandom_graph_data_combined.json"
+# Ego-network view: largest neighborhood drawn at once, and how many name
+# matches are offered when picking its center
+EGO_MAX_NODES = 300
+EGO_CENTER_MATCHES = 10
 
 # --- Data Loading Functions ---
 
-@st.cache_data
-def load_scandal_data(filepath):
-    """Loads Phase 1 Sentiment Data"""
-    if not filepath.exists():
-        return None
-    df = pd.read_csv(filepath)
-    df['timestamp_utc'] = pd.to_datetime(df['timestamp_utc'], errors='coerce')
-    df.dropna(subset=['timestamp_utc'], inplace=True)
-    return df
+@st.cache_resource
+def live_artifacts():
+    """
+    Data for this process, each loaded in the background and swapped for the
+    new version whenever a builder rewrites it. Both are created here, before
+    anything waits on either, so their first loads run side by side.
+      - "scandal": Phase 1 Sentiment rollups (small pre-aggregated tables, see sentiment_rollups.py)
+      - "graph": Phase 2 Graph Data
+    """
+    return {
+        "scandal": LiveArtifact([ROLLUP_DIR], lambda: load_rollups(ROLLUP_DIR), name="sentiment rollups"),
+        "graph": LiveArtifact(
+            [GRAPH_JSON_PATH, graph_binary_dir(str(GRAPH_JSON_PATH))],
+            lambda: load_graph_data(GRAPH_JSON_PATH),
+            name="creator graph",
+        ),
+    }
+
+@st.cache_resource
+def thumbnail_cache():
+    """Local avatars prefetched by the graph builders (falls back to the remote URL)."""
+    return ThumbnailCache()
 
-@st.cache_data
 def load_graph_data(filepath):
-    """Loads Phase 2 Graph Data"""
+    """
+    Loads Phase 2 Graph Data with its ID/adjacency index.
+    Prefers the memory-mapped binary copy next to the JSON file.
+    Returns: (NodeRecords, GraphIndex) or None. Shared across sessions: read-only.
+    Node dicts are built per row on access, with missing values as None.
+    """
+    binary_dir = graph_binary_dir(str(filepath))
+    if graph_binary_exists(binary_dir):
+        return load_graph_binary(binary_dir)
     if not filepath.exists():
         return None
     with open(filepath, 'r') as f:
         data = json.load(f)
-    return data
+    return NodeRecords(pd.DataFrame(data['nodes'])), GraphIndex.from_graph_data(data)
+
+def to_agraph_elements(nodes, index, rows):
+    """agraph Nodes/Edges for the given node rows, at their precomputed t-SNE positions."""
+    thumbnails = thumbnail_cache()
+    agraph_nodes = []
+    for row in rows:
+        n = nodes[row]
+        agraph_nodes.append(Node(
+            id=n['id'],
+            label=n['label'],
+            size=50,
+            shape="circularImage",
+            image=thumbnails.static_url(n.get('image')) or "", # YouTube Avatar, served from the local cache
+            title=n.get('title') or n['label'], # Hover text
+            x=n.get('x') or 0,
+            y=n.get('y') or 0
+        ))
+
+    agraph_edges = []
+    for source, target, weight in zip(*index.subgraph_edges(rows)):
+        agraph_edges.append(Edge(
+            source=index.ids[source],
+            target=index.ids[target],
+            # Thickness based on similarity score
+            width=float(weight) * 2,
+            color="#cccccc"
+        ))
+    return agraph_nodes, agraph_edges
+
+@st.cache_resource(max_entries=2)
+def node_title_index(_nodes, version):
+    """Trigram search over node labels, built once per graph version."""
+    return TitleSearchIndex(_nodes.column('label'))
+
+@st.cache_resource(max_entries=2)
+def full_graph_elements(_nodes, _index, version):
+    """Full-graph Nodes/Edges, built once per graph version."""
+    return to_agraph_elements(_nodes, _index, range(len(_nodes)))
 
 # --- Tab 1: Scandal-O-Meter Logic ---
-# def render_scandal_dashboard(df):
-#     st.subheader("High-Level Summary: Hasan 'Shock Collar' Incident")
-
-#     # KPIs
-#     total_comments = len(df)
-#     sentiment_counts = df['sentiment_label'].value_counts()
-#     total_negative = sentiment_counts.get('Negative', 0)
-#     neg_percentage = (total_negative / total_comments) * 100 if total_comments > 0 else 0
-
-#     # Gauge
-#     col_gauge, col_stats = st.columns([1, 2])
-#     with col_gauge:
-#         st.write("### Scandal Score")
-#         st.gauge(
-#             value=neg_percentage,
-#             min_value=0,
-#             max_value=100,
-#             label="Negative Sentiment %",
-#             format_string=f"{neg_percentage:.1f}%"
-#         )
-#     with col_stats:
-#         st.write("### Sentiment Breakdown")
-#         c1, c2, c3 = st.columns(3)
-#         c1.metric("Negative", f"{total_negative:,}", delta_color="inverse")
-#         c2.metric("Positive", f"{sentiment_counts.get('Positive', 0):,}")
-#         c3.metric("Neutral", f"{sentiment_counts.get('Neutral', 0):,}")
-
-#     # Keywords
-#     st.divider()
-#     st.subheader("receipts: Top Negative Keywords")
-#     negative_comments = df[df['sentiment_label'] == 'Negative']
-#     keyword_counts = negative_comments['keywords'].str.split(', ').explode().value_counts()
-#     keyword_counts = keyword_counts[keyword_counts.index != '']
-    
-#     st.dataframe(
-#         keyword_counts.head(15), 
-#         column_config={"index": "Keyword", "value": "Count"},
-#         use_container_width=True
-#     )
+def render_scandal_dashboard(rollups):
+    st.subheader("High-Level Summary: Hasan 'Shock Collar' Incident")
+
+    # KPIs (every number below comes from the rollups, not the raw comments)
+    sentiment_counts = rollups['totals'].set_index('sentiment')['count']
+    total_comments = int(sentiment_counts.sum())
+    total_negative = int(sentiment_counts.get('Negative', 0))
+    neg_percentage = (total_negative / total_comments) * 100 if total_comments > 0 else 0
+
+    # Gauge
+    col_gauge, col_stats = st.columns([1, 2])
+    with col_gauge:
+        st.write("### Scandal Score")
+        st.metric("Negative Sentiment %", f"{neg_percentage:.1f}%")
+        st.progress(min(neg_percentage / 100, 1.0))
+    with col_stats:
+        st.write("### Sentiment Breakdown")
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Negative", f"{total_negative:,}", delta_color="inverse")
+        c2.metric("Positive", f"{int(sentiment_counts.get('Positive', 0)):,}")
+        c3.metric("Neutral", f"{int(sentiment_counts.get('Neutral', 0)):,}")
+
+    # Timeline
+    st.divider()
+    st.subheader("Sentiment Over Time")
+    by_time = rollups['by_time']
+    if not by_time.empty:
+        st.line_chart(by_time.set_index('bucket')[SENTIMENTS])
+
+    # Per video / per creator
+    col_video, col_creator = st.columns(2)
+    with col_video:
+        st.write("### By Video")
+        st.dataframe(rollups['by_video'], hide_index=True, use_container_width=True)
+    with col_creator:
+        if not rollups['by_creator'].empty:
+            st.write("### By Creator")
+            st.dataframe(rollups['by_creator'], hide_index=True, use_container_width=True)
+
+    # Keywords
+    st.divider()
+    st.subheader("Receipts: Top Negative Keywords")
+    if not rollups['keywords'].empty:
+        st.dataframe(
+            rollups['keywords'].head(15),
+            column_config={"keyword": "Keyword", "count": "Count"},
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        st.info("No negative keywords found.")
 
 # --- Tab 2: Creator Galaxy Logic ---
-def render_creator_galaxy(graph_data):
+def render_creator_galaxy(nodes, index, version):
     st.subheader("The Creator Galaxy (Semantic Similarity)")
     
     col_graph, col_details = st.columns([3, 1])
 
     with col_graph:
-        # 1. Convert JSON data to agraph Nodes
-        nodes = []
-        for n in graph_data['nodes']:
-            nodes.append(Node(
-                id=n['id'],
-                label=n['label'],
-                size=50,
-                shape="circularImage",
-                image=n['image'], # Displays their YouTube Avatar
-                # title=f"{n['label']} ({n['subscribers']} subs)", # Hover text
-                # We use the calculated MDS coordinates for initial positioning
-                x=n.get('x', 0), 
-                y=n.get('y', 0)
-            ))
-
-        # 2. Convert JSON data to agraph Edges
-        edges = []
-        for e in graph_data['edges']:
-            edges.append(Edge(
-                source=e['source'],
-                target=e['target'],
-                # Thickness based on similarity score
-                width=e['weight'] * 2,
-                color="#cccccc"
-            ))
-
-        # 3. Configure the Graph Physics
+        # 1. Choose what to draw: everything, or one creator's k-hop neighborhood
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c1:
+            view = st.radio("View", ["Full graph", "Ego network"], horizontal=True)
+        if view == "Ego network":
+            # Names are resolved here, so only the few matches reach the browser
+            clicked = index.row_of.get(st.session_state.get("graph_center"))
+            with c2:
+                query = st.text_input("Center creator", nodes[clicked]['label'] if clicked is not None else "")
+                matches, _ = node_title_index(nodes, version).search(query, limit=EGO_CENTER_MATCHES)
+                center = None
+                if len(matches):
+                    center = st.selectbox("Matches", matches.tolist(), format_func=lambda row: nodes[row]['label'],
+                                          label_visibility="collapsed")
+            with c3:
+                hops = st.slider("Hops", 1, 3, 1)
+            if center is None:
+                st.info("Type a creator's name to center the view on them.")
+                agraph_nodes, agraph_edges = [], []
+            else:
+                rows = index.ego_rows(center, hops, max_nodes=EGO_MAX_NODES)
+                agraph_nodes, agraph_edges = to_agraph_elements(nodes, index, rows)
+        else:
+            agraph_nodes, agraph_edges = full_graph_elements(nodes, index, version)
+
+        # 2. Configure the Graph: fixed t-SNE positions, no live physics
         config = Config(
             width="100%",
             height=600,
@@ -121,67 +199,71 @@ def render_creator_galaxy(graph_data):
             nodeHighlightBehavior=True, 
             highlightColor="#F7A241", # Orange highlight on hover
             collapsible=False,
-            # Physics settings for a "bouncy" but stable graph
-            physics={
-                "enabled": True,
-                "stabilization": {"iterations": 100}
-            }
+            physics={"enabled": False}
         )
 
-        # 4. Render!
-        return_value = agraph(nodes=nodes, edges=edges, config=config)
+        # 3. Render!
+        return_value = agraph(nodes=agraph_nodes, edges=agraph_edges, config=config)
 
-    # 5. Interactivity: Show details when a node is clicked
+    # 4. Interactivity: Show details when a node is clicked
     with col_details:
         st.info("👆 Click a node to see details.")
         
-        if return_value:
-            # Find the clicked node data
-            selected_node = next((n for n in graph_data['nodes'] if n['id'] == return_value), None)
+        if return_value and return_value in index.row_of:
+            # Remember the click so the ego view can center on it
+            st.session_state["graph_center"] = return_value
+            row = index.row_of[return_value]
+            selected_node = nodes[row]
+
+            if selected_node.get('image'):
+                st.image(thumbnail_cache().image_source(selected_node['image']), width=100)
+            st.markdown(f"### {selected_node['label']}")
+            # YouTube graph nodes carry subscriber counts; Fandom nodes a bio preview
+            subscribers = selected_node.get('subscribers')
+            if isinstance(subscribers, (int, float)) or str(subscribers).isdigit():
+                st.markdown(f"**Subscribers:** {int(subscribers):,}")
+            if selected_node.get('meta_description'):
+                st.caption(selected_node['meta_description'])
+            
+            # Connected creators, strongest first
+            st.markdown("#### Closest Connections:")
+            neighbor_rows, neighbor_weights = index.neighbors(row)
             
-            if selected_node:
-                st.image(selected_node['image'], width=100)
-                st.markdown(f"### {selected_node['label']}")
-                st.markdown(f"**Subscribers:** {int(selected_node['subscribers']):,}")
-                
-                # Find connected creators (neighbors)
-                st.markdown("#### Closest Connections:")
-                neighbors = []
-                for e in graph_data['edges']:
-                    if e['source'] == selected_node['id']:
-                        neighbors.append(e['target'])
-                    elif e['target'] == selected_node['id']:
-                        neighbors.append(e['source'])
-                
-                # Match IDs back to Names
-                neighbor_names = [n['label'] for n in graph_data['nodes'] if n['id'] in neighbors]
-                
-                if neighbor_names:
-                    for name in neighbor_names:
-                        st.caption(f"🔗 {name}")
-                else:
-                    st.write("No strong connections found.")
+            if len(neighbor_rows):
+                for neighbor, weight in zip(neighbor_rows, neighbor_weights):
+                    st.caption(f"🔗 {nodes[neighbor]['label']} ({weight:.2f})")
+            else:
+                st.write("No strong connections found.")
 
 # --- Main Application ---
 def main():
     st.title("Content Creator Mapping") #"Controversy Early Warning System",)
-    
+    artifacts = live_artifacts()
+
     # Create Tabs
     tab1, tab2 = st.tabs(["🔥 Scandal-O-Meter", "🌌 Creator Galaxy"])
 
     # --- TAB 1: SCANDAL METER ---
-    # with tab1:
-    #     df = load_scandal_data(ANALYZED_CSV_PATH)
-    #     if df is not None:
-    #         render_scandal_dashboard(df)
-    #     else:
-    #         st.warning("No scandal data found. Run Phase 1 pipeline.")
+    with tab1:
+        try:
+            rollups = artifacts["scandal"].get()
+        except Exception as e:
+            st.error(f"Could not load the scandal data: {e}")
+            rollups = None
+        if rollups is not None:
+            render_scandal_dashboard(rollups)
+        else:
+            st.warning("No scandal data found. Run Phase 1 pipeline (`python -m src.run_pipeline`).")
 
     # --- TAB 2: CREATOR GALAXY ---
     with tab2:
-        graph_data = load_graph_data(GRAPH_JSON_PATH)
-        if graph_data is not None:
-            render_creator_galaxy(graph_data)
+        try:
+            version, graph = artifacts["graph"].snapshot()
+        except Exception as e:
+            st.error(f"Could not load the graph data: {e}")
+            version, graph = None, None
+        if graph is not None:
+            render_creator_galaxy(*graph, version)
         else:
             st.warning("No graph data found. Run `python run_pipeline.py` to build the graph.")
 
@@ -5,6 +5,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 import os
 from pathlib import Path
+from src.utils.columnar import read_frame, table_exists
+from src.utils.text_store import TextStore
+from src.utils.title_search import TitleSearchIndex
+from src.utils.artifact_cache import LiveArtifact
+from src.utils.thumbnail_cache import ThumbnailCache
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -19,6 +24,17 @@ DATA_DIR = Path("data")
 ANALYZED_CSV_PATH = DATA_DIR / "analyzed_data.csv"
 # Using the UMAP path from your snippet
 STARMAP_CSV_PATH = DATA_DIR / "processed/plotly/starmap_data_tsne_trimmed_120_labeled.csv"
+# Fast-load files written by starmap_builder.export_starmap (preferred over the CSV)
+STARMAP_COLUMNS_DIR = DATA_DIR / "processed/plotly/starmap_columns_tsne_120"
+STARMAP_DESCRIPTIONS_DB = DATA_DIR / "processed/plotly/starmap_descriptions_tsne_120.sqlite"
+# Level of detail: unfocused clusters are drawn as a LOD_SAMPLE_POINTS sample plus
+# one glyph per cluster (see build_base_traces). On by default above LOD_MIN_POINTS
+# creators, and can be switched on below that to shrink every rerun's payload.
+LOD_MIN_POINTS = 20_000
+LOD_SAMPLE_POINTS = 15_000
+# Marker diameters in pixels
+MARKER_SIZES = {'base': 5, 'dimmed': 3, 'selected': 12, 'match': 14}
+PALETTE = px.colors.qualitative.Dark24 + px.colors.qualitative.Light24
 
 # --- Data Loading ---
 # @st.cache_data
@@ -29,15 +45,150 @@ STARMAP_CSV_PATH = DATA_DIR / "processed/plotly/starmap_data_tsne_trimmed_120_la
 #     df.dropna(subset=['timestamp_utc'], inplace=True)
 #     return df
 
-@st.cache_data
-def load_starmap_data(filepath):
-    if not filepath.exists(): return None
-    df = pd.read_csv(filepath)
+def load_starmap_data(columns_dir, csv_path):
+    """
+    Loads the star map. Prefers the columnar table, which has no
+    descriptions and whose numeric columns are memory-mapped (read-only);
+    falls back to the labeled CSV.
+    """
+    if table_exists(columns_dir):
+        df = read_frame(columns_dir, mmap=True)
+    elif csv_path.exists():
+        df = pd.read_csv(csv_path)
+    else:
+        return None
     if 'youtube_url' not in df.columns:
         df['youtube_url'] = ""
     df['youtube_url'] = df['youtube_url'].fillna("")
     return df
 
+@st.cache_resource
+def starmap_artifact():
+    """
+    The star map for this process: loaded in the background at startup and
+    reloaded (then swapped in) whenever the builder rewrites its files.
+    Shared by all sessions, never copied per rerun, so treat it as read-only.
+    """
+    return LiveArtifact(
+        [STARMAP_COLUMNS_DIR, STARMAP_CSV_PATH, STARMAP_DESCRIPTIONS_DB],
+        lambda: load_starmap_data(STARMAP_COLUMNS_DIR, STARMAP_CSV_PATH),
+        name="star map",
+    )
+
+@st.cache_resource
+def thumbnail_cache():
+    """Local thumbnails prefetched by the builder (falls back to the remote URL)."""
+    return ThumbnailCache()
+
+# Derived structures below are keyed by the star map version; keep the
+# current and previous one only.
+@st.cache_resource(max_entries=2)
+def load_description_store(db_path, dataset_key):
+    return TextStore(str(db_path)) if db_path.exists() else None
+
+@st.cache_resource(max_entries=2)
+def load_spatial_index(_df, dataset_key):
+    """KD-tree over the 3D coordinates, built once per loaded dataset (`dataset_key`)."""
+    from scipy.spatial import cKDTree
+    return cKDTree(_df[['x', 'y', 'z']].to_numpy(dtype=np.float64))
+
+@st.cache_resource(max_entries=2)
+def load_title_index(_df, dataset_key):
+    """Trigram search index over creator titles, built once per loaded dataset."""
+    return TitleSearchIndex(_df['title'].tolist())
+
+@st.cache_resource(max_entries=2)
+def load_cluster_rows(_df, dataset_key):
+    """{cluster_name: row indices}, computed once per loaded dataset."""
+    return {str(k): v for k, v in _df.groupby(_df['cluster_name'].astype(str)).indices.items()}
+
+def cluster_color_map(clusters):
+    return {str(c): PALETTE[i % len(PALETTE)] for i, c in enumerate(sorted(str(c) for c in clusters))}
+
+def points_trace(df, rows, name, color, size, opacity=0.7, showlegend=True):
+    """One marker trace for the given dataframe rows (rows ride along as customdata)."""
+    rows = np.asarray(rows, dtype=np.int64)
+    # float32 is plenty for plotting and halves the coordinates sent to the browser
+    return go.Scatter3d(
+        x=df['x'].to_numpy(dtype=np.float32)[rows],
+        y=df['y'].to_numpy(dtype=np.float32)[rows],
+        z=df['z'].to_numpy(dtype=np.float32)[rows],
+        mode='markers',
+        name=name,
+        marker=dict(size=size, color=color),
+        opacity=opacity,
+        hovertext=df['title'].to_numpy()[rows],
+        hovertemplate="%{hovertext}<extra></extra>",
+        customdata=rows,
+        showlegend=showlegend,
+    )
+
+@st.cache_resource(max_entries=4)
+def build_base_traces(_df, dataset_key, highlighted, lod):
+    """
+    Static background of the galaxy, built once per dataset, highlighted group
+    (None = every cluster colored; otherwise the other clusters, dimmed) and
+    level-of-detail setting.
+
+    With `lod` the background is a stratified sample of LOD_SAMPLE_POINTS
+    creators plus one centroid glyph per cluster. Full member points are only
+    sent for the highlighted cluster and matches.
+
+    Streamlit re-sends the whole figure on every rerun, base included, so the
+    background's size is what each click costs; `lod` is what bounds it.
+    """
+    cluster_rows = load_cluster_rows(_df, dataset_key)
+    color_map = cluster_color_map(cluster_rows)
+    dimmed = highlighted is not None
+    rng = np.random.default_rng(42)
+
+    shown = {}
+    for name, rows in cluster_rows.items():
+        if name == highlighted:
+            continue  # drawn in full on top, no need to send it twice
+        if lod:
+            keep = max(1, int(np.ceil(len(rows) * LOD_SAMPLE_POINTS / len(_df))))
+            rows = np.sort(rng.choice(rows, min(keep, len(rows)), replace=False))
+        shown[name] = rows
+
+    if dimmed:
+        rows = np.concatenate(list(shown.values())) if shown else np.array([], dtype=np.int64)
+        traces = [points_trace(_df, rows, 'Background', '#222222', MARKER_SIZES['dimmed'], showlegend=False)]
+    else:
+        traces = [
+            points_trace(_df, shown[name], name, color_map[name], MARKER_SIZES['base'])
+            for name in sorted(shown)
+        ]
+
+    if lod:
+        names = sorted(cluster_rows)
+        xyz = _df[['x', 'y', 'z']].to_numpy()
+        centers = np.array([xyz[cluster_rows[n]].mean(axis=0) for n in names])
+        counts = np.array([len(cluster_rows[n]) for n in names])
+        traces.append(go.Scatter3d(
+            x=centers[:, 0], y=centers[:, 1], z=centers[:, 2],
+            mode='markers',
+            name='Cluster centers',
+            marker=dict(
+                size=6 + 14 * np.sqrt(counts / counts.max()),
+                color='#444444' if dimmed else [color_map[n] for n in names],
+                symbol='diamond',
+                line=dict(color='white', width=1),
+            ),
+            opacity=0.9,
+            hovertext=[f"{n} ({c:,} creators)" for n, c in zip(names, counts)],
+            hovertemplate="%{hovertext}<extra></extra>",
+            customdata=np.full(len(names), -1),
+        ))
+    return traces
+
+def get_description(row, dataset_key):
+    """Bio for one creator, fetched by ID only when it is shown."""
+    store = load_description_store(STARMAP_DESCRIPTIONS_DB, dataset_key)
+    if store is not None:
+        return store.get(row['id'])
+    return str(row.get('description', ''))
+
 # --- Components ---
 
 # def render_gauge(value):
@@ -89,12 +240,12 @@ def load_starmap_data(filepath):
 #     else:
 #         st.info("No negative keywords found.")
 
-def render_starmap(df):
-    """Tab 2: The Creator Galaxy (3D)"""
+def render_starmap(df, dataset_key):
+    """Tab 2: The Creator Galaxy (3D). `dataset_key` identifies this version of df."""
     st.subheader("The Creator Galaxy (3D Star Map)")
     
-    # Create a copy so we don't mutate the cached dataframe
-    df = df.copy()
+    # df is the shared cached frame: never mutate it here
+    cluster_rows = load_cluster_rows(df, dataset_key)
     
     col_map, col_info = st.columns([3, 1])
     
@@ -109,12 +260,17 @@ def render_starmap(df):
         with c2:
             # Get unique clusters for the dropdown
             if 'cluster_name' in df.columns:
-                clusters = sorted(df['cluster_name'].unique())
+                clusters = sorted(cluster_rows)
                 cluster_options = ["All"] + [str(c) for c in clusters]
             else:
                 clusters = []
                 cluster_options = ["All"]
             selected_cluster = st.selectbox("🎨 Highlight Group", cluster_options)
+        lod = st.toggle(
+            "⚡ Level of detail",
+            value=len(df) > LOD_MIN_POINTS,
+            help="Draw a sample of the other clusters plus one marker per cluster; every click redraws less.",
+        )
 
     # --- LIST SELECTION LOGIC (Sidebar) ---
     # We render this BEFORE the map logic so the selection can influence the map colors
@@ -124,7 +280,7 @@ def render_starmap(df):
             st.caption("Select one to highlight")
             
             # Filter for the list
-            cluster_df = df[df['cluster_name'].astype(str) == selected_cluster].sort_values('title')
+            cluster_df = df.iloc[cluster_rows[selected_cluster]].sort_values('title')
             
             # Show list with selection enabled
             selection = st.dataframe(
@@ -143,72 +299,36 @@ def render_starmap(df):
 
     # --- MAP LOGIC ---
     with col_map:
-        # 1. Base State
-        df['color_group'] = df['cluster_name'].astype(str)
-        df['size'] = 3 # Default size
-        
-        # 2. Colors
-        palette = px.colors.qualitative.Dark24 + px.colors.qualitative.Light24
-        cluster_color_map = {str(c): palette[i % len(palette)] for i, c in enumerate(clusters)}
-        cluster_color_map['Match'] = '#FF0000'     # Bright Red for Search/Selection
-        cluster_color_map['Background'] = '#222222' # Dark Gray for Dimmed items
-
-        if selected_cluster != "All":
-            # Identify rows that do NOT match the selection
-            mask_unselected = df['cluster_name'].astype(str) != selected_cluster
-            
-            # "Turn small" and gray out the unselected
-            df.loc[mask_unselected, 'size'] = 1
-            df.loc[mask_unselected, 'color_group'] = 'Background'
-            
-            # Highlight selected cluster
-            mask_selected = df['cluster_name'].astype(str) == selected_cluster
-            df.loc[mask_selected, 'size'] = 15
+        color_map = cluster_color_map(clusters)
 
-        # 3. Apply Search OR List Selection Highlight (Overrides Cluster logic)
-        mask_search = pd.Series(False, index=df.index)
-        mask_list = pd.Series(False, index=df.index)
-
-        # Check Search
+        # 1. Matches: Search OR List Selection (drawn on top of everything)
+        search_rows = []
         if search_query:
-            mask_search = df['title'].str.contains(search_query, case=False, na=False)
-        
-        # Check List Selection
+            # Ranked, typo-tolerant
+            search_rows, _ = load_title_index(df, dataset_key).search(search_query, limit=50)
+            if len(search_rows):
+                st.success(f"Found {len(search_rows)} matches!")
+
+        list_rows = []
         if list_selected_creator_title:
-            mask_list = df['title'] == list_selected_creator_title
+            list_rows = np.flatnonzero(df['title'].to_numpy() == list_selected_creator_title)
+        match_rows = np.union1d(search_rows, list_rows).astype(np.int64)
 
-        # Combine Matches
-        final_match_mask = mask_search | mask_list
+        # 2. Static base (cached) + the traces that change with this interaction
+        dimmed = selected_cluster != "All"
+        traces = list(build_base_traces(df, dataset_key, selected_cluster if dimmed else None, lod))
+        if dimmed:
+            traces.append(points_trace(
+                df, cluster_rows[selected_cluster], selected_cluster,
+                color_map[selected_cluster], MARKER_SIZES['selected']
+            ))
+        if len(match_rows):
+            traces.append(points_trace(df, match_rows, 'Match', '#FF0000', MARKER_SIZES['match'], opacity=0.9))
 
-        if final_match_mask.any():
-            df.loc[final_match_mask, 'color_group'] = 'Match' 
-            df.loc[final_match_mask, 'size'] = 20 # Super big
-            
-            if search_query:
-                st.success(f"Found {mask_search.sum()} matches!")
-        
-        # 4. Render Chart
-        fig = px.scatter_3d(
-            df, 
-            x='x', 
-            y='y', 
-            z='z',
-            color='color_group',
-            hover_name='title',
-            hover_data={
-                'description': False, 'cluster_name': False, 
-                'x': False, 'y': False, 'z': False, 
-                'color_group': False, 'size': False
-            },
-            custom_data=['thumbnail', 'description', 'title', 'youtube_url'],
-            size='size',
-            size_max=14,
-            opacity=0.7,
-            color_discrete_map=cluster_color_map,
-            title="Creator Semantic Clusters (3D)"
-        )
-        
+        # 3. Render Chart
+        fig = go.Figure(data=traces)
         fig.update_layout(
+            title="Creator Semantic Clusters (3D)",
             height=800, 
             scene=dict(
                 xaxis=dict(visible=False),
@@ -240,17 +360,20 @@ def render_starmap(df):
         # 2. Map Click (Visual exploration)
         # Note: If List is selected, it takes priority unless deselecting list.
         elif selected_points and selected_points['selection']['points']:
-            point_index = selected_points['selection']['points'][0]['point_index']
-            target_row = df.iloc[point_index]
+            # Every trace carries its dataframe rows as customdata (-1 = cluster glyph)
+            point = selected_points['selection']['points'][0]
+            row = int(fig.data[point['curve_number']].customdata[point['point_index']])
+            if row >= 0:
+                target_row = df.iloc[row]
 
         # 3. Search Query (Text search)
-        elif search_query and mask_search.any():
-            target_row = df[mask_search].iloc[0]
+        elif search_query and len(search_rows):
+            target_row = df.iloc[search_rows[0]]  # Best-ranked match
 
         if target_row is not None:
             # --- 1. Basic Details ---
             if pd.notna(target_row['thumbnail']) and str(target_row['thumbnail']).startswith('http'):
-                st.image(target_row['thumbnail'], width=150)
+                st.image(thumbnail_cache().image_source(target_row['thumbnail']), width=150)
             
             st.markdown(f"### {target_row['title']}")
             
@@ -263,7 +386,7 @@ def render_starmap(df):
             
             # --- 2. Truncated Description ---
             st.markdown("**Bio Preview:**")
-            desc = str(target_row['description'])
+            desc = get_description(target_row, dataset_key)
             if len(desc) > 300:
                 desc = desc[:300] + "..."
             st.write(desc)
@@ -273,20 +396,13 @@ def render_starmap(df):
             # --- 3. Nearest Neighbors Logic ---
             st.markdown("#### 🔭 Closest Creators")
             
-            tx, ty, tz = target_row['x'], target_row['y'], target_row['z']
-            
-            # Calculate Distance
-            distances = np.sqrt(
-                (df['x'] - tx)**2 + 
-                (df['y'] - ty)**2 + 
-                (df['z'] - tz)**2
-            )
-            
-            df_neighbors = df.copy()
-            df_neighbors['distance'] = distances
+            tree = load_spatial_index(df, dataset_key)
+            target = [target_row['x'], target_row['y'], target_row['z']]
             
-            # Filter self and get top 5
-            closest_df = df_neighbors[df_neighbors['distance'] > 0.0001].nsmallest(5, 'distance')
+            # Ask for a few extra so the creator itself (distance ~0) can be dropped
+            distances, rows = tree.query(target, k=list(range(1, min(len(df), 8) + 1)))
+            rows = rows[distances > 0.0001][:5]
+            closest_df = df.iloc[rows]
             
             st.dataframe(
                 closest_df[['title', 'cluster_name']],
@@ -303,6 +419,8 @@ def render_starmap(df):
 
 # --- Main ---
 def main():
+    # Start (or reuse) the background load before drawing anything else
+    starmap = starmap_artifact()
     st.title("🌌 Youtube Galaxy")
     st.markdown("""
     Explore the vast universe of YouTube creators clustered by content similarity.
@@ -316,12 +434,16 @@ def main():
     #     else: st.warning(f"No scandal data found at {ANALYZED_CSV_PATH}. Run Phase 1 pipeline.")
 
     # with tab2:
-    df_map = load_starmap_data(STARMAP_CSV_PATH)
+    try:
+        version, df_map = starmap.snapshot()
+    except Exception as e:
+        st.error(f"Could not load the star map: {e}")
+        version, df_map = None, None
     if df_map is not None: 
         if 'z' not in df_map.columns:
             st.error("⚠️ Data is 2D. Please run `python src/starmap_builder.py` to regenerate 3D data.")
         else:
-            render_starmap(df_map)
+            render_starmap(df_map, version)
     else: 
         st.warning(f"No star map data found at {STARMAP_CSV_PATH}. Run 'src/starmap_builder.py'.")
 
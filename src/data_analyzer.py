@@ -1,9 +1,8 @@
 import pandas as pd
 import os
 import torch
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-from keybert import KeyBERT
 from timeit import default_timer as timer
+from src.utils.model_registry import get_device, get_sentiment_pipeline, get_keybert
 
 DATA_DIR = "data"
 RAW_CSV_PATH = os.path.join(DATA_DIR, "raw_comments.csv")
@@ -18,37 +17,23 @@ def _find_device():
     
     Returns: torch.device, str
     """
-    if torch.cuda.is_available():
-        print("Device: CUDA")
-        return torch.device("cuda"), "GPU (CUDA)"
-    elif torch.backends.mps.is_available():
-        print("Device: MPS")
-        return torch.device("mps"), "GPU (MPS)"
-    else:
-        print("Device: CPU")
-        return torch.device("cpu"), "CPU"
+    device = get_device()
+    names = {"cuda": "GPU (CUDA)", "mps": "GPU (MPS)", "cpu": "CPU"}
+    return torch.device(device), names[device]
 
 def load_models():
     """Loads Sentiment and Keyword models.
     Also enables GPU is available(CUDA or MPS)
+    Models come from the process-wide registry, so calling this again (or
+    building the MiniLM graphs in the same process) does not reload them.
     """
-    device, device_name = _find_device()
+    _, device_name = _find_device()
     
-    # Load Sentiment Model
-    sentiment_tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL_ID)
-    sentiment_model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_ID)
-    sentiment_model = sentiment_model.to(device)
-
-    # Create pipeline for batching
-    sentiment_pipeline = pipeline(
-        task="sentiment-analysis",
-        model=sentiment_model,
-        tokenizer=sentiment_tokenizer,
-        device=device,
-    )
+    # Load Sentiment Model (pipeline handles batching)
+    sentiment_pipeline = get_sentiment_pipeline(SENTIMENT_MODEL_ID)
 
-    # Load Keyword Model
-    keyword_model = KeyBERT(model=KEYWORD_MODEL_ID)
+    # Load Keyword Model (shares the MiniLM SentenceTransformer with the graph builders)
+    keyword_model = get_keybert(KEYWORD_MODEL_ID)
 
     return sentiment_pipeline, keyword_model, device_name
 
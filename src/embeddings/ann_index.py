@@ -0,0 +1,192 @@
+import numpy as np
+from timeit import default_timer as timer
+from src.embeddings.quantize import QuantizedEmbeddings
+from src.graph.similarity_edges import normalize_rows
+from src.utils.benchmark_data import clustered_embeddings
+
+DEFAULT_NPROBE = 8
+
+
+def _assign(vectors, centroids, block=8192):
+    """Index of the most similar centroid for every vector (block-wise)."""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block):
+        labels[start:start + block] = np.argmax(vectors[start:start + block] @ centroids.T, axis=1)
+    return labels
+
+def train_centroids(vectors, n_lists, n_iter=10, train_size=50_000, seed=42):
+    """
+    Spherical k-means (cosine) on a random sample, in plain NumPy.
+    Returns: (n_lists, dim) array of unit-length centroids.
+    """
+    rng = np.random.default_rng(seed)
+    if len(vectors) > train_size:
+        vectors = vectors[rng.choice(len(vectors), train_size, replace=False)]
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+
+    for _ in range(n_iter):
+        labels = _assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        counts = np.bincount(labels, minlength=n_lists)
+        # Empty lists get re-seeded from a random vector
+        empty = counts == 0
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file (IVF) approximate nearest neighbor index over cosine similarity.
+
+    Vectors are bucketed by their nearest k-means centroid and stored grouped by
+    bucket (CSR layout: `list_offsets[l]:list_offsets[l+1]`). A query only scans
+    the `nprobe` buckets whose centroids are closest to it, so the cost is about
+    nprobe * N / n_lists dot products instead of N.
+
+    Vectors can be kept as float32, float16 or int8 codes (`storage`); queries
+    score the compact codes directly.
+    """
+
+    def __init__(self, centroids, vectors, ids, list_offsets, nprobe=DEFAULT_NPROBE):
+        self.centroids = centroids
+        self.vectors = vectors  # QuantizedEmbeddings
+        self.ids = np.asarray(ids).astype(str)
+        self.list_offsets = list_offsets
+        self.nprobe = nprobe
+        self._position = {creator_id: i for i, creator_id in enumerate(self.ids)}
+
+    @classmethod
+    def build(cls, embeddings, ids, n_lists=None, nprobe=DEFAULT_NPROBE, storage="float32", seed=42):
+        """
+        Trains the coarse quantizer and buckets every embedding.
+
+        Args:
+            embeddings (np.ndarray): (N, dim) embeddings.
+            ids (List[str]): Creator ID per row.
+            n_lists (int): Number of buckets (default ~4 * sqrt(N)).
+            nprobe (int): Buckets scanned per query by default.
+            storage (str): "float32", "float16" or "int8" vector storage.
+        """
+        vectors = normalize_rows(embeddings)
+        n = len(vectors)
+        if n_lists is None:
+            n_lists = int(4 * np.sqrt(n))
+        n_lists = int(min(max(n_lists, 1), n))
+
+        centroids = train_centroids(vectors, n_lists, seed=seed)
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        list_offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=n_lists))))
+        quantized = QuantizedEmbeddings.from_float(vectors, storage, normalize=False)
+        return cls(centroids, quantized.take(order), np.asarray(ids)[order], list_offsets, nprobe)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, embeddings, ids):
+        """Inserts new vectors into their nearest existing buckets (no retraining)."""
+        vectors = normalize_rows(embeddings)
+        labels = _assign(vectors, self.centroids)
+        new_vectors = QuantizedEmbeddings.from_float(vectors, self.vectors.mode, normalize=False)
+        counts = np.diff(self.list_offsets)
+        old_labels = np.repeat(np.arange(len(counts)), counts)
+
+        all_labels = np.concatenate((old_labels, labels))
+        order = np.argsort(all_labels, kind="stable")
+        self.vectors = self.vectors.concatenate(new_vectors).take(order)
+        self.ids = np.concatenate((self.ids, np.asarray(ids).astype(str)))[order]
+        self.list_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(all_labels, minlength=len(self.centroids))))
+        )
+        self._position = {creator_id: i for i, creator_id in enumerate(self.ids)}
+
+    def search(self, query, k=10, nprobe=None):
+        """
+        Approximate k most similar creators to one query embedding.
+
+        Returns:
+            (np.ndarray, np.ndarray): creator IDs and cosine similarities, best first.
+        """
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        query = normalize_rows(query).ravel()
+
+        probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        candidates = np.concatenate([
+            np.arange(self.list_offsets[l], self.list_offsets[l + 1]) for l in probe
+        ])
+        if len(candidates) == 0:
+            return self.ids[:0], np.empty(0, dtype=np.float32)
+
+        scores = self.vectors.dot(query, candidates)
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return self.ids[candidates[top]], scores[top]
+
+    def nearest_creators(self, creator_id, k=10, nprobe=None):
+        """k creators most similar to an indexed creator (excluding itself)."""
+        query = self.vectors.dequantize([self._position[creator_id]])[0]
+        ids, scores = self.search(query, k + 1, nprobe)
+        keep = ids != creator_id
+        return ids[keep][:k], scores[keep][:k]
+
+    def semantic_search(self, text, encode_fn, k=10, nprobe=None):
+        """
+        Free-text search: embeds `text` with the same model as the index.
+
+        Args:
+            encode_fn (callable): List[str] -> (n, dim) array, e.g. model.encode.
+        """
+        return self.search(encode_fn([text])[0], k, nprobe)
+
+    def save(self, path):
+        np.savez(
+            path,
+            centroids=self.centroids,
+            vectors=self.vectors.codes,
+            scales=self.vectors.scales if self.vectors.scales is not None else np.empty(0, dtype=np.float32),
+            storage=np.array(self.vectors.mode),
+            ids=self.ids,
+            list_offsets=self.list_offsets,
+            nprobe=np.array(self.nprobe),
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        mode = str(data["storage"]) if "storage" in data else "float32"
+        scales = data["scales"] if mode == "int8" else None
+        vectors = QuantizedEmbeddings(data["vectors"], scales, mode)
+        return cls(data["centroids"], vectors, data["ids"], data["list_offsets"], int(data["nprobe"]))
+
+def benchmark_ann(n=100_000, dim=384, n_queries=200, k=10, seed=42):
+    """Build time, query latency and recall@k against brute force on synthetic data."""
+    rng = np.random.default_rng(seed)
+    embeddings = clustered_embeddings(n, dim, noise=0.6, rng=rng)
+    ids = np.array([f"creator_{i}" for i in range(n)])
+
+    normed = normalize_rows(embeddings)
+    queries = normed[rng.choice(n, n_queries, replace=False)]
+    exact = [set(ids[np.argpartition(-(normed @ q), k - 1)[:k]]) for q in queries]
+
+    for storage in ("float32", "int8"):
+        start = timer()
+        index = IVFIndex.build(embeddings, ids, storage=storage)
+        print(f"\n--- IVF benchmark (N={n}, dim={dim}, lists={len(index.centroids)}, {storage}) ---")
+        print(f"Build: {timer() - start:.2f}s | vectors: {index.vectors.nbytes / 1e6:.1f} MB")
+
+        for nprobe in (4, 8, 16, 32):
+            hits = 0
+            latency = 0.0
+            for q, truth in zip(queries, exact):
+                start = timer()
+                found, _ = index.search(q, k, nprobe)
+                latency += timer() - start
+                hits += len(set(found) & truth)
+            print(f"nprobe={nprobe:<3} | {1000 * latency / n_queries:6.2f} ms/query | "
+                  f"recall@{k}: {hits / (k * n_queries):.3f}")
+
+if __name__ == "__main__":
+    benchmark_ann()
@@ -0,0 +1,155 @@
+import os
+import json
+import numpy as np
+from timeit import default_timer as timer
+
+# Padded tokens per forward pass. 16k keeps GTE-Large well inside CPU RAM
+# while still batching dozens of short bios together.
+DEFAULT_MAX_TOKENS_PER_BATCH = 16384
+DEFAULT_MAX_SEQ_LENGTH = 2048
+
+
+def token_lengths(tokenizer, texts, max_seq_length=None, chunk_size=256):
+    """
+    Counts tokens per text (including special tokens), capped at `max_seq_length`.
+
+    Returns: np.ndarray[int] of shape (len(texts),)
+    """
+    lengths = np.empty(len(texts), dtype=np.int64)
+    for start in range(0, len(texts), chunk_size):
+        chunk = texts[start:start + chunk_size]
+        encoded = tokenizer(
+            chunk,
+            truncation=max_seq_length is not None,
+            max_length=max_seq_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        lengths[start:start + len(chunk)] = [len(ids) for ids in encoded["input_ids"]]
+    return lengths
+
+def plan_batches(lengths, max_tokens_per_batch=DEFAULT_MAX_TOKENS_PER_BATCH, max_batch_size=None):
+    """
+    Packs text indices into batches, longest first, so that
+    (batch size x longest sequence in the batch) stays under the token budget.
+
+    Sorting by length means each batch pads to a similar length, so almost no
+    compute is wasted on padding. A single text longer than the budget still
+    gets its own batch.
+
+    Args:
+        lengths (np.ndarray): Token count per text.
+        max_tokens_per_batch (int): Budget for padded tokens per batch.
+        max_batch_size (int): Optional hard cap on texts per batch.
+
+    Returns:
+        List[np.ndarray]: Index arrays into the original text list.
+    """
+    order = np.argsort(-np.asarray(lengths), kind="stable")
+    batches = []
+    start = 0
+    while start < len(order):
+        # Lengths are descending, so the first text sets the padded width
+        longest = max(int(lengths[order[start]]), 1)
+        size = max(1, max_tokens_per_batch // longest)
+        if max_batch_size:
+            size = min(size, max_batch_size)
+        batches.append(order[start:start + size])
+        start += size
+    return batches
+
+def encode_length_sorted(model, texts, max_tokens_per_batch=DEFAULT_MAX_TOKENS_PER_BATCH,
+                         max_seq_length=DEFAULT_MAX_SEQ_LENGTH, max_batch_size=None,
+                         show_progress_bar=False, **encode_kwargs):
+    """
+    Encodes texts with a SentenceTransformer using token-budgeted batches.
+
+    Args:
+        model (SentenceTransformer): Loaded embedding model.
+        texts (List[str]): Texts to encode.
+        max_tokens_per_batch (int): Padded token budget per forward pass.
+        max_seq_length (int): Truncate inputs to this many tokens (None keeps the model default).
+        max_batch_size (int): Optional hard cap on texts per batch.
+        show_progress_bar (bool): Print per-batch progress.
+        **encode_kwargs: Passed through to `model.encode`.
+
+    Returns:
+        np.ndarray: float32 embeddings of shape (len(texts), dim), in input order.
+    """
+    # The model object is shared process-wide (model_registry): restore its
+    # sequence cap afterwards so other callers keep their own setting
+    original_max_seq_length = model.max_seq_length
+    if max_seq_length:
+        model.max_seq_length = max_seq_length
+    try:
+        return _encode_batches(model, texts, max_tokens_per_batch, max_batch_size,
+                               show_progress_bar, encode_kwargs)
+    finally:
+        model.max_seq_length = original_max_seq_length
+
+def _encode_batches(model, texts, max_tokens_per_batch, max_batch_size, show_progress_bar, encode_kwargs):
+    lengths = token_lengths(model.tokenizer, texts, model.max_seq_length)
+    batches = plan_batches(lengths, max_tokens_per_batch, max_batch_size)
+
+    embeddings = None
+    for i, batch in enumerate(batches):
+        batch_embeddings = model.encode(
+            [texts[j] for j in batch],
+            batch_size=len(batch),
+            convert_to_numpy=True,
+            show_progress_bar=False,
+            **encode_kwargs
+        )
+        if embeddings is None:
+            embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=np.float32)
+        # Scatter back so callers get embeddings in their original order
+        embeddings[batch] = batch_embeddings
+
+        if show_progress_bar:
+            print(f"  batch {i+1}/{len(batches)}: {len(batch)} texts x {lengths[batch[0]]} tokens")
+
+    if embeddings is None:
+        return np.empty((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+    return embeddings
+
+def benchmark_batching(model, texts, max_tokens_per_batch=DEFAULT_MAX_TOKENS_PER_BATCH,
+                       max_seq_length=DEFAULT_MAX_SEQ_LENGTH):
+    """
+    Compares the current `batch_size=1` setting against length-sorted batching
+    on the same texts and sequence cap. Prints timings and agreement.
+    """
+    original_max_seq_length = model.max_seq_length
+    model.max_seq_length = max_seq_length
+    try:
+        start = timer()
+        baseline = model.encode(texts, batch_size=1, convert_to_numpy=True)
+        baseline_time = timer() - start
+    finally:
+        model.max_seq_length = original_max_seq_length
+
+    start = timer()
+    batched = encode_length_sorted(model, texts, max_tokens_per_batch, max_seq_length)
+    batched_time = timer() - start
+
+    a = baseline / np.linalg.norm(baseline, axis=1, keepdims=True)
+    b = batched / np.linalg.norm(batched, axis=1, keepdims=True)
+    min_cosine = float(np.min(np.sum(a * b, axis=1)))
+
+    print(f"\n--- Batching benchmark ({len(texts)} texts, max_seq_length={max_seq_length}) ---")
+    print(f"batch_size=1          : {baseline_time:8.2f}s  ({len(texts) / baseline_time:6.2f} texts/s)")
+    print(f"length-sorted {max_tokens_per_batch:>6} tok: {batched_time:8.2f}s  "
+          f"({len(texts) / batched_time:6.2f} texts/s)")
+    print(f"Speedup: {baseline_time / batched_time:.2f}x | min cosine(baseline, batched): {min_cosine:.5f}")
+    return {"baseline_seconds": baseline_time, "batched_seconds": batched_time, "min_cosine": min_cosine}
+
+if __name__ == "__main__":
+    from src.utils.model_registry import get_sentence_transformer
+
+    # Benchmark on a sample of the real Fandom corpus
+    input_file = os.path.join("data", "fandom", "youtubers_data_combined.json")
+    with open(input_file, "r", encoding="utf-8") as f:
+        creators = json.load(f)[:200]
+    sample = [f"{c['title']} - {c['description'].replace(chr(10), ' ')[:32000]}" for c in creators]
+
+    model = get_sentence_transformer("Alibaba-NLP/gte-large-en-v1.5", trust_remote_code=True)
+    benchmark_batching(model, sample)
@@ -0,0 +1,91 @@
+import numpy as np
+
+# ~1.3 tokens per English word, so 384 words stays inside a 512-token window
+DEFAULT_WINDOW_WORDS = 384
+DEFAULT_OVERLAP_WORDS = 32
+
+
+def chunk_words(text, window_words=DEFAULT_WINDOW_WORDS, overlap_words=DEFAULT_OVERLAP_WORDS):
+    """
+    Splits a text into overlapping windows of at most `window_words` words.
+    Always returns at least one chunk (possibly empty) so every text gets an embedding.
+    """
+    if overlap_words >= window_words:
+        raise ValueError("overlap_words must be smaller than window_words")
+
+    words = text.split()
+    if len(words) <= window_words:
+        return [" ".join(words)]
+
+    step = window_words - overlap_words
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + window_words]))
+        if start + window_words >= len(words):
+            break
+    return chunks
+
+def chunk_corpus(texts, window_words=DEFAULT_WINDOW_WORDS, overlap_words=DEFAULT_OVERLAP_WORDS):
+    """
+    Flattens all texts into one list of chunks.
+
+    Returns:
+        (List[str], np.ndarray): The chunks, and the number of chunks per text.
+            Chunks of the same text are contiguous and in input order.
+    """
+    chunks = []
+    counts = np.empty(len(texts), dtype=np.int64)
+    for i, text in enumerate(texts):
+        text_chunks = chunk_words(text, window_words, overlap_words)
+        chunks.extend(text_chunks)
+        counts[i] = len(text_chunks)
+    return chunks, counts
+
+def segment_mean(chunk_embeddings, counts, normalize=True):
+    """
+    Mean-pools contiguous chunk embeddings back into one vector per text.
+
+    Args:
+        chunk_embeddings (np.ndarray): (total_chunks, dim) array.
+        counts (np.ndarray): Chunks per text; must sum to total_chunks.
+        normalize (bool): L2-normalize chunks before pooling and the result after,
+            so long and short bios end up on the same scale.
+
+    Returns:
+        np.ndarray: float32 array of shape (len(counts), dim).
+    """
+    chunk_embeddings = np.asarray(chunk_embeddings, dtype=np.float32)
+    if normalize:
+        norms = np.linalg.norm(chunk_embeddings, axis=1, keepdims=True)
+        chunk_embeddings = chunk_embeddings / np.maximum(norms, 1e-12)
+
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    pooled = np.add.reduceat(chunk_embeddings, starts, axis=0) / counts[:, None]
+
+    if normalize:
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        pooled = pooled / np.maximum(norms, 1e-12)
+    return pooled.astype(np.float32)
+
+def encode_chunked(texts, encode_fn, window_words=DEFAULT_WINDOW_WORDS,
+                   overlap_words=DEFAULT_OVERLAP_WORDS):
+    """
+    Encodes full-length texts as the mean of their window embeddings.
+
+    All windows from all texts go through `encode_fn` in a single call, so they
+    share batches; cost grows linearly with text length instead of quadratically.
+
+    Args:
+        texts (List[str]): Texts of any length.
+        encode_fn (callable): List[str] -> (n, dim) array (e.g. model.encode or
+            a length-sorted batching wrapper).
+        window_words (int): Max words per window.
+        overlap_words (int): Words shared between consecutive windows.
+
+    Returns:
+        np.ndarray: float32 array of shape (len(texts), dim), in input order.
+    """
+    chunks, counts = chunk_corpus(texts, window_words, overlap_words)
+    print(f"Chunked {len(texts)} texts into {len(chunks)} windows of <= {window_words} words.")
+    chunk_embeddings = encode_fn(chunks)
+    return segment_mean(chunk_embeddings, counts)
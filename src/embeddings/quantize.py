@@ -0,0 +1,118 @@
+import numpy as np
+from timeit import default_timer as timer
+from src.utils.benchmark_data import clustered_embeddings
+
+MODES = ("float32", "float16", "int8")
+
+
+class QuantizedEmbeddings:
+    """
+    Compact storage for unit-normalized embeddings.
+
+    Modes:
+        float32: No compression (4 bytes/dim), for comparison.
+        float16: Half precision (2 bytes/dim).
+        int8:    Symmetric scalar quantization with one float32 scale per
+                 vector (1 byte/dim + 4 bytes/vector): v ~= codes * scale.
+
+    Similarities are computed from the codes block by block: codes are
+    widened to float32 only for the block being multiplied (exact, since the
+    integer dot products stay below 2**24 for dim <= 1024), and the per-vector
+    scales are applied to the result. Only the compact codes are ever held in
+    full, which is what matters when memory bandwidth dominates.
+    """
+
+    def __init__(self, codes, scales=None, mode="int8"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown quantization mode: {mode}. Options: {MODES}")
+        self.codes = codes
+        self.scales = scales
+        self.mode = mode
+
+    @classmethod
+    def from_float(cls, embeddings, mode="int8", normalize=True):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if normalize:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+
+        if mode == "int8":
+            scales = np.max(np.abs(embeddings), axis=1) / 127.0
+            scales = np.maximum(scales, 1e-12).astype(np.float32)
+            codes = np.round(embeddings / scales[:, None]).astype(np.int8)
+            return cls(codes, scales, mode)
+        return cls(embeddings.astype(mode), None, mode)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def take(self, indices):
+        """New QuantizedEmbeddings with only the given rows (no dequantization)."""
+        scales = self.scales[indices] if self.scales is not None else None
+        return QuantizedEmbeddings(self.codes[indices], scales, self.mode)
+
+    def concatenate(self, other):
+        scales = np.concatenate((self.scales, other.scales)) if self.scales is not None else None
+        return QuantizedEmbeddings(np.concatenate((self.codes, other.codes)), scales, self.mode)
+
+    def dequantize(self, indices=slice(None)):
+        """float32 vectors for the selected rows."""
+        block = self.codes[indices].astype(np.float32)
+        if self.scales is not None:
+            block *= self.scales[indices][:, None]
+        return block
+
+    def dot(self, query, indices=slice(None)):
+        """Similarity of one float32 query against the selected rows."""
+        scores = self.codes[indices].astype(np.float32) @ np.asarray(query, dtype=np.float32)
+        if self.scales is not None:
+            scores *= self.scales[indices]
+        return scores
+
+    def block_similarity(self, start, end, column_block=8192):
+        """(end - start, N) similarities between rows [start, end) and all rows."""
+        left = np.asarray(self.codes[start:end], dtype=np.float32)
+        sims = np.empty((len(left), len(self.codes)), dtype=np.float32)
+        # Widen the right-hand codes a column block at a time to bound temporary memory
+        for col in range(0, len(self.codes), column_block):
+            right = np.asarray(self.codes[col:col + column_block], dtype=np.float32)
+            sims[:, col:col + len(right)] = left @ right.T
+        if self.scales is not None:
+            sims *= self.scales[start:end, None]
+            sims *= self.scales[None, :]
+        return sims
+
+def benchmark_quantization(n=20_000, dim=1024, top_k=10, seed=42):
+    """
+    Memory, block-similarity time and accuracy (max similarity error, top-k
+    overlap with float32) for every storage mode on synthetic data.
+    """
+    embeddings = clustered_embeddings(n, dim, noise=0.8, rng=np.random.default_rng(seed))
+
+    reference = QuantizedEmbeddings.from_float(embeddings, "float32")
+    rows = slice(0, 500)
+    exact = reference.block_similarity(0, 500)
+    exact_top = np.argpartition(-exact, top_k, axis=1)[:, :top_k + 1]
+
+    print(f"\n--- Quantization benchmark (N={n}, dim={dim}) ---")
+    for mode in MODES:
+        start = timer()
+        quantized = QuantizedEmbeddings.from_float(embeddings, mode)
+        encode_seconds = timer() - start
+
+        start = timer()
+        sims = quantized.block_similarity(rows.start, rows.stop)
+        sim_seconds = timer() - start
+
+        top = np.argpartition(-sims, top_k, axis=1)[:, :top_k + 1]
+        overlap = np.mean([len(set(a) & set(b)) / (top_k + 1) for a, b in zip(top, exact_top)])
+        print(f"{mode:<8} | {quantized.nbytes / 1e6:8.1f} MB | quantize {encode_seconds:5.2f}s | "
+              f"500xN sims {sim_seconds:5.2f}s | max err {np.max(np.abs(sims - exact)):.5f} | "
+              f"top-{top_k} overlap {overlap:.4f}")
+
+if __name__ == "__main__":
+    benchmark_quantization()
@@ -0,0 +1,140 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+# --- Configuration ---
+EMBEDDING_STORE_DIR = os.path.join("data", "embeddings")
+
+
+def text_hash(text):
+    """Stable content key for one input text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _model_slug(model_id):
+    """Turns 'Alibaba-NLP/gte-large-en-v1.5' into a safe directory name."""
+    return model_id.replace("/", "__").replace(":", "_")
+
+
+class EmbeddingStore:
+    """
+    Persistent embedding cache for one model, keyed by a hash of the input text.
+
+    Layout:
+        <store_dir>/<model_slug>/vectors.bin  (row-major matrix, memory-mapped on read)
+        <store_dir>/<model_slug>/index.json   (model_id, dim, dtype, {text_hash: row})
+
+    Rows are only ever appended, so re-running a builder only encodes texts
+    that are new or whose content changed since the last run.
+    """
+
+    def __init__(self, model_id, store_dir=EMBEDDING_STORE_DIR, dtype="float32"):
+        self.model_id = model_id
+        self.dir = os.path.join(store_dir, _model_slug(model_id))
+        self.vectors_file = os.path.join(self.dir, "vectors.bin")
+        self.index_file = os.path.join(self.dir, "index.json")
+        self.dtype = np.dtype(dtype)
+        self.dim = None
+        self.rows = {}
+        self._vectors = None
+
+        if os.path.exists(self.index_file):
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            self.dim = index["dim"]
+            self.dtype = np.dtype(index["dtype"])
+            self.rows = index["rows"]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _matrix(self):
+        """Memory-mapped view of all stored vectors (opened lazily, read-only)."""
+        if self._vectors is None and self.rows:
+            self._vectors = np.memmap(
+                self.vectors_file, dtype=self.dtype, mode="r", shape=(len(self.rows), self.dim)
+            )
+        return self._vectors
+
+    def missing(self, texts):
+        """Returns the unique texts that have no stored embedding yet."""
+        seen = set()
+        missing = []
+        for text in texts:
+            key = text_hash(text)
+            if key not in self.rows and key not in seen:
+                seen.add(key)
+                missing.append(text)
+        return missing
+
+    def add(self, texts, vectors):
+        """
+        Appends embeddings for `texts` and persists the index. Texts already
+        in the store, and repeats within `texts`, are skipped (first one wins).
+        """
+        vectors = np.asarray(vectors, dtype=self.dtype)
+        if len(texts) != len(vectors):
+            raise ValueError(f"Got {len(texts)} texts but {len(vectors)} vectors")
+
+        new_keys, keep = {}, []
+        for i, text in enumerate(texts):
+            key = text_hash(text)
+            if key not in self.rows and key not in new_keys:
+                new_keys[key] = len(self.rows) + len(keep)
+                keep.append(i)
+        if not keep:
+            return
+        vectors = vectors[keep]
+
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim vectors for {self.model_id}, got {vectors.shape[1]}")
+
+        os.makedirs(self.dir, exist_ok=True)
+        self._vectors = None  # Invalidate the old memmap before growing the file
+
+        # Drop any bytes past the last indexed row (left behind by an interrupted add)
+        committed_bytes = len(self.rows) * self.dim * self.dtype.itemsize
+        with open(self.vectors_file, "ab") as f:
+            f.truncate(committed_bytes)
+            f.write(np.ascontiguousarray(vectors).tobytes())
+
+        self.rows.update(new_keys)
+
+        # Index is written last and atomically: it is the commit point
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "model_id": self.model_id,
+                "dim": self.dim,
+                "dtype": self.dtype.name,
+                "rows": self.rows,
+            }, f)
+        os.replace(tmp_file, self.index_file)
+
+    def get(self, texts):
+        """Returns stored embeddings for `texts` as a float32 array (all must exist)."""
+        row_ids = np.fromiter((self.rows[text_hash(t)] for t in texts), dtype=np.int64, count=len(texts))
+        return np.asarray(self._matrix()[row_ids], dtype=np.float32)
+
+    def encode(self, texts, encode_fn):
+        """
+        Returns embeddings for `texts` in order, encoding only the missing ones.
+
+        Args:
+            texts (List[str]): Texts to embed.
+            encode_fn (callable): List[str] -> array of shape (n, dim). Only
+                called when at least one text is not in the store yet.
+
+        Returns:
+            np.ndarray: float32 array of shape (len(texts), dim).
+        """
+        missing = self.missing(texts)
+        if missing:
+            print(f"Embedding store [{self.model_id}]: encoding {len(missing)} new texts "
+                  f"out of {len(texts)}...")
+            self.add(missing, encode_fn(missing))
+        else:
+            print(f"Embedding store [{self.model_id}]: all {len(texts)} texts cached.")
+        return self.get(texts)
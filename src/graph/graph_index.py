@@ -0,0 +1,112 @@
+import numpy as np
+
+
+class GraphIndex:
+    """
+    Lookup structures for an undirected creator graph.
+
+    Nodes are numbered 0..N-1 in file order (`ids[row]`, `row_of[id]`). Edges
+    are stored once per direction in CSR form: the neighbors of `row` are
+    `indices[indptr[row]:indptr[row+1]]` with matching `weights`, sorted by
+    weight (strongest first).
+    """
+
+    def __init__(self, ids, indptr, indices, weights):
+        self.ids = np.asarray(ids).astype(str)
+        self.row_of = {node_id: row for row, node_id in enumerate(self.ids)}
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+    @classmethod
+    def from_edges(cls, ids, sources, targets, weights):
+        """
+        Builds the CSR adjacency from an edge list of row indices (each
+        undirected edge listed once, as `similarity_edges` returns them).
+        """
+        n = len(ids)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float32)
+
+        rows = np.concatenate((sources, targets))
+        cols = np.concatenate((targets, sources))
+        both = np.concatenate((weights, weights))
+        # Group by row, strongest neighbor first within each row
+        order = np.lexsort((-both, rows))
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n)))).astype(np.int64)
+        return cls(ids, indptr, cols[order], both[order])
+
+    @classmethod
+    def from_graph_data(cls, graph_data):
+        """Builds the index from the builders' JSON format ({"nodes": [...], "edges": [...]})."""
+        ids = [n['id'] for n in graph_data['nodes']]
+        row_of = {node_id: row for row, node_id in enumerate(ids)}
+        edges = [e for e in graph_data['edges'] if e['source'] in row_of and e['target'] in row_of]
+        return cls.from_edges(
+            ids,
+            [row_of[e['source']] for e in edges],
+            [row_of[e['target']] for e in edges],
+            [e['weight'] for e in edges],
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def num_edges(self):
+        return len(self.indices) // 2
+
+    def neighbors(self, row):
+        """(neighbor rows, weights) of one node, strongest first."""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def ego_rows(self, center, hops=1, max_nodes=None):
+        """
+        Rows within `hops` edges of `center` (breadth-first, center first).
+
+        Args:
+            center (int): Row of the center node.
+            hops (int): Neighborhood radius.
+            max_nodes (int): Optional cap; nearer hops and stronger edges are kept first.
+
+        Returns:
+            np.ndarray: Node rows in the ego network.
+        """
+        visited = np.zeros(len(self.ids), dtype=bool)
+        visited[center] = True
+        layers = [np.array([center], dtype=np.int64)]
+        frontier = layers[0]
+        for _ in range(hops):
+            if len(frontier) == 0:
+                break
+            reached = np.concatenate([self.neighbors(row)[0] for row in frontier])
+            # Keep first occurrence: order follows the frontier and edge strength
+            _, first = np.unique(reached, return_index=True)
+            reached = reached[np.sort(first)]
+            frontier = reached[~visited[reached]]
+            visited[frontier] = True
+            layers.append(frontier)
+
+        rows = np.concatenate(layers)
+        return rows[:max_nodes] if max_nodes else rows
+
+    def subgraph_edges(self, rows):
+        """
+        Edges with both ends in `rows`, each listed once.
+
+        Returns:
+            (np.ndarray, np.ndarray, np.ndarray): source rows, target rows, weights.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        member = np.zeros(len(self.ids), dtype=bool)
+        member[rows] = True
+
+        counts = self.indptr[rows + 1] - self.indptr[rows]
+        sources = np.repeat(rows, counts)
+        positions = np.concatenate([np.arange(self.indptr[r], self.indptr[r + 1]) for r in rows]) \
+            if len(rows) else np.empty(0, dtype=np.int64)
+        targets = self.indices[positions]
+        keep = member[targets] & (sources < targets)
+        return sources[keep], targets[keep], self.weights[positions][keep]
@@ -0,0 +1,88 @@
+import os
+import numpy as np
+import pandas as pd
+from src.graph.graph_index import GraphIndex
+from src.utils.columnar import write_table, read_frame, table_exists, save_npy
+
+
+def graph_binary_dir(json_path):
+    """Binary graph directory that sits next to a builder's JSON file."""
+    return os.path.splitext(json_path)[0] + "_bin"
+
+def save_graph_binary(out_dir, nodes, sources, targets, weights):
+    """
+    Saves a graph in a compact, memory-mappable layout.
+
+    Layout:
+        <out_dir>/indptr.npy, indices.npy (int32), weights.npy (float32)
+            symmetric CSR adjacency (see GraphIndex)
+        <out_dir>/nodes/  node attribute table (see columnar.write_table)
+
+    Args:
+        out_dir (str): Target directory.
+        nodes (List[dict]): Node records, in row order ("id" required).
+        sources, targets (np.ndarray): Edge endpoints as node rows, each edge once.
+        weights (np.ndarray): Edge similarity per edge.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    index = GraphIndex.from_edges([n['id'] for n in nodes], sources, targets, weights)
+    save_npy(os.path.join(out_dir, "indptr.npy"), index.indptr)
+    save_npy(os.path.join(out_dir, "indices.npy"), index.indices.astype(np.int32))
+    save_npy(os.path.join(out_dir, "weights.npy"), index.weights.astype(np.float32))
+    # Node table last: its schema file marks the graph as complete
+    write_table(pd.DataFrame(nodes), os.path.join(out_dir, "nodes"), categorical=('shape',))
+
+    size = sum(
+        os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(out_dir) for f in files
+    )
+    print(f"Saved binary graph ({len(nodes)} nodes, {index.num_edges} edges, "
+          f"{size / 1e6:.1f} MB) to {out_dir}")
+
+def graph_binary_exists(in_dir):
+    return table_exists(os.path.join(in_dir, "nodes"))
+
+class NodeRecords:
+    """
+    Read-only, list-like view of a node table: `nodes[row]` builds that one
+    node's dict on demand, so only the rows actually rendered are turned into
+    Python objects. Missing values (NaN) come back as None.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self._columns = {name: table[name].to_numpy() for name in table.columns}
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, row):
+        return {name: _clean(values[row]) for name, values in self._columns.items()}
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+    def column(self, name):
+        return self._columns[name]
+
+def _clean(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    return None if isinstance(value, float) and np.isnan(value) else value
+
+def load_graph_binary(in_dir, mmap=True):
+    """
+    Loads a graph written by `save_graph_binary`; the CSR arrays and the
+    numeric node columns are memory-mapped.
+
+    Returns:
+        (NodeRecords, GraphIndex): node records in row order and the adjacency index.
+    """
+    mode = "r" if mmap else None
+    node_table = read_frame(os.path.join(in_dir, "nodes"), mmap=mmap)
+    index = GraphIndex(
+        node_table['id'].to_numpy(),
+        np.load(os.path.join(in_dir, "indptr.npy"), mmap_mode=mode),
+        np.load(os.path.join(in_dir, "indices.npy"), mmap_mode=mode),
+        np.load(os.path.join(in_dir, "weights.npy"), mmap_mode=mode),
+    )
+    return NodeRecords(node_table), index
@@ -0,0 +1,129 @@
+import numpy as np
+from timeit import default_timer as timer
+from src.embeddings.quantize import QuantizedEmbeddings
+from src.utils.benchmark_data import clustered_embeddings
+
+# Each block of similarities is (block_rows x N) float32; keep it around 256 MB.
+DEFAULT_MAX_BLOCK_BYTES = 256 * 1024 * 1024
+
+
+def normalize_rows(embeddings):
+    """L2-normalizes rows (or a single vector) so dot products are cosine similarities."""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+def _block_rows(n, max_block_bytes):
+    """Rows per block so that a (rows x n) float32 block fits the memory budget."""
+    return int(max(1, min(n, max_block_bytes // (4 * max(n, 1)))))
+
+def similarity_edges(embeddings, threshold=None, top_k=None, max_block_bytes=DEFAULT_MAX_BLOCK_BYTES,
+                     quantization=None):
+    """
+    Builds an undirected cosine-similarity edge list without an N x N matrix.
+
+    Similarities are computed one row block at a time. Edges are picked with
+    vectorized thresholding (every pair above `threshold`) and/or per-node
+    top-k (each node keeps its `top_k` most similar neighbors, optionally
+    still filtered by `threshold`).
+
+    Args:
+        embeddings (np.ndarray): (N, dim) embedding matrix.
+        threshold (float): Keep pairs with similarity strictly above this.
+        top_k (int): Keep each node's k most similar neighbors.
+        max_block_bytes (int): Memory budget for one similarity block.
+        quantization (str): Optional compact storage for the embeddings while
+            computing similarities: "float16" or "int8" (see quantize.py).
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray): sources, targets (int64 row
+            indices, sources < targets, each pair once) and float32 weights.
+    """
+    if threshold is None and top_k is None:
+        raise ValueError("Provide a threshold, a top_k, or both.")
+
+    vectors = QuantizedEmbeddings.from_float(embeddings, quantization or "float32")
+    n = len(vectors)
+    if top_k is not None:
+        top_k = min(top_k, n - 1)
+    if n < 2 or top_k == 0:
+        # No pairs to compare, or no neighbors to keep
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    block = _block_rows(n, max_block_bytes)
+
+    sources, targets, weights = [], [], []
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        sims = vectors.block_similarity(start, end)
+        local_rows = np.arange(end - start)
+
+        if top_k:
+            # Exclude self-matches, then take the k best columns per row
+            sims[local_rows, local_rows + start] = -np.inf
+            cols = np.argpartition(-sims, top_k - 1, axis=1)[:, :top_k]
+            scores = np.take_along_axis(sims, cols, axis=1)
+            rows = np.repeat(local_rows + start, top_k)
+            cols = cols.ravel()
+            scores = scores.ravel()
+            if threshold is not None:
+                keep = scores > threshold
+                rows, cols, scores = rows[keep], cols[keep], scores[keep]
+        else:
+            # Upper triangle only: each pair is seen once, from its lower index
+            rows, cols = np.nonzero(sims > threshold)
+            scores = sims[rows, cols]
+            rows = rows + start
+            keep = cols > rows
+            rows, cols, scores = rows[keep], cols[keep], scores[keep]
+
+        sources.append(rows.astype(np.int64))
+        targets.append(cols.astype(np.int64))
+        weights.append(scores.astype(np.float32))
+
+    sources = np.concatenate(sources) if sources else np.empty(0, dtype=np.int64)
+    targets = np.concatenate(targets) if targets else np.empty(0, dtype=np.int64)
+    weights = np.concatenate(weights) if weights else np.empty(0, dtype=np.float32)
+
+    if top_k:
+        # A-B and B-A can both be picked by top-k; keep each undirected pair once
+        lo, hi = np.minimum(sources, targets), np.maximum(sources, targets)
+        _, first = np.unique(lo * n + hi, return_index=True)
+        sources, targets, weights = lo[first], hi[first], weights[first]
+
+    return sources, targets, weights
+
+def benchmark_similarity_edges(sizes=(10_000, 100_000), dim=384, top_k=10, threshold=0.7, seed=42):
+    """
+    Times block-wise edge extraction on synthetic clustered embeddings, plus
+    the old dense matrix + nested loop approach where it is still feasible.
+    """
+    rng = np.random.default_rng(seed)
+    print(f"\n--- Similarity edge benchmark (dim={dim}) ---")
+    for n in sizes:
+        # Clustered data so thresholding actually produces edges
+        embeddings = clustered_embeddings(n, dim, noise=0.6, rng=rng)
+
+        start = timer()
+        src, _, _ = similarity_edges(embeddings, top_k=top_k)
+        print(f"N={n:>7} | top-{top_k:<3}      : {timer() - start:7.2f}s, {len(src):>9} edges")
+
+        start = timer()
+        src, _, _ = similarity_edges(embeddings, threshold=threshold)
+        print(f"N={n:>7} | threshold {threshold}: {timer() - start:7.2f}s, {len(src):>9} edges")
+
+        if n <= 10_000:
+            normed = normalize_rows(embeddings)
+            start = timer()
+            matrix = normed @ normed.T
+            count = 0
+            for i in range(n):
+                for j in range(i + 1, n):
+                    if float(matrix[i][j]) > threshold:
+                        count += 1
+            print(f"N={n:>7} | dense + loop   : {timer() - start:7.2f}s, {count:>9} edges "
+                  f"({matrix.nbytes / 1e6:.0f} MB matrix)")
+        else:
+            print(f"N={n:>7} | dense + loop   : skipped ({4 * n * n / 1e9:.0f} GB matrix)")
+
+if __name__ == "__main__":
+    benchmark_similarity_edges()
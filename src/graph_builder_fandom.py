@@ -1,16 +1,35 @@
 import os
 import json
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.manifold import TSNE
+from src.embeddings.store import EmbeddingStore
+from src.embeddings.chunking import encode_chunked
+from src.graph.similarity_edges import similarity_edges
+from src.graph.graph_store import save_graph_binary, graph_binary_dir
+from src.utils.thumbnail_cache import ThumbnailCache
+from src.plots.reduction import reduce_embeddings
+from src.utils.model_registry import get_sentence_transformer
 
 # --- Configuration ---
 DATA_DIR = "data"
-INPUT_FILE = os.path.join(DATA_DIR, "youtubers_data_combined.json")
+INPUT_FILE = os.path.join(DATA_DIR, "fandom", "youtubers_data_combined.json")
 OUTPUT_FILE = os.path.join(DATA_DIR, "graph", "fandom_graph_data_combined.json")
-
-def build_fandom_graph():
+MODEL_ID = "all-MiniLM-L6-v2"
+# MiniLM reads 256 tokens at most, so "chunked" mode embeds ~180-word windows
+# of the full bio and mean-pools them; "truncate" keeps the first 3000 characters.
+ENCODING_MODE = "chunked"
+CHUNK_WINDOW_WORDS = 180
+CHUNK_OVERLAP_WORDS = 20
+# Edges: only draw lines if similarity is high enough. Optionally also cap
+# each creator to its MAX_EDGES_PER_NODE most similar neighbors (None = no cap).
+SIMILARITY_THRESHOLD = 0.70
+MAX_EDGES_PER_NODE = None
+# None (float32), "float16" or "int8" codes for the similarity pass
+EDGE_QUANTIZATION = None
+# Layout: "tsne", "opentsne" or "umap", after PCA to REDUCTION_PCA_DIMS
+REDUCTION_METHOD = "tsne"
+REDUCTION_PCA_DIMS = 50
+
+def build_fandom_graph(encoding_mode=ENCODING_MODE):
     """
     Builds a semantic graph from scraped Fandom data.
     """
@@ -31,24 +50,37 @@ def build_fandom_graph():
         return
 
     # 2. Generate Embeddings
-    print("Loading embedding model (local)...")
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-
     print("Generating embeddings from Fandom bios...")
     # We combine Title + Description to ensure the model knows WHO it is + WHAT they do.
     # We strip newlines to keep the input clean for the model.
     text_corpus = []
     for c in creators:
-        cleaned_description = c['description'].replace('\n', ' ')[:3000]
+        cleaned_description = c['description'].replace('\n', ' ')
+        if encoding_mode == "truncate":
+            cleaned_description = cleaned_description[:3000]
         text_corpus.append(f"{c['title']} - {cleaned_description}")
     
-    embeddings = model.encode(text_corpus)
+    # Only creators that are new (or whose bio changed) get re-encoded
+    def encode_fn(texts):
+        model = get_sentence_transformer(MODEL_ID)
+        if encoding_mode == "chunked":
+            return encode_chunked(texts, model.encode, CHUNK_WINDOW_WORDS, CHUNK_OVERLAP_WORDS)
+        return model.encode(texts)
+
+    if encoding_mode == "chunked":
+        store = EmbeddingStore(f"{MODEL_ID}:chunked{CHUNK_WINDOW_WORDS}-{CHUNK_OVERLAP_WORDS}")
+    else:
+        store = EmbeddingStore(MODEL_ID)
+    embeddings = store.encode(text_corpus, encode_fn)
 
     # 3. Calculate Similarity & Coordinates
     print("Calculating relationships...")
     
-    # Cosine Similarity for Edges
-    similarity_matrix = cosine_similarity(embeddings)
+    # Cosine Similarity for Edges (block-wise, never materializes the N x N matrix)
+    sources, targets, weights = similarity_edges(
+        embeddings, threshold=SIMILARITY_THRESHOLD, top_k=MAX_EDGES_PER_NODE,
+        quantization=EDGE_QUANTIZATION
+    )
     
     # t-SNE for 2D Layout (Nodes)
     n_samples = len(embeddings)
@@ -56,15 +88,15 @@ def build_fandom_graph():
     # 30 is default, but for small datasets (<50), 2-5 is better.
     perplexity_val = min(5, max(1, n_samples - 1))
     
-    print(f"Projecting to 2D using t-SNE (perplexity={perplexity_val})...")
-    tsne = TSNE(
-        n_components=2, 
-        perplexity=perplexity_val, 
-        random_state=42, 
-        init='pca', 
-        learning_rate='auto'
+    print(f"Projecting to 2D using {REDUCTION_METHOD} (perplexity={perplexity_val})...")
+    coords = reduce_embeddings(
+        embeddings,
+        n_components=2,
+        method=REDUCTION_METHOD,
+        pca_dims=REDUCTION_PCA_DIMS,
+        perplexity=perplexity_val,
+        random_state=42
     )
-    coords = tsne.fit_transform(embeddings)
 
     # 4. Construct Graph JSON
     nodes = []
@@ -91,21 +123,14 @@ def build_fandom_graph():
             "meta_description": c['description'][:300] + "..." # Preview text
         })
 
-    # Create Edges
-    # Threshold: Only draw lines if similarity is high enough
-    SIMILARITY_THRESHOLD = 0.70
-
-    for i in range(len(creators)):
-        for j in range(i + 1, len(creators)): # Avoid duplicates (A-B is same as B-A)
-            score = float(similarity_matrix[i][j])
-            
-            if score > SIMILARITY_THRESHOLD:
-                edges.append({
-                    "source": creators[i]['id'],
-                    "target": creators[j]['id'],
-                    "weight": score,
-                    "label": f"{score:.2f}" # Optional: show score on line
-                })
+    # Create Edges (each pair appears once: A-B is same as B-A)
+    for i, j, score in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+        edges.append({
+            "source": creators[i]['id'],
+            "target": creators[j]['id'],
+            "weight": score,
+            "label": f"{score:.2f}" # Optional: show score on line
+        })
 
     # 5. Save
     output_data = {
@@ -115,6 +140,10 @@ def build_fandom_graph():
 
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
         json.dump(output_data, f, indent=2)
+    # Compact CSR + node table copy that app.py loads first
+    save_graph_binary(graph_binary_dir(OUTPUT_FILE), nodes, sources, targets, weights)
+    # Node avatars, served locally by app.py
+    ThumbnailCache().prefetch(n['image'] for n in nodes)
 
     print(f"Graph built successfully!")
     print(f"Nodes: {len(nodes)}")
@@ -0,0 +1,170 @@
+import re
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from timeit import default_timer as timer
+from sklearn.feature_extraction.text import CountVectorizer, ENGLISH_STOP_WORDS
+
+# Words that appear in almost every creator bio and say nothing about the genre
+DOMAIN_STOP_WORDS = {
+    "youtube", "youtuber", "youtubers", "channel", "channels", "video", "videos", "uploaded",
+    "upload", "uploads", "subscriber", "subscribers", "views", "known", "content", "created",
+    "main", "began", "started", "joined", "later", "currently", "also", "like", "new", "one",
+    "first", "time", "year", "years", "account", "became", "including", "posted", "posts",
+}
+STOP_WORDS = list(ENGLISH_STOP_WORDS | DOMAIN_STOP_WORDS)
+# Only the start of each bio is used, like the notebook's 3000-character trim
+MAX_DESCRIPTION_CHARS = 3000
+NAME_TERMS = 3
+RANKED_TERMS = 10
+
+
+def cluster_documents(df, max_description_chars=MAX_DESCRIPTION_CHARS):
+    """One text per creator: title plus the start of the description."""
+    descriptions = df['description'].fillna("").astype(str).str[:max_description_chars]
+    return (df['title'].fillna("").astype(str) + " " + descriptions).tolist()
+
+def class_tfidf(documents, labels, n_clusters, ngram_range=(1, 2), min_df=2, max_features=50_000):
+    """
+    Class-based TF-IDF: term counts are summed per cluster and weighted by how
+    specific each term is to that cluster compared to all clusters.
+
+        weight(t, c) = tf(t, c) * log(1 + avg_words_per_cluster / freq(t))
+
+    Everything is sparse: one CountVectorizer pass over the documents, then a
+    (clusters x creators) indicator matrix times the (creators x terms) counts.
+
+    Args:
+        documents (List[str]): One text per creator.
+        labels (np.ndarray): Cluster ID per creator (0 .. n_clusters-1).
+        n_clusters (int): Number of clusters.
+
+    Returns:
+        (scipy.sparse.csr_matrix, np.ndarray): (n_clusters, n_terms) weights and the term vocabulary.
+    """
+    vectorizer = CountVectorizer(
+        ngram_range=ngram_range,
+        stop_words=STOP_WORDS,
+        min_df=min(min_df, len(documents)),
+        max_features=max_features,
+        token_pattern=r"(?u)\b[^\W\d_][\w'-]+\b",
+    )
+    counts = vectorizer.fit_transform(documents)
+
+    labels = np.asarray(labels)
+    membership = sp.csr_matrix(
+        (np.ones(len(labels), dtype=np.float32), (labels, np.arange(len(labels)))),
+        shape=(n_clusters, len(labels)),
+    )
+    cluster_counts = (membership @ counts).tocsr().astype(np.float32)
+
+    words_per_cluster = np.asarray(cluster_counts.sum(axis=1)).ravel()
+    term_freq = np.asarray(cluster_counts.sum(axis=0)).ravel()
+    idf = np.log(1 + words_per_cluster.mean() / np.maximum(term_freq, 1))
+
+    tf = sp.diags(1 / np.maximum(words_per_cluster, 1)) @ cluster_counts
+    return (tf @ sp.diags(idf)).tocsr(), vectorizer.get_feature_names_out()
+
+def top_terms(weights, vocabulary, n_terms=RANKED_TERMS):
+    """Highest-weighted terms for every cluster, best first."""
+    dense = weights.toarray()
+    n_terms = min(n_terms, dense.shape[1])
+    top = np.argpartition(-dense, n_terms - 1, axis=1)[:, :n_terms]
+    order = np.take_along_axis(-dense, top, axis=1).argsort(axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    return [
+        [vocabulary[j] for j in row if dense[i, j] > 0]
+        for i, row in enumerate(top)
+    ]
+
+def name_from_terms(terms, n_name_terms=NAME_TERMS):
+    """
+    Readable label from ranked terms, e.g. "Minecraft, Smp & Roleplay".
+    Unigrams already covered by a chosen bigram are skipped.
+    """
+    chosen = []
+    for term in terms:
+        words = set(term.split())
+        if any(words <= set(c.split()) or set(c.split()) <= words for c in chosen):
+            continue
+        chosen.append(term)
+        if len(chosen) == n_name_terms:
+            break
+    if not chosen:
+        return "Miscellaneous"
+    titled = [re.sub(r"\b\w", lambda m: m.group().upper(), t) for t in chosen]
+    return titled[0] if len(titled) == 1 else ", ".join(titled[:-1]) + " & " + titled[-1]
+
+def stored_names(labeled_file):
+    """
+    {cluster_id: (cluster_name, cluster_terms)} from a labeled star map CSV,
+    or {} if there is none yet (see `name_clusters`' keep_names).
+    """
+    try:
+        df = pd.read_csv(labeled_file, usecols=['cluster_id', 'cluster_name', 'cluster_terms'])
+    except (OSError, ValueError):
+        return {}
+    df = df.drop_duplicates('cluster_id')
+    return {
+        int(c): (str(name), "" if pd.isna(terms) else str(terms))
+        for c, name, terms in zip(df['cluster_id'], df['cluster_name'], df['cluster_terms'])
+    }
+
+def name_clusters(df, n_clusters=None, keep_names=None):
+    """
+    Adds `cluster_name` and `cluster_terms` (ranked, ';'-separated) columns.
+
+    Args:
+        df (pd.DataFrame): Star map rows with title, description and cluster_id.
+        n_clusters (int): Number of clusters (default: max cluster_id + 1).
+        keep_names (dict): {cluster_id: (name, terms)} to keep as they are
+            (e.g. clusters an incremental update did not touch); every other
+            cluster is named from its current members.
+
+    Returns:
+        pd.DataFrame: Copy of df with the new columns.
+    """
+    start = timer()
+    labels = df['cluster_id'].astype(int).to_numpy()
+    n_clusters = n_clusters or int(labels.max()) + 1
+    keep_names = {c: v for c, v in (keep_names or {}).items() if c < n_clusters}
+
+    weights, vocabulary = class_tfidf(cluster_documents(df), labels, n_clusters)
+    ranked = top_terms(weights, vocabulary)
+    names = [name_from_terms(t) for t in ranked]
+    terms = ["; ".join(t) for t in ranked]
+    for c, (name, kept_terms) in keep_names.items():
+        names[c], terms[c] = name, kept_terms
+
+    # Two clusters can land on the same top terms; keep names unique for the
+    # dropdown. Kept names never change, so only fresh names get a suffix.
+    seen = {names[c] for c in keep_names}
+    for i, name in enumerate(names):
+        if i in keep_names:
+            continue
+        if name in seen:
+            names[i] = f"{name} ({i})"
+        seen.add(names[i])
+
+    df = df.copy()
+    df['cluster_name'] = [names[c] for c in labels]
+    df['cluster_terms'] = [terms[c] for c in labels]
+    kept = f", kept {len(keep_names)}" if keep_names else ""
+    print(f"Named {n_clusters - len(keep_names)} clusters{kept} ({len(vocabulary)} terms) "
+          f"in {timer() - start:.2f}s")
+    return df
+
+def label_starmap(input_file, output_file, n_clusters=None, keep_names=None):
+    """Reads a star map CSV, names its clusters and writes the labeled CSV the app loads."""
+    df = name_clusters(pd.read_csv(input_file), n_clusters, keep_names)
+    df.to_csv(output_file, index=False)
+    print(f"Saved labeled star map to {output_file}")
+    return df
+
+if __name__ == "__main__":
+    from src.plots.starmap_builder import starmap_paths, labeled_starmap_path
+
+    csv_file, _, _ = starmap_paths("tsne")
+    labeled = label_starmap(csv_file, labeled_starmap_path("tsne"))
+    for name in labeled.drop_duplicates('cluster_id').sort_values('cluster_id')['cluster_name']:
+        print(name)
@@ -0,0 +1,101 @@
+import numpy as np
+from timeit import default_timer as timer
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from src.plots.reduction import pca_project
+from src.utils.benchmark_data import clustered_embeddings
+
+
+def _make_model(n_clusters, method, batch_size, random_state):
+    if method == "minibatch":
+        # Streams the data in batches instead of holding full distance matrices per iteration
+        return MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size,
+                               random_state=random_state, n_init=3)
+    if method == "kmeans":
+        return KMeans(n_clusters=n_clusters, random_state=random_state)
+    raise ValueError(f"Unknown clustering method: {method}")
+
+def member_means(embeddings, labels, n_clusters):
+    """Cluster centers in the original embedding space (mean of each cluster's members)."""
+    sums = np.zeros((n_clusters, embeddings.shape[1]), dtype=np.float64)
+    np.add.at(sums, labels, embeddings)
+    counts = np.bincount(labels, minlength=n_clusters)
+    return (sums / np.maximum(counts, 1)[:, None]).astype(np.float32)
+
+def cluster_embeddings(embeddings, n_clusters=120, method="kmeans", pca_components=None,
+                       batch_size=4096, random_state=42):
+    """
+    Clusters creator embeddings into genres.
+
+    Args:
+        embeddings (np.ndarray): (N, dim) embeddings.
+        n_clusters (int): Number of clusters.
+        method (str): "kmeans" (full Lloyd) or "minibatch" (MiniBatchKMeans).
+        pca_components (int): Optional PCA dimensions to cluster in (e.g. 64).
+        batch_size (int): Mini-batch size for "minibatch".
+
+    Returns:
+        (np.ndarray, np.ndarray): labels (N,) and cluster centers in the original
+            embedding space (so they can be used to assign new creators later).
+    """
+    start = timer()
+    n_clusters = min(n_clusters, len(embeddings))
+    features = pca_project(embeddings, pca_components, random_state)
+    model = _make_model(n_clusters, method, batch_size, random_state)
+    labels = model.fit_predict(features)
+    reduced = f" on {features.shape[1]} PCA dims" if features.shape[1] != embeddings.shape[1] else ""
+    print(f"Clustered {len(embeddings)} points into {n_clusters} groups with {method}{reduced} "
+          f"in {timer() - start:.2f}s")
+    return labels, member_means(np.asarray(embeddings, dtype=np.float32), labels, n_clusters)
+
+def _score_k(features, k, method, batch_size, silhouette_sample, random_state):
+    start = timer()
+    model = _make_model(k, method, batch_size, random_state)
+    labels = model.fit_predict(features)
+    fit_seconds = timer() - start
+    silhouette = silhouette_score(
+        features, labels,
+        sample_size=min(silhouette_sample, len(features)),
+        random_state=random_state
+    )
+    return {"k": k, "inertia": float(model.inertia_), "silhouette": float(silhouette),
+            "seconds": fit_seconds}
+
+def sweep_k(embeddings, candidates=(40, 80, 120, 160, 200), method="minibatch",
+            pca_components=64, batch_size=4096, silhouette_sample=5000,
+            n_jobs=-1, random_state=42):
+    """
+    Fits one clustering per candidate k in parallel and reports inertia and
+    (sampled) silhouette for each, to help pick `n_clusters`.
+
+    Returns:
+        List[dict]: {"k", "inertia", "silhouette", "seconds"} per candidate, sorted by k.
+    """
+    features = pca_project(embeddings, pca_components, random_state)
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_score_k)(features, k, method, batch_size, silhouette_sample, random_state)
+        for k in candidates if k < len(features)
+    )
+    results.sort(key=lambda r: r["k"])
+
+    print(f"\n--- k sweep ({method}, {features.shape[1]} dims) ---")
+    for r in results:
+        print(f"k={r['k']:<4} | inertia: {r['inertia']:14.2f} | silhouette: {r['silhouette']:.4f} "
+              f"| {r['seconds']:.2f}s")
+    return results
+
+def benchmark_clustering(n=50_000, dim=1024, n_clusters=120, seed=42):
+    """Wall time of full KMeans vs mini-batch, with and without PCA, on synthetic data."""
+    embeddings = clustered_embeddings(n, dim, n_clusters, noise=2.0, rng=np.random.default_rng(seed))
+
+    print(f"\n--- Clustering benchmark (N={n}, dim={dim}, k={n_clusters}) ---")
+    for method, pca in (("kmeans", None), ("kmeans", 64), ("minibatch", None), ("minibatch", 64)):
+        start = timer()
+        labels, _ = cluster_embeddings(embeddings, n_clusters, method=method, pca_components=pca)
+        seconds = timer() - start
+        silhouette = silhouette_score(embeddings, labels, sample_size=5000, random_state=seed)
+        print(f"{method:<9} pca={str(pca):<4} | {seconds:7.2f}s | silhouette: {silhouette:.4f}")
+
+if __name__ == "__main__":
+    benchmark_clustering()
@@ -3,22 +3,29 @@ import json
 import pandas as pd
 import numpy as np
 from googleapiclient.discovery import build
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.manifold import MDS, TSNE
 from src.scrapers.youtube.youtube import setup_youtube_client, fetch_batch_channel_details, fetch_recent_video_titles
 from src.utils.load_data import load_channel_info
+from src.embeddings.store import EmbeddingStore
+from src.graph.similarity_edges import similarity_edges
+from src.graph.graph_store import save_graph_binary, graph_binary_dir
+from src.utils.thumbnail_cache import ThumbnailCache
+from src.plots.reduction import reduce_embeddings
+from src.utils.model_registry import get_sentence_transformer
 
 DATA_DIR = "data"
 YAML_DIR = "yamls"
 GRAPH_FILE_PATH = os.path.join(DATA_DIR, "graph_data.json")
+MODEL_ID = "all-MiniLM-L6-v2"
+SIMILARITY_THRESHOLD = 0.30
+# None (float32), "float16" or "int8" codes for the similarity pass
+EDGE_QUANTIZATION = None
 
 def build_graph(yt_client, rich_data_file=None):
     """
     Main execution flow:
     1. Fetch Channel Data
     2. Generate Embeddings for Descriptions
-    3. Calculate 2D Coordinates (MDS) for Plotting
+    3. Calculate 2D Coordinates (t-SNE) for Plotting
     4. Calculate Similarity Edges
     5. Save Nodes (with x,y) and Edges to JSON
     """
@@ -66,34 +73,33 @@ def build_graph(yt_client, rich_data_file=None):
                 json.dump(channels, f, indent=2)
 
     # 2. Generate Embeddings
-    print("Loading embedding model (this runs locally)...")
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    
     print("Generating embeddings for enriched channel data...")
     # Extract the rich text from our channel list
     rich_descriptions = [ch['rich_text'] for ch in channels]
-    embeddings = model.encode(rich_descriptions)
+
+    # Plain MiniLM store (the Fandom graph only uses it in "truncate" mode); only unseen texts are encoded
+    def encode_fn(texts):
+        model = get_sentence_transformer(MODEL_ID)
+        return model.encode(texts)
+
+    embeddings = EmbeddingStore(MODEL_ID).encode(rich_descriptions, encode_fn)
     
-    # 3. Calculate Cosine Similarity Matrix
+    # 3. Calculate Cosine Similarity Edges (block-wise, no N x N matrix)
     print("Calculating relationships...")
-    similarity_matrix = cosine_similarity(embeddings)
-    distance_matrix = 1 - similarity_matrix  # Convert similarity to distance
-
-    # Use MDS to project high-dimensional embeddings to 2D x,y coordinates
-    # mds = MDS(n_components=2, dissimilarity="precomputed", random_state=42)
-    # coords_mds = mds.fit_transform(distance_matrix)
+    sources, targets, weights = similarity_edges(
+        embeddings, threshold=SIMILARITY_THRESHOLD, quantization=EDGE_QUANTIZATION
+    )
 
-    # Option 2: TSNE
+    # Project the embeddings to 2D x,y coordinates with t-SNE
     n_samples = len(embeddings)
     perplexity_val = min(5, max(1, n_samples - 1))
-    tsne = TSNE(
+    coords_tsne = reduce_embeddings(
+        embeddings,
         n_components=2,
+        method="tsne",
         perplexity=perplexity_val,
-        random_state=42,
-        init='pca',
-        learning_rate='auto'
+        random_state=42
     )
-    coords_tsne = tsne.fit_transform(embeddings)
     
     # 5. Construct Graph
     nodes = []
@@ -111,18 +117,13 @@ def build_graph(yt_client, rich_data_file=None):
             "shape": "circularImage"
         })
         
-    SIMILARITY_THRESHOLD = 0.30 
-    
-    for i in range(len(channels)):
-        for j in range(i + 1, len(channels)):
-            score = float(similarity_matrix[i][j])
-            if score > SIMILARITY_THRESHOLD:
-                edges.append({
-                    "source": channels[i]['id'],
-                    "target": channels[j]['id'],
-                    "weight": score,
-                    "label": f"{score:.2f}"
-                })
+    for i, j, score in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+        edges.append({
+            "source": channels[i]['id'],
+            "target": channels[j]['id'],
+            "weight": score,
+            "label": f"{score:.2f}"
+        })
 
     graph_data = {
         "nodes": nodes,
@@ -132,6 +133,8 @@ def build_graph(yt_client, rich_data_file=None):
     os.makedirs(DATA_DIR, exist_ok=True)
     with open(GRAPH_FILE_PATH, 'w') as f:
         json.dump(graph_data, f, indent=2)
+    save_graph_binary(graph_binary_dir(GRAPH_FILE_PATH), nodes, sources, targets, weights)
+    ThumbnailCache().prefetch(n['image'] for n in nodes)
         
     print(f"Graph built! {len(nodes)} nodes and {len(edges)} edges.")
     print(f"Saved to {GRAPH_FILE_PATH}")
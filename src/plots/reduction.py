@@ -0,0 +1,135 @@
+import importlib.util
+import numpy as np
+from timeit import default_timer as timer
+from sklearn.decomposition import PCA
+from sklearn.manifold import TSNE
+from src.utils.benchmark_data import clustered_embeddings
+
+# PCA target before neighbor-embedding methods. ~50 dims keeps nearly all the
+# neighborhood structure of 384/1024-dim embeddings at a fraction of the cost.
+DEFAULT_PCA_DIMS = 50
+
+
+def pca_project(embeddings, pca_dims=DEFAULT_PCA_DIMS, random_state=42):
+    """PCA pre-projection (None to skip); returns the input unchanged if it is already small enough."""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if not pca_dims or pca_dims >= min(embeddings.shape):
+        return embeddings
+    return PCA(n_components=pca_dims, random_state=random_state).fit_transform(embeddings)
+
+def _run_sklearn_tsne(features, n_components, perplexity, random_state, n_jobs):
+    tsne = TSNE(
+        n_components=n_components,
+        perplexity=perplexity,
+        random_state=random_state,
+        init='pca',
+        learning_rate='auto',
+        method='barnes_hut',
+        n_jobs=n_jobs
+    )
+    return tsne.fit_transform(features)
+
+def _run_opentsne(features, n_components, perplexity, random_state, n_jobs):
+    from openTSNE import TSNE as OpenTSNE
+
+    # FFT interpolation is the fastest gradient but only supports 1-2 dimensions
+    gradient = "fft" if n_components <= 2 else "bh"
+    tsne = OpenTSNE(
+        n_components=n_components,
+        perplexity=perplexity,
+        random_state=random_state,
+        initialization="pca",
+        negative_gradient_method=gradient,
+        n_jobs=n_jobs
+    )
+    return np.asarray(tsne.fit(features))
+
+def _run_umap(features, n_components, perplexity, random_state, n_jobs):
+    from umap import UMAP
+
+    # A fixed random_state makes UMAP single-threaded (see reduce_embeddings' parallel_umap)
+    reducer = UMAP(
+        n_components=n_components,
+        n_neighbors=min(30, max(2, len(features) - 1)),
+        min_dist=0.1,
+        metric='cosine',
+        random_state=random_state,
+        n_jobs=n_jobs if random_state is None else 1
+    )
+    return reducer.fit_transform(features)
+
+REDUCERS = {
+    "tsne": _run_sklearn_tsne,
+    "opentsne": _run_opentsne,
+    "umap": _run_umap,
+}
+# Optional packages each method imports (sklearn is always installed)
+OPTIONAL_PACKAGES = {"opentsne": "openTSNE", "umap": "umap"}
+
+def is_available(method):
+    package = OPTIONAL_PACKAGES.get(method)
+    return package is None or importlib.util.find_spec(package) is not None
+
+def reduce_embeddings(embeddings, n_components=2, method="tsne", pca_dims=DEFAULT_PCA_DIMS,
+                      perplexity=30, random_state=42, n_jobs=-1, parallel_umap=False):
+    """
+    Projects embeddings to 2D/3D for plotting: PCA first, then t-SNE or UMAP.
+
+    Args:
+        embeddings (np.ndarray): (N, dim) embeddings.
+        n_components (int): Output dimensions (2 for the graphs, 3 for the star map).
+        method (str): "tsne" (sklearn Barnes-Hut, multithreaded), "opentsne"
+            (FFT/BH, multithreaded, needs `pip install openTSNE`) or "umap".
+            Falls back to "tsne" if the optional package is missing.
+        pca_dims (int): PCA dimensions before the neighbor embedding (None to skip).
+        perplexity (float): t-SNE perplexity (clipped to N - 1).
+        random_state (int): Seed for reproducible layouts.
+        n_jobs (int): Threads to use (-1 = all cores).
+        parallel_umap (bool): UMAP only. Seeded UMAP runs on one thread; True
+            opts into an unseeded run on `n_jobs` threads instead (faster, but
+            the layout then differs between runs).
+
+    Returns:
+        np.ndarray: (N, n_components) coordinates.
+    """
+    if method not in REDUCERS:
+        raise ValueError(f"Unknown reduction method: {method}. Options: {list(REDUCERS)}")
+    perplexity = min(perplexity, max(1, len(embeddings) - 1))
+
+    start = timer()
+    features = pca_project(embeddings, pca_dims, random_state)
+    pca_seconds = timer() - start
+
+    seed = None if method == "umap" and parallel_umap else random_state
+    start = timer()
+    try:
+        coords = REDUCERS[method](features, n_components, perplexity, seed, n_jobs)
+    except ImportError as e:
+        print(f"⚠️ {method} unavailable ({e}). Falling back to sklearn t-SNE.")
+        method = "tsne"
+        coords = _run_sklearn_tsne(features, n_components, perplexity, random_state, n_jobs)
+    reduce_seconds = timer() - start
+
+    print(f"Reduced {embeddings.shape[1]} -> {features.shape[1]} (PCA, {pca_seconds:.2f}s) "
+          f"-> {n_components} ({method}, {reduce_seconds:.2f}s)")
+    return coords
+
+def benchmark_reduction(embeddings, n_components=3, methods=("tsne", "opentsne", "umap"),
+                        pca_options=(None, DEFAULT_PCA_DIMS), perplexity=30):
+    """Times every method with and without PCA pre-projection on the same embeddings."""
+    print(f"\n--- Reduction benchmark (N={len(embeddings)}, dim={embeddings.shape[1]}) ---")
+    results = []
+    for method in methods:
+        if not is_available(method):
+            print(f"{method}: skipped ({OPTIONAL_PACKAGES[method]} is not installed)")
+            continue
+        for pca_dims in pca_options:
+            start = timer()
+            reduce_embeddings(embeddings, n_components, method, pca_dims, perplexity)
+            seconds = timer() - start
+            results.append({"method": method, "pca_dims": pca_dims, "seconds": seconds})
+            print(f"{method:<9} pca={str(pca_dims):<4} | {seconds:7.2f}s")
+    return results
+
+if __name__ == "__main__":
+    benchmark_reduction(clustered_embeddings(10_000, 1024, n_clusters=120, noise=2.0))
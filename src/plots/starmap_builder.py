@@ -2,36 +2,160 @@ import os
 import json
 import pandas as pd
 import numpy as np
-import torch # Required for hardware detection
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.manifold import TSNE
-from sklearn.cluster import KMeans
-from umap import UMAP
+from src.embeddings.store import EmbeddingStore
+from src.embeddings.batching import encode_length_sorted
+from src.embeddings.chunking import encode_chunked
+from src.embeddings.ann_index import IVFIndex
+from src.plots.clustering import cluster_embeddings
+from src.plots.cluster_naming import label_starmap
+from src.plots.reduction import reduce_embeddings
+from src.utils.columnar import write_table
+from src.utils.text_store import write_texts
+from src.utils.thumbnail_cache import ThumbnailCache
+from src.utils.model_registry import get_device, get_sentence_transformer, configure_threads, load_report
 
 # --- Configuration ---
 DATA_DIR = "data"
 INPUT_FILE = os.path.join(DATA_DIR, "fandom", "youtubers_data_combined.json")
+MODEL_ID = "Alibaba-NLP/gte-large-en-v1.5"
+# Token cap per bio and padded-token budget per forward pass (see batching.py)
+MAX_SEQ_LENGTH = 2048
+MAX_TOKENS_PER_BATCH = 16384
+# "chunked" embeds the whole bio as the mean of ~512-token windows;
+# "truncate" embeds the first MAX_SEQ_LENGTH tokens only.
+ENCODING_MODE = "chunked"
+CHUNK_WINDOW_WORDS = 384
+CHUNK_OVERLAP_WORDS = 32
+NUM_CLUSTERS = 120
+# "kmeans" (full) or "minibatch"; optional PCA dims to cluster in (None = full embeddings).
+# Use clustering.sweep_k() to compare candidate cluster counts.
+CLUSTER_METHOD = "kmeans"
+CLUSTER_PCA_COMPONENTS = None
+# PCA dims before t-SNE/UMAP (see reduction.py for timings per method)
+REDUCTION_PCA_DIMS = 50
+# UMAP only: True trades the seeded (reproducible, single-threaded) layout
+# for an unseeded run on all cores
+PARALLEL_UMAP = False
+# Vector storage in the ANN index: "float32", "float16" or "int8" (4x smaller,
+# ~0.98 recall@10 vs float32; see quantize.py / ann_index.py benchmarks)
+INDEX_STORAGE = "int8"
+# Columns the app needs to draw the map; bios go to a separate lookup store
+PLOT_COLUMNS = ['id', 'title', 'thumbnail', 'youtube_url', 'cluster_id', 'cluster_name', 'x', 'y', 'z']
 
-def get_best_device():
+def embedding_store(encoding_mode=ENCODING_MODE):
+    """GTE-Large embedding store for one encoding mode. Mode, window and
+    sequence cap change the embedding, so they are part of the store key."""
+    if encoding_mode == "chunked":
+        return EmbeddingStore(f"{MODEL_ID}:chunked{CHUNK_WINDOW_WORDS}-{CHUNK_OVERLAP_WORDS}")
+    return EmbeddingStore(f"{MODEL_ID}:max{MAX_SEQ_LENGTH}")
+
+def embed_creators(creators, encoding_mode=ENCODING_MODE):
     """
-    Automatically detects the best available hardware accelerator.
-    Prioritizes: NVIDIA (CUDA) > Mac (MPS) > CPU
+    Returns GTE-Large embeddings for creator records, in order.
+    Texts already in the embedding store are not re-encoded; the model is only
+    loaded if something is missing. Returns None if the model fails to load.
     """
-    if torch.cuda.is_available():
-        return "cuda"
-    elif torch.backends.mps.is_available():
-        return "mps"
+    text_corpus = []
+    for c in creators:
+        cleaned_description = c['description'].replace('\n', ' ')
+        if encoding_mode == "truncate":
+            # GTE Large has an 8192 token limit (approx 32,000 characters).
+            cleaned_description = cleaned_description[:32000]
+        text_corpus.append(f"{c['title']} - {cleaned_description}")
+
+    # Only load GTE-Large if some creator text is not in the embedding store yet
+    store = embedding_store(encoding_mode)
+    if not store.missing(text_corpus):
+        print(f"Embedding store [{store.model_id}]: all {len(text_corpus)} texts cached.")
+        return store.get(text_corpus)
+
+    target_device = get_device()
+    print(f"🚀 Hardware Accelerator Detected: {target_device.upper()}")
+
+    # This model is significantly larger and smarter than the previous ones.
+    # trust_remote_code=True is REQUIRED for GTE models.
+    try:
+        model = get_sentence_transformer(MODEL_ID, trust_remote_code=True)
+    except Exception as e:
+        print("\n❌ Error loading model. You might need to install `einops`.")
+        print("Try running: pip install einops")
+        print(f"Original Error: {e}")
+        return None
+
+    print("Generating embeddings (this will take longer due to model size)...")
+
+    # Length-sorted, token-budgeted batches; results come back in input order
+    def encode_batched(texts):
+        return encode_length_sorted(
+            model,
+            texts,
+            max_tokens_per_batch=MAX_TOKENS_PER_BATCH,
+            max_seq_length=MAX_SEQ_LENGTH,
+            show_progress_bar=True
+        )
+
+    if encoding_mode == "chunked":
+        # Windows from every creator share batches, then get mean-pooled per creator
+        encode_fn = lambda texts: encode_chunked(
+            texts, encode_batched, CHUNK_WINDOW_WORDS, CHUNK_OVERLAP_WORDS
+        )
     else:
-        return "cpu"
+        encode_fn = encode_batched
 
-def build_starmap(reduction_method="tsne"):
+    return store.encode(text_corpus, encode_fn)
+
+def starmap_paths(reduction_method="tsne", num_clusters=NUM_CLUSTERS):
+    """Returns the (csv, ann index, cluster model) paths for one star map build."""
+    out_dir = os.path.join(DATA_DIR, "processed", "plotly")
+    suffix = f"{reduction_method}_{num_clusters}"
+    return (
+        os.path.join(out_dir, f"starmap_data_{suffix}.csv"),
+        os.path.join(out_dir, f"starmap_index_{suffix}.npz"),
+        os.path.join(out_dir, f"starmap_model_{suffix}.npz"),
+    )
+
+def labeled_starmap_path(reduction_method="tsne", num_clusters=NUM_CLUSTERS):
+    """CSV with cluster names (the file app_combined.py reads)."""
+    out_dir = os.path.join(DATA_DIR, "processed", "plotly")
+    return os.path.join(out_dir, f"starmap_data_{reduction_method}_trimmed_{num_clusters}_labeled.csv")
+
+def columnar_starmap_paths(reduction_method="tsne", num_clusters=NUM_CLUSTERS):
+    """Returns the (columnar table dir, descriptions SQLite) paths the app loads."""
+    out_dir = os.path.join(DATA_DIR, "processed", "plotly")
+    suffix = f"{reduction_method}_{num_clusters}"
+    return (
+        os.path.join(out_dir, f"starmap_columns_{suffix}"),
+        os.path.join(out_dir, f"starmap_descriptions_{suffix}.sqlite"),
+    )
+
+def export_starmap(df, reduction_method="tsne", num_clusters=NUM_CLUSTERS):
+    """
+    Writes the labeled star map in the app's fast-load format: plotting columns
+    as a columnar table, descriptions keyed by creator ID in SQLite.
+    """
+    table_dir, descriptions_db = columnar_starmap_paths(reduction_method, num_clusters)
+    df = df.reset_index(drop=True)
+    write_table(df[[c for c in PLOT_COLUMNS if c in df.columns]], table_dir, categorical=('cluster_name',))
+    write_texts(descriptions_db, df['id'], df['description'])
+    print(f"Saved columnar star map to {table_dir} (descriptions in {descriptions_db})")
+
+    # Local, resized copies so the app's detail panel never waits on the CDN
+    ThumbnailCache().prefetch(df['thumbnail'])
+
+def build_starmap(reduction_method="tsne", encoding_mode=ENCODING_MODE, num_clusters=NUM_CLUSTERS, label=True,
+                  parallel_umap=PARALLEL_UMAP):
     """
     1. Loads scraped data.
-    2. Generates embeddings using GTE-Large (Hardware Accelerated).
+    2. Generates embeddings using GTE-Large (Hardware Accelerated),
+       either chunk-and-pool over the full bio or truncated ("encoding_mode").
     3. Clusters data into 'Genres' (K-Means).
-    4. Projects to 2D (t-SNE or UMAP).
-    5. Saves as a lightweight CSV for the App.
+    4. Projects to 3D ("tsne", "opentsne" or "umap", after PCA to 50 dims).
+    5. Saves as a lightweight CSV for the App, plus the ANN index and the
+       cluster centers that `starmap_incremental.py` uses to place new creators.
+    6. Names every cluster from its top c-TF-IDF terms (labeled CSV for the app).
+       With label=False this is left to the caller (see run_pipeline.py).
+    parallel_umap=True runs UMAP unseeded on all cores (see reduce_embeddings).
     """
     print("--- Starting Star Map Builder ---")
 
@@ -49,64 +173,30 @@ def build_starmap(reduction_method="tsne"):
         return
 
     # 2. Generate Embeddings
-    target_device = get_best_device()
-    print(f"🚀 Hardware Accelerator Detected: {target_device.upper()}")
-
-    print("Loading 'Alibaba-NLP/gte-large-en-v1.5'...")
-    # This model is significantly larger and smarter than the previous ones.
-    # trust_remote_code=True is REQUIRED for GTE models.
-    try:
-        model = SentenceTransformer(
-            'Alibaba-NLP/gte-large-en-v1.5', 
-            trust_remote_code=True,
-            device=target_device
-        )
-    except Exception as e:
-        print("\n❌ Error loading model. You might need to install `einops`.")
-        print("Try running: pip install einops")
-        print(f"Original Error: {e}")
+    embeddings = embed_creators(creators, encoding_mode)
+    if embeddings is None:
         return
 
-    print("Generating embeddings (this will take longer due to model size)...")
-    
-    text_corpus = []
-    for c in creators:
-        # GTE Large has an 8192 token limit (approx 32,000 characters).
-        # We increase the slice here to utilize that massive context window.
-        cleaned_description = c['description'].replace('\n', ' ')[:32000]
-        text_corpus.append(f"{c['title']} - {cleaned_description}")
-
-    # encode() handles batching automatically
-    embeddings = model.encode(text_corpus, show_progress_bar=True, batch_size=1)
-
     # 3. Clustering (The "Genre" Detector)
     print("Clustering creators into genres...")
-    num_clusters = 120 
-    kmeans = KMeans(n_clusters=num_clusters, random_state=42)
-    clusters = kmeans.fit_predict(embeddings)
-
-    if reduction_method == "tsne":
-        print("Projecting to 3D space with TSNE...")
-        n_samples = len(embeddings)
-        perplexity_val = min(30, max(2, n_samples - 1))
-        tsne = TSNE(
-            n_components=3, 
-            perplexity=perplexity_val, 
-            random_state=42, 
-            init='pca', 
-            learning_rate='auto'
-        )
-        coords = tsne.fit_transform(embeddings)
-    elif reduction_method == "umap":
-        print("Projecting to 3D space with UMAP...")
-        reducer = UMAP(
-            n_components=3,
-            n_neighbors=30,
-            min_dist=0.1,
-            metric='cosine',
-            random_state=42
-        )
-        coords = reducer.fit_transform(embeddings)
+    clusters, cluster_centers = cluster_embeddings(
+        embeddings,
+        n_clusters=num_clusters,
+        method=CLUSTER_METHOD,
+        pca_components=CLUSTER_PCA_COMPONENTS
+    )
+
+    # 4. Projection (seeded, multithreaded)
+    print(f"Projecting to 3D space with {reduction_method.upper()}...")
+    coords = reduce_embeddings(
+        embeddings,
+        n_components=3,
+        method=reduction_method,
+        pca_dims=REDUCTION_PCA_DIMS,
+        perplexity=30,
+        random_state=42,
+        parallel_umap=parallel_umap
+    )
 
     # 5. Build DataFrame & Save
     print("Saving Star Map data...")
@@ -124,7 +214,7 @@ def build_starmap(reduction_method="tsne"):
     })
 
     df.sort_values('cluster_id', inplace=True)
-    output_file = os.path.join(DATA_DIR, "processed", "plotly", f"starmap_data_{reduction_method}_{num_clusters}.csv")
+    output_file, index_file, model_file = starmap_paths(reduction_method, num_clusters)
     
     # Ensure directory exists
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
@@ -132,5 +222,23 @@ def build_starmap(reduction_method="tsne"):
     df.to_csv(output_file, index=False)
     print(f"Done! Saved {len(df)} nodes to {output_file}")
 
+    # 6. Semantic search index over the full embeddings (not the 3D projection)
+    print("Building nearest-neighbor index...")
+    index = IVFIndex.build(embeddings, [c['id'] for c in creators], storage=INDEX_STORAGE)
+    index.save(index_file)
+    print(f"Saved ANN index ({len(index.centroids)} lists) to {index_file}")
+
+    # 7. Cluster centers, so new creators can be assigned without refitting
+    np.savez(model_file, cluster_centers=cluster_centers)
+    print(f"Saved cluster model to {model_file}")
+
+    # 8. Cluster names + fast-load files for the app
+    if not label:
+        return
+    labeled = label_starmap(output_file, labeled_starmap_path(reduction_method, num_clusters), num_clusters)
+    export_starmap(labeled, reduction_method, num_clusters)
+
 if __name__ == "__main__":
-    build_starmap(reduction_method="tsne")
\ No newline at end of file
+    configure_threads()
+    build_starmap(reduction_method="tsne")
+    load_report()
\ No newline at end of file
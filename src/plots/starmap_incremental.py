@@ -0,0 +1,134 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from src.embeddings.ann_index import IVFIndex
+from src.plots.cluster_naming import label_starmap, stored_names
+from src.plots.starmap_builder import (
+    INPUT_FILE, ENCODING_MODE, NUM_CLUSTERS, embed_creators, starmap_paths, labeled_starmap_path,
+    export_starmap
+)
+
+# How many existing creators anchor a new creator's position
+K_NEIGHBORS = 10
+
+
+def place_by_neighbors(embeddings, index, coords_by_id, k=K_NEIGHBORS, jitter=0.01, seed=42):
+    """
+    Places new points into an existing layout as the similarity-weighted mean
+    of their k nearest existing creators' coordinates.
+
+    Args:
+        embeddings (np.ndarray): (n, dim) embeddings of the new creators.
+        index (IVFIndex): ANN index over the creators already on the map.
+        coords_by_id (dict): creator id -> np.ndarray([x, y, z]).
+        k (int): Neighbors per new creator.
+        jitter (float): Seeded noise, as a fraction of the layout's spread, so
+            creators with the same neighbors don't land on exactly the same spot.
+
+    Returns:
+        np.ndarray: (n, 3) coordinates.
+    """
+    rng = np.random.default_rng(seed)
+    layout = np.array(list(coords_by_id.values()), dtype=np.float64).reshape(-1, 3)
+    layout_center = layout.mean(axis=0) if len(layout) else np.zeros(3)
+    coords = np.empty((len(embeddings), 3), dtype=np.float64)
+    for i, vector in enumerate(embeddings):
+        ids, sims = index.search(vector, k)
+        on_map = [j for j, cid in enumerate(ids) if cid in coords_by_id]
+        if not on_map:
+            print(f"⚠️ No neighbors on the map for new creator #{i}; placing it at the layout center.")
+            coords[i] = layout_center
+            continue
+        neighbor_coords = np.array([coords_by_id[ids[j]] for j in on_map])
+        weights = np.clip(np.asarray(sims)[on_map], 0, None) ** 2
+        if weights.sum() == 0:
+            weights = np.ones(len(neighbor_coords))
+        coords[i] = np.average(neighbor_coords, axis=0, weights=weights)
+
+    layout_spread = np.std(layout, axis=0) if len(layout) else np.zeros(3)
+    return coords + rng.normal(scale=jitter, size=coords.shape) * layout_spread
+
+def assign_clusters(embeddings, cluster_centers):
+    """Nearest K-Means center per embedding (same rule as KMeans.predict)."""
+    distances = (
+        np.sum(embeddings ** 2, axis=1, keepdims=True)
+        - 2 * embeddings @ cluster_centers.T
+        + np.sum(cluster_centers ** 2, axis=1)
+    )
+    return np.argmin(distances, axis=1)
+
+def update_starmap(reduction_method="tsne", num_clusters=NUM_CLUSTERS,
+                   encoding_mode=ENCODING_MODE, input_file=INPUT_FILE):
+    """
+    Adds creators from `input_file` that are not on the star map yet, without
+    re-running clustering or t-SNE/UMAP. Existing coordinates never move.
+
+    1. Diffs the scraped creators against the saved star map CSV.
+    2. Embeds only the new creators (embedding store cache).
+    3. Assigns each to its nearest saved K-Means center.
+    4. Places each at the weighted mean of its nearest neighbors' coordinates.
+    5. Appends to the CSV and the ANN index.
+    6. Re-names only the clusters that gained creators; the others keep
+       their stored names, so the app's groups don't get renamed under users.
+
+    Run `build_starmap` occasionally to refit the whole layout from scratch.
+    """
+    print("--- Starting Incremental Star Map Update ---")
+    csv_file, index_file, model_file = starmap_paths(reduction_method, num_clusters)
+
+    for path in (csv_file, index_file, model_file):
+        if not os.path.exists(path):
+            print(f"Error: {path} not found. Run a full build_starmap() first.")
+            return
+
+    with open(input_file, "r", encoding="utf-8") as f:
+        creators = json.load(f)
+
+    df = pd.read_csv(csv_file)
+    known_ids = set(df['id'].astype(str))
+    new_creators = [c for c in creators if str(c['id']) not in known_ids]
+
+    if not new_creators:
+        print("Star map is up to date. No new creators.")
+        return
+    print(f"Found {len(new_creators)} new creators (map has {len(df)}).")
+
+    embeddings = embed_creators(new_creators, encoding_mode)
+    if embeddings is None:
+        return
+
+    index = IVFIndex.load(index_file)
+    cluster_centers = np.load(model_file)["cluster_centers"]
+
+    clusters = assign_clusters(embeddings, cluster_centers)
+    coords_by_id = dict(zip(df['id'].astype(str), df[['x', 'y', 'z']].to_numpy()))
+    coords = place_by_neighbors(embeddings, index, coords_by_id)
+
+    new_df = pd.DataFrame({
+        'id': [c['id'] for c in new_creators],
+        'title': [c['title'] for c in new_creators],
+        'description': [c['description'] for c in new_creators],  # Full text, nothing truncated
+        'thumbnail': [c.get('thumbnail', '') for c in new_creators],
+        'youtube_url': [c.get('youtube_url', '') for c in new_creators],
+        'cluster_id': clusters,
+        'x': coords[:, 0],
+        'y': coords[:, 1],
+        'z': coords[:, 2],
+    })
+    # Match the existing column order; columns we can't fill yet stay empty
+    new_df.reindex(columns=df.columns).to_csv(csv_file, mode='a', header=False, index=False)
+
+    index.add(embeddings, [c['id'] for c in new_creators])
+    index.save(index_file)
+    print(f"Done! Appended {len(new_df)} creators to {csv_file} ({len(df) + len(new_df)} total).")
+
+    # Re-label so the labeled CSV includes the new creators; only changed clusters get new names
+    labeled_file = labeled_starmap_path(reduction_method, num_clusters)
+    changed = set(int(c) for c in clusters)
+    keep = {c: v for c, v in stored_names(labeled_file).items() if c not in changed}
+    labeled = label_starmap(csv_file, labeled_file, num_clusters, keep_names=keep)
+    export_starmap(labeled, reduction_method, num_clusters)
+
+if __name__ == "__main__":
+    update_starmap(reduction_method="tsne")
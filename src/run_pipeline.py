@@ -1,35 +1,146 @@
 import os
-from src.utils.load_data import scrape_comments
-from src.data_analyzer import run_analysis
-from timeit import default_timer as timer
+import json
+import argparse
+from src.scrapers.youtube.youtube import scrape_comments
+from src.scrapers.fandom import my_combined
+from src.data_analyzer import run_analysis, ANALYZED_CSV_PATH, SENTIMENT_MODEL_ID, KEYWORD_MODEL_ID
+from src.sentiment_rollups import build_rollups, ROLLUP_DIR, TIME_BUCKET
+from src.plots import starmap_builder
+from src.plots.starmap_builder import (
+    build_starmap, embed_creators, embedding_store, export_starmap,
+    starmap_paths, labeled_starmap_path, columnar_starmap_paths,
+)
+from src.plots.cluster_naming import label_starmap
+from src.graph_builder_fandom import build_fandom_graph
+from src import graph_builder_fandom
+from src.graph.graph_store import graph_binary_dir
+from src.utils.dag import Stage, Pipeline
 
 DATA_DIR = "data"
 YAML_DIR = "yamls"
 CSV_FILE_PATH = os.path.join(DATA_DIR, "raw_comments.csv")
+REDUCTION_METHOD = "tsne"
+PARALLEL_UMAP = starmap_builder.PARALLEL_UMAP
+NUM_CLUSTERS = starmap_builder.NUM_CLUSTERS
+
+
+def _embed_creators():
+    with open(starmap_builder.INPUT_FILE, "r", encoding="utf-8") as f:
+        creators = json.load(f)
+    if embed_creators(creators) is None:
+        raise RuntimeError("Embedding model failed to load")
+
+def _label_starmap():
+    output_file, _, _ = starmap_paths(REDUCTION_METHOD, NUM_CLUSTERS)
+    labeled = label_starmap(output_file, labeled_starmap_path(REDUCTION_METHOD, NUM_CLUSTERS), NUM_CLUSTERS)
+    export_starmap(labeled, REDUCTION_METHOD, NUM_CLUSTERS)
+
+def build_pipeline():
+    """
+    The offline pipeline as two independent branches:
+
+        scrape_comments -> analyze -> rollup
+        fandom_scrape -> embed -> starmap -> label
+                      \\-> graph
+
+    Each stage declares the files it reads and writes plus the settings that
+    shape its result, so re-running only redoes stages whose inputs changed.
+    The scrapers have no local inputs: they run once and then only with --force.
+    """
+    starmap_csv, index_file, model_file = starmap_paths(REDUCTION_METHOD, NUM_CLUSTERS)
+    table_dir, descriptions_db = columnar_starmap_paths(REDUCTION_METHOD, NUM_CLUSTERS)
+    graph_json = graph_builder_fandom.OUTPUT_FILE
+
+    return Pipeline([
+        # --- Comments branch ---
+        Stage(
+            "scrape_comments",
+            lambda: scrape_comments(data_dir=DATA_DIR, yaml_dir=YAML_DIR, csv_path=CSV_FILE_PATH,
+                                    skip_existing=False),
+            inputs=[os.path.join(YAML_DIR, "video_ids.yaml")],
+            outputs=[CSV_FILE_PATH],
+        ),
+        Stage(
+            "analyze",
+            lambda: run_analysis(csv_path=CSV_FILE_PATH),
+            inputs=[CSV_FILE_PATH],
+            outputs=[ANALYZED_CSV_PATH],
+            deps=["scrape_comments"],
+            params={"sentiment_model": SENTIMENT_MODEL_ID, "keyword_model": KEYWORD_MODEL_ID},
+        ),
+        Stage(
+            "rollup",
+            lambda: build_rollups(analyzed_csv=ANALYZED_CSV_PATH, out_dir=ROLLUP_DIR),
+            inputs=[ANALYZED_CSV_PATH],
+            outputs=[ROLLUP_DIR],
+            deps=["analyze"],
+            params={"time_bucket": TIME_BUCKET},
+        ),
+        # --- Fandom branch ---
+        Stage(
+            "fandom_scrape",
+            my_combined.main,
+            outputs=[my_combined.OUTPUT_FILE],
+        ),
+        Stage(
+            "embed",
+            _embed_creators,
+            inputs=[starmap_builder.INPUT_FILE],
+            outputs=[embedding_store().dir],
+            deps=["fandom_scrape"],
+            params={"model": starmap_builder.MODEL_ID, "encoding_mode": starmap_builder.ENCODING_MODE},
+        ),
+        Stage(
+            "starmap",
+            lambda: build_starmap(reduction_method=REDUCTION_METHOD, num_clusters=NUM_CLUSTERS, label=False,
+                                  parallel_umap=PARALLEL_UMAP),
+            inputs=[starmap_builder.INPUT_FILE],
+            outputs=[starmap_csv, index_file, model_file],
+            deps=["embed"],
+            params={
+                "reduction_method": REDUCTION_METHOD,
+                "parallel_umap": PARALLEL_UMAP,
+                "num_clusters": NUM_CLUSTERS,
+                "cluster_method": starmap_builder.CLUSTER_METHOD,
+                "index_storage": starmap_builder.INDEX_STORAGE,
+            },
+        ),
+        Stage(
+            "label",
+            _label_starmap,
+            inputs=[starmap_csv],
+            outputs=[labeled_starmap_path(REDUCTION_METHOD, NUM_CLUSTERS), table_dir, descriptions_db],
+            deps=["starmap"],
+        ),
+        Stage(
+            "graph",
+            build_fandom_graph,
+            inputs=[graph_builder_fandom.INPUT_FILE],
+            outputs=[graph_json, graph_binary_dir(graph_json)],
+            deps=["fandom_scrape"],
+            params={
+                "model": graph_builder_fandom.MODEL_ID,
+                "encoding_mode": graph_builder_fandom.ENCODING_MODE,
+                "threshold": graph_builder_fandom.SIMILARITY_THRESHOLD,
+                "max_edges_per_node": graph_builder_fandom.MAX_EDGES_PER_NODE,
+            },
+        ),
+    ])
 
 if __name__ == "__main__":
-    """Version 1 of offline pipeline.
-    
-    1. Scrape all raw data and save to CSV.
-    2. Analyze raw data with local ML models: Sentiment and Keywords
+    """Offline pipeline.
+
+    Usage:
+        python -m src.run_pipeline                  # everything that is out of date
+        python -m src.run_pipeline rollup label     # just these (and what they need)
+        python -m src.run_pipeline --force scrape_comments
     """
-    
+    parser = argparse.ArgumentParser(description="Run the offline data pipeline.")
+    parser.add_argument("targets", nargs="*", help="Stages to bring up to date (default: all).")
+    parser.add_argument("--force", nargs="*", default=None,
+                        help="Stages to re-run even if up to date (no names = all).")
+    args = parser.parse_args()
+    force = True if args.force == [] else (args.force or ())
+
     print("-- Starting the data pipeline --")
-    pipeline_start_time = timer()
-
-    # --- STEP 1: SCRAPE DATA ---
-    print("-- Starting data scraping --")
-    comments_df = scrape_comments(
-        data_dir=DATA_DIR,
-        yaml_dir=YAML_DIR,
-        csv_path=CSV_FILE_PATH
-    )
-    print("Data scraping finished.")
-    
-    # --- STEP 2: ANALYZE DATA ---
-    # print("-- Starting data analysis --")
-    # run_analysis(csv_path=CSV_FILE_PATH)
-
-    # pipeline_end_time = timer()
-    # print(f"\nPipeline finished after  {pipeline_end_time - pipeline_start_time:.2f} seconds..")
-    
\ No newline at end of file
+    build_pipeline().run(targets=args.targets or None, force=force)
@@ -5,13 +5,15 @@ import time
 import json
 import os
 from urllib.parse import unquote
-from utils
+from functools import partial
+from src.scrapers.fandom.pipeline import run_staged_pipeline
+from src.scrapers.fandom.page_store import RawPageStore
 
 # --- Configuration ---
 FANDOM_API_URL = "https://youtube.fandom.com/api.php"
 BASE_URL = "https://youtube.fandom.com"
 START_CATEGORY_URL = "https://youtube.fandom.com/wiki/Category:YouTubers"
-OUTPUT_FILE = "data/youtubers_data_combined.json"
+OUTPUT_FILE = "data/fandom/youtubers_data_combined.json"
 DELAY = 1.0
 
 # --- PART 1: API & Parsing Logic (Clean Data) ---
@@ -19,7 +21,7 @@ DELAY = 1.0
 def get_page_content(page_title):
     """
     Fetches the raw HTML content of a specific wiki page via API.
-    Returns: (html_content, page_id)
+    Returns: (html_content, page_id, revid)
     """
     params = {
         "action": "parse",
@@ -33,11 +35,12 @@ def get_page_content(page_title):
         data = response.json()
         
         if "parse" in data:
-            return data["parse"]["text"]["*"], data["parse"].get("pageid")
+            parsed = data["parse"]
+            return parsed["text"]["*"], parsed.get("pageid"), parsed.get("revid")
     except Exception as e:
         print(f"Error fetching content for {page_title}: {e}")
     
-    return None, None
+    return None, None, None
 
 def clean_wiki_text(html_content):
     """
@@ -178,9 +181,57 @@ def get_category_links(start_url, max_pages=None):
 
     return list(set(profile_links))
 
-# --- PART 3: Main Execution ---
+# --- PART 3: Pipeline Stages ---
 
-def main(links=None):
+def title_from_link(link):
+    """Extracts the page title from a profile URL (e.g. .../wiki/Gamer_Chad -> Gamer Chad)."""
+    raw_title = link.split('/wiki/')[-1]
+    return unquote(raw_title).replace('_', ' ')
+
+def fetch_page(link, page_store=None):
+    """
+    Fetch stage (I/O bound): downloads the raw API HTML for one profile link.
+    If a RawPageStore is given, the payload is archived for offline re-parsing.
+    Returns: dict with link, title, page_id and html, or None on failure.
+    """
+    title = title_from_link(link)
+    html_content, page_id, revid = get_page_content(title)
+
+    if not html_content:
+        print(f"  -> Failed to get content for {title}")
+        return None
+
+    if page_store is not None:
+        page_store.put(page_id, revid, html_content, title=title, link=link)
+
+    return {"link": link, "title": title, "page_id": page_id, "html": html_content}
+
+def parse_page(raw):
+    """
+    Parse stage (CPU bound): turns a fetched page into a creator record.
+    Runs inside a worker process, so it must stay a top-level function.
+    Returns: record dict, or None if the bio is empty.
+    """
+    html_content = raw["html"]
+    bio_text = clean_wiki_text(html_content)
+
+    # Filter out empty pages
+    if not bio_text:
+        print(f"  -> Skipping empty bio for {raw['title']}")
+        return None
+
+    return {
+        "id": f"fandom_{raw['page_id']}",
+        "title": raw["title"],
+        "description": bio_text,
+        "thumbnail": get_fandom_image(html_content),
+        "youtube_url": get_youtube_url(html_content),
+        "url": raw["link"]
+    }
+
+# --- PART 4: Main Execution ---
+
+def main(links=None, num_fetchers=2, num_parsers=None, queue_size=64, archive=True):
     # 1. If no links provided, crawl the category
     if not links:
         # Set max_pages=None to crawl EVERYTHING, or integer (e.g. 5) for testing
@@ -188,48 +239,39 @@ def main(links=None):
     
     print(f"\nFound {len(links)} profiles. Starting scrape...")
 
+    # 2. Scrape each link: fetchers -> parser processes -> writer
+    # The writer appends every record to a JSONL checkpoint as it arrives,
+    # so a crash mid-crawl keeps everything parsed so far.
+    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
+    checkpoint_file = OUTPUT_FILE + ".partial.jsonl"
+    url_order = {link: i for i, link in enumerate(links)}
     results = []
-    
-    # 2. Scrape each link
-    for i, link in enumerate(links):
-        # Extract Title from URL (e.g. .../wiki/Gamer_Chad -> Gamer Chad)
-        raw_title = link.split('/wiki/')[-1]
-        title = unquote(raw_title).replace('_', ' ')
-        
-        print(f"[{i+1}/{len(links)}] Scraping: {link}")
-        
-        # Use API to get clean content
-        html_content, page_id = get_page_content(title)
-        
-        if not html_content:
-            print(f"  -> Failed to get content for {title}")
-            continue
-
-        # Process Content
-        bio_text = clean_wiki_text(html_content)
-        image_url = get_fandom_image(html_content)
-        youtube_url = get_youtube_url(html_content)
-
-        # Filter out empty pages
-        if not bio_text:
-            print(f"  -> Skipping empty bio for {title}")
-            continue
-
-        results.append({
-            "id": f"fandom_{page_id}",
-            "title": title,
-            "description": bio_text,
-            "thumbnail": image_url,
-            "youtube_url": youtube_url,
-            "url": link
-        })
-        
-        time.sleep(DELAY) # API rate limit protection
+    page_store = RawPageStore() if archive else None
+
+    with open(checkpoint_file, 'w', encoding='utf-8') as checkpoint:
+        def write_record(record):
+            results.append(record)
+            checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+            checkpoint.flush()
+
+        run_staged_pipeline(
+            links,
+            fetch_fn=partial(fetch_page, page_store=page_store),
+            parse_fn=parse_page,
+            write_fn=write_record,
+            num_fetchers=num_fetchers,
+            num_parsers=num_parsers,
+            queue_size=queue_size,
+            fetch_delay=DELAY, # API rate limit protection (shared by all fetchers)
+        )
+
+    # Keep the crawl order stable regardless of which parser finished first
+    results.sort(key=lambda r: url_order[r["url"]])
 
     # 3. Save to JSON
-    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         json.dump(results, f, indent=4, ensure_ascii=False)
+    os.remove(checkpoint_file)
     
     print(f"\nScraping complete. Saved {len(results)} profiles to {OUTPUT_FILE}")
 
@@ -0,0 +1,104 @@
+import os
+import gzip
+import json
+import hashlib
+import threading
+import time
+
+# --- Configuration ---
+RAW_STORE_DIR = os.path.join("data", "fandom", "raw_pages")
+
+
+def read_object(path):
+    """Returns the decompressed HTML stored at an object path."""
+    with gzip.open(path, "rb") as f:
+        return f.read().decode("utf-8")
+
+
+class RawPageStore:
+    """
+    Content-addressed archive of raw Fandom API HTML.
+
+    Layout:
+        <store_dir>/objects/ab/abcdef....html.gz  (gzip'd HTML, named by its sha256)
+        <store_dir>/index.jsonl                   (one line per page_id + revision)
+
+    Identical payloads are only stored once, and re-fetching an unchanged
+    revision is a no-op. Safe to call `put` from several fetcher threads.
+    """
+
+    def __init__(self, store_dir=RAW_STORE_DIR):
+        self.store_dir = store_dir
+        self.objects_dir = os.path.join(store_dir, "objects")
+        self.index_file = os.path.join(store_dir, "index.jsonl")
+        self._lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self):
+        """Returns {"<page_id>:<revid>": entry} from the index file."""
+        index = {}
+        if os.path.exists(self.index_file):
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entry = json.loads(line)
+                        index[entry["key"]] = entry
+        return index
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.gz")
+
+    def put(self, page_id, revid, html_content, title=None, link=None):
+        """
+        Archives one fetched page.
+        Returns: sha256 hex digest of the HTML.
+        """
+        payload = html_content.encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self.object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a private temp file, then rename, so readers never see partial objects
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+        key = f"{page_id}:{revid}"
+        with self._lock:
+            if key not in self._index:
+                entry = {
+                    "key": key,
+                    "page_id": page_id,
+                    "revid": revid,
+                    "title": title,
+                    "link": link,
+                    "sha256": digest,
+                    "fetched_at": time.time(),
+                }
+                self._index[key] = entry
+                with open(self.index_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return digest
+
+    def get(self, digest):
+        """Returns the decompressed HTML for a digest."""
+        return read_object(self.object_path(digest))
+
+    def latest_pages(self):
+        """
+        Returns the newest archived revision of every page, in first-fetched order.
+        Returns: List[dict] index entries.
+        """
+        latest = {}
+        for entry in self._index.values():
+            current = latest.get(entry["page_id"])
+            if current is None or (entry["revid"] or 0) >= (current["revid"] or 0):
+                latest[entry["page_id"]] = entry
+        return sorted(latest.values(), key=lambda e: e["fetched_at"])
+
+    def __len__(self):
+        return len(self._index)
@@ -0,0 +1,254 @@
+import os
+import queue
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer as timer
+
+# Sentinel pushed through the queues to tell a stage its upstream is finished.
+_DONE = object()
+
+
+def _process_context():
+    """
+    Start method for the parser pool. The pool is created while other threads
+    are running (the writer here, other stages under src.utils.dag), and a
+    forked child can inherit a lock some thread was holding and deadlock, so
+    workers are started fresh instead of forked.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class StageStats:
+    """Thread-safe counters for one pipeline stage (items, failures, throughput)."""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.start_time = timer()
+        self._lock = threading.Lock()
+
+    def record(self, duration, ok=True):
+        with self._lock:
+            if ok:
+                self.processed += 1
+            else:
+                self.failed += 1
+            self.busy_seconds += duration
+
+    def throughput(self):
+        """Items per second of wall-clock time since the pipeline started."""
+        elapsed = timer() - self.start_time
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"{self.name:<6} x{self.workers:<2} | done: {self.processed:>6} | "
+                f"failed: {self.failed:>4} | {self.throughput():6.2f} items/s")
+
+
+class RateLimiter:
+    """Spaces calls at least `min_interval` seconds apart across all threads."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.min_interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        time.sleep(max(0.0, slot - now))
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once `stop` is set; returns whether it was queued."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _report(stats, queues):
+    """Prints one status line per stage plus the current queue depths."""
+    depths = ", ".join(f"{name}={q.qsize()}" for name, q in queues.items())
+    print(f"  [pipeline] queue depth: {depths}")
+    for s in stats:
+        print(f"  [pipeline] {s.summary()}")
+
+
+def run_staged_pipeline(items, fetch_fn, parse_fn, write_fn,
+                        num_fetchers=4, num_parsers=None, queue_size=64,
+                        fetch_delay=0.0, report_interval=10.0):
+    """Runs a three stage fetch -> parse -> write pipeline over `items`.
+
+    Fetchers are threads (I/O bound) that push raw payloads into a bounded queue,
+    so downloads only block when the parsers fall behind by `queue_size` pages.
+    Parsing runs in a process pool (CPU bound) and a single writer thread hands
+    each parsed record to `write_fn` in completion order.
+
+    Args:
+        items (List): Work items handed to `fetch_fn` (e.g. profile URLs).
+        fetch_fn (callable): item -> raw payload, or None to drop the item.
+        parse_fn (callable): raw payload -> record, or None to drop it.
+            Must be a picklable top-level function (it runs in a subprocess
+            started with forkserver/spawn, see `_process_context`).
+        write_fn (callable): record -> None. Only ever called from one thread.
+        num_fetchers (int): Number of fetcher threads.
+        num_parsers (int): Number of parser processes (default: all cores).
+        queue_size (int): Max raw payloads buffered between fetch and parse.
+        fetch_delay (float): Minimum seconds between two requests, shared by
+            all fetchers (a global rate limit, whatever `num_fetchers` is).
+        report_interval (float): Seconds between status lines (0 disables).
+
+    Returns:
+        List[StageStats]: Final fetch/parse/write stats.
+
+    Raises:
+        The dispatcher's error if parse jobs can no longer be submitted (e.g.
+        BrokenProcessPool after a parser was killed); fetchers stop early.
+    """
+    num_parsers = num_parsers or os.cpu_count() or 1
+
+    link_queue = queue.Queue()
+    raw_queue = queue.Queue(maxsize=queue_size)
+    write_queue = queue.Queue(maxsize=queue_size)
+
+    for item in items:
+        link_queue.put(item)
+    for _ in range(num_fetchers):
+        link_queue.put(_DONE)
+
+    fetch_stats = StageStats("fetch", num_fetchers)
+    parse_stats = StageStats("parse", num_parsers)
+    write_stats = StageStats("write", 1)
+    all_stats = [fetch_stats, parse_stats, write_stats]
+    rate_limiter = RateLimiter(fetch_delay)
+    # Set when the parse stage dies, so fetchers stop instead of blocking on a full queue
+    stop = threading.Event()
+    dispatch_error = []
+
+    # --- Stage 1: Fetchers ---
+    def fetcher():
+        while not stop.is_set():
+            item = link_queue.get()
+            if item is _DONE:
+                break
+            rate_limiter.wait()
+            start = timer()
+            try:
+                raw = fetch_fn(item)
+            except Exception as e:
+                print(f"  -> Fetch failed for {item}: {e}")
+                raw = None
+            fetch_stats.record(timer() - start, ok=raw is not None)
+            if raw is not None:
+                _put(raw_queue, raw, stop)  # Blocks when parsers are behind (backpressure)
+
+    # --- Stage 2: Parser dispatch (feeds the process pool) ---
+    # Bound in-flight futures so the pool never holds more than the queue does.
+    in_flight = threading.BoundedSemaphore(num_parsers * 2)
+
+    def on_parsed(future, submitted_at):
+        in_flight.release()
+        try:
+            record = future.result()
+        except Exception as e:
+            print(f"  -> Parse failed: {e}")
+            record = None
+        parse_stats.record(timer() - submitted_at, ok=record is not None)
+        if record is not None:
+            write_queue.put(record)
+
+    def dispatcher(executor):
+        finished_fetchers = 0
+        while finished_fetchers < num_fetchers:
+            raw = raw_queue.get()
+            if raw is _DONE:
+                finished_fetchers += 1
+                continue
+            in_flight.acquire()
+            submitted_at = timer()
+            try:
+                future = executor.submit(parse_fn, raw)
+            except Exception as e:
+                in_flight.release()
+                print(f"  -> Parser pool failed, stopping the pipeline: {e}")
+                dispatch_error.append(e)
+                stop.set()
+                # Unblock fetchers waiting on a full queue
+                while True:
+                    try:
+                        raw_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                return
+            future.add_done_callback(lambda f, t=submitted_at: on_parsed(f, t))
+
+    # --- Stage 3: Writer ---
+    def writer():
+        while True:
+            record = write_queue.get()
+            if record is _DONE:
+                break
+            start = timer()
+            try:
+                write_fn(record)
+                write_stats.record(timer() - start)
+            except Exception as e:
+                print(f"  -> Write failed: {e}")
+                write_stats.record(timer() - start, ok=False)
+
+    queues = {"links": link_queue, "raw": raw_queue, "write": write_queue}
+    stop_reporting = threading.Event()
+
+    def reporter():
+        while not stop_reporting.wait(report_interval):
+            _report(all_stats, queues)
+
+    print(f"Pipeline: {num_fetchers} fetchers -> {num_parsers} parsers -> 1 writer "
+          f"(queue size {queue_size})")
+
+    writer_thread = threading.Thread(target=writer, name="fandom-writer", daemon=True)
+    writer_thread.start()
+    if report_interval:
+        threading.Thread(target=reporter, name="fandom-reporter", daemon=True).start()
+
+    with ProcessPoolExecutor(max_workers=num_parsers, mp_context=_process_context()) as executor:
+        dispatch_thread = threading.Thread(target=dispatcher, args=(executor,),
+                                           name="fandom-dispatch", daemon=True)
+        dispatch_thread.start()
+
+        fetchers = [threading.Thread(target=fetcher, name=f"fandom-fetch-{i}", daemon=True)
+                    for i in range(num_fetchers)]
+        for t in fetchers:
+            t.start()
+        for t in fetchers:
+            t.join()
+        for _ in range(num_fetchers):
+            _put(raw_queue, _DONE, stop)
+
+        dispatch_thread.join()
+        # Leaving the `with` block waits for the remaining parse futures.
+
+    write_queue.put(_DONE)
+    writer_thread.join()
+    stop_reporting.set()
+
+    print("Pipeline finished:" if not dispatch_error else "Pipeline stopped:")
+    for s in all_stats:
+        print(f"  {s.summary()}")
+    if dispatch_error:
+        raise dispatch_error[0]
+    return all_stats
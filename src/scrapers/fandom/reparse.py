@@ -0,0 +1,58 @@
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer as timer
+from src.scrapers.fandom.my_combined import OUTPUT_FILE, parse_page
+from src.scrapers.fandom.page_store import RawPageStore, RAW_STORE_DIR, read_object
+
+
+def _reparse_entry(args):
+    """
+    Worker: loads one archived page and runs the current parsers on it.
+    Decompression happens here too, so it is spread across all cores.
+    """
+    object_path, entry = args
+    raw = {
+        "link": entry["link"],
+        "title": entry["title"],
+        "page_id": entry["page_id"],
+        "html": read_object(object_path),
+    }
+    return parse_page(raw)
+
+def reparse_archive(store_dir=RAW_STORE_DIR, output_file=OUTPUT_FILE, workers=None):
+    """
+    Rebuilds the Fandom JSON entirely from the raw page archive (no network).
+    Use after changing clean_wiki_text, get_fandom_image or get_youtube_url.
+
+    Args:
+        store_dir (str): Root of the RawPageStore to read from.
+        output_file (str): Where to write the rebuilt JSON.
+        workers (int): Parser processes (default: all cores).
+    """
+    print("--- Re-parsing Fandom archive ---")
+    start_time = timer()
+
+    store = RawPageStore(store_dir)
+    entries = store.latest_pages()
+    if not entries:
+        print(f"Error: No archived pages found in {store_dir}. Run my_combined.py first.")
+        return
+
+    workers = workers or os.cpu_count() or 1
+    print(f"Re-parsing {len(entries)} archived pages with {workers} workers...")
+
+    jobs = [(store.object_path(entry["sha256"]), entry) for entry in entries]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parsed = executor.map(_reparse_entry, jobs, chunksize=16)
+        results = [record for record in parsed if record is not None]
+
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+
+    print(f"Re-parse complete in {timer() - start_time:.2f} seconds. "
+          f"Saved {len(results)} profiles to {output_file}")
+
+if __name__ == "__main__":
+    reparse_archive()
@@ -4,6 +4,7 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import pandas as pd
 import yaml
+from src.utils.load_data import load_video_ids
 
 def setup_youtube_client():
     """
@@ -90,13 +91,91 @@ def fetch_recent_video_titles(youtube, playlist_id, limit=10):
         print(f"Error fetching videos for playlist {playlist_id}: {e}")
         return []
 
-def scrape_comments(data_dir: str, yaml_dir: str, csv_path: str):
+def fetch_recent_uploads(youtube, playlist_id, limit=5):
+    """
+    Fetches the most recent uploads from a channel's uploads playlist.
+
+    Args:
+        youtube: The authenticated service object.
+        playlist_id (str): The ID of the uploads playlist.
+        limit (int): How many videos to fetch.
+
+    Returns:
+        list: Dicts with video_id, title and published_at (newest first).
+    """
+    response = youtube.playlistItems().list(
+        part="snippet,contentDetails",
+        playlistId=playlist_id,
+        maxResults=limit
+    ).execute()
+
+    return [
+        {
+            "video_id": item['contentDetails']['videoId'],
+            "title": item['snippet']['title'],
+            "published_at": item['contentDetails'].get('videoPublishedAt', item['snippet']['publishedAt']),
+        }
+        for item in response.get('items', [])
+    ]
+
+def fetch_new_comments(youtube, video_id, since=None, seen_ids=(), max_pages=10):
+    """
+    Fetches top-level comments posted since the last poll of a video.
+
+    Comments are requested newest first, so paging stops at the first comment
+    older than `since`. Comments posted exactly at `since` are skipped if
+    their id is in `seen_ids` (the ids already read at that timestamp).
+
+    Args:
+        youtube: The authenticated service object.
+        video_id (str): The video to read.
+        since (str): publishedAt of the newest comment already read (None = first poll).
+        seen_ids (Iterable[str]): Comment ids already read at `since`.
+        max_pages (int): Page cap per poll (100 comments each, 1 quota unit each).
+
+    Returns:
+        list: Comment dicts (video_id, comment_id, timestamp_utc, body, score), newest first.
+    """
+    seen_ids = set(seen_ids)
+    comments = []
+    next_page_token = None
+    for _ in range(max_pages):
+        response = youtube.commentThreads().list(
+            part='snippet',
+            videoId=video_id,
+            maxResults=100,
+            order='time',
+            pageToken=next_page_token,
+            textFormat='plainText'
+        ).execute()
+
+        for item in response['items']:
+            top = item['snippet']['topLevelComment']
+            comment = top['snippet']
+            if since is not None and (comment['publishedAt'] < since or
+                                      (comment['publishedAt'] == since and top['id'] in seen_ids)):
+                return comments
+            comments.append({
+                'video_id': video_id,
+                'comment_id': top['id'],
+                'timestamp_utc': comment['publishedAt'],
+                'body': comment['textDisplay'].replace('\n', ' ').replace('\r', ' ').strip(),
+                'score': comment['likeCount']
+            })
+
+        next_page_token = response.get('nextPageToken')
+        if not next_page_token:
+            break
+    return comments
+
+def scrape_comments(data_dir: str, yaml_dir: str, csv_path: str, skip_existing: bool = True):
     #TODO: Decide whether or not to keep
     """
     Scrapes comments from the defined video IDs and saves them to a CSV file.
+    With skip_existing, an existing CSV is returned instead of re-scraping.
     """
 
-    if os.path.exists(csv_path):
+    if skip_existing and os.path.exists(csv_path):
         print(f"Comments data already exists at {csv_path}. Skipping scraping.")
         return pd.read_csv(csv_path)
     youtube = setup_youtube_client()
@@ -143,6 +222,8 @@ def scrape_comments(data_dir: str, yaml_dir: str, csv_path: str):
                     # Append the data to our master list
                     all_comments_data.append({
                         'video_id': video_id,
+                        # The video's channel, so rollups can aggregate per creator
+                        'channel_id': item['snippet'].get('channelId', comment.get('channelId')),
                         'comment_id': item['snippet']['topLevelComment']['id'],
                         'timestamp_utc': comment['publishedAt'],
                         'body': body,
@@ -0,0 +1,125 @@
+import os
+import pandas as pd
+from timeit import default_timer as timer
+
+DATA_DIR = "data"
+ROLLUP_DIR = os.path.join(DATA_DIR, "rollups")
+SENTIMENTS = ["Negative", "Neutral", "Positive"]
+# Rows read per chunk, so memory stays flat no matter how many comments there are
+CHUNK_SIZE = 200_000
+# Timeline resolution (pandas offset alias)
+TIME_BUCKET = "1h"
+# Keyword table size kept for the dashboard
+TOP_KEYWORDS = 500
+
+ROLLUP_FILES = {
+    "totals": "sentiment_totals.csv",
+    "by_time": "sentiment_by_time.csv",
+    "by_video": "sentiment_by_video.csv",
+    "by_creator": "sentiment_by_creator.csv",
+    "keywords": "negative_keywords.csv",
+}
+
+
+def _add(total, part):
+    """Running sum of count tables (Series or DataFrame) across chunks."""
+    return part if total is None else total.add(part, fill_value=0)
+
+def _sentiment_counts(chunk, key):
+    """(key x sentiment) comment counts for one chunk."""
+    counts = chunk.groupby([key, 'sentiment_label']).size().unstack(fill_value=0)
+    return counts.reindex(columns=SENTIMENTS, fill_value=0)
+
+def _finish(counts, key):
+    """Integer counts plus total and negative share, with `key` as a column."""
+    counts = counts.fillna(0).astype(int)
+    counts['total'] = counts[SENTIMENTS].sum(axis=1)
+    counts['negative_pct'] = (100 * counts['Negative'] / counts['total'].clip(lower=1)).round(2)
+    return counts.rename_axis(key).reset_index()
+
+def build_rollups(analyzed_csv=None, out_dir=ROLLUP_DIR, chunk_size=CHUNK_SIZE,
+                  time_bucket=TIME_BUCKET, top_keywords=TOP_KEYWORDS):
+    """
+    Materializes the small tables the Scandal-O-Meter reads, in one streaming
+    pass over the analyzed comments:
+
+        sentiment_totals.csv      overall counts per sentiment
+        sentiment_by_time.csv     counts per time bucket
+        sentiment_by_video.csv    counts per video
+        sentiment_by_creator.csv  counts per channel (if comments carry a channel_id)
+        negative_keywords.csv     keyword frequencies in negative comments
+
+    Args:
+        analyzed_csv (str): Output of `run_analysis` (default: its ANALYZED_CSV_PATH).
+        out_dir (str): Where to write the rollups.
+        chunk_size (int): Rows per chunk.
+        time_bucket (str): Timeline bucket size, e.g. "1h" or "1D".
+        top_keywords (int): Keywords kept in the frequency table.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The rollup tables (keys as in ROLLUP_FILES).
+    """
+    if analyzed_csv is None:
+        # Imported here so the dashboard can read rollups without loading torch
+        from src.data_analyzer import ANALYZED_CSV_PATH
+        analyzed_csv = ANALYZED_CSV_PATH
+    if not os.path.exists(analyzed_csv):
+        raise FileNotFoundError(f"Analyzed data CSV not found at {analyzed_csv}")
+
+    start = timer()
+    header = pd.read_csv(analyzed_csv, nrows=0).columns
+    has_creator = 'channel_id' in header
+    usecols = [c for c in ['video_id', 'channel_id', 'timestamp_utc', 'sentiment_label', 'keywords']
+               if c in header]
+
+    totals = by_time = by_video = by_creator = keywords = None
+    rows = 0
+    for chunk in pd.read_csv(analyzed_csv, usecols=usecols, chunksize=chunk_size):
+        rows += len(chunk)
+        chunk['timestamp_utc'] = pd.to_datetime(chunk['timestamp_utc'], errors='coerce', utc=True)
+        chunk = chunk.dropna(subset=['timestamp_utc', 'sentiment_label'])
+        chunk['bucket'] = chunk['timestamp_utc'].dt.floor(time_bucket)
+
+        totals = _add(totals, chunk['sentiment_label'].value_counts())
+        by_time = _add(by_time, _sentiment_counts(chunk, 'bucket'))
+        by_video = _add(by_video, _sentiment_counts(chunk, 'video_id'))
+        if has_creator:
+            by_creator = _add(by_creator, _sentiment_counts(chunk, 'channel_id'))
+
+        negative = chunk.loc[chunk['sentiment_label'] == 'Negative', 'keywords'].dropna()
+        words = negative.astype(str).str.split(', ').explode().str.strip()
+        keywords = _add(keywords, words[words != ''].value_counts())
+
+    totals = (totals if totals is not None else pd.Series(dtype=int)).reindex(SENTIMENTS, fill_value=0)
+    rollups = {
+        "totals": totals.astype(int).rename_axis('sentiment').reset_index(name='count'),
+        "by_time": _finish(by_time if by_time is not None else pd.DataFrame(columns=SENTIMENTS), 'bucket'),
+        "by_video": _finish(by_video if by_video is not None else pd.DataFrame(columns=SENTIMENTS), 'video_id'),
+        "by_creator": _finish(by_creator if by_creator is not None else pd.DataFrame(columns=SENTIMENTS),
+                              'channel_id'),
+        "keywords": (keywords if keywords is not None else pd.Series(dtype=int))
+                    .astype(int).sort_values(ascending=False).head(top_keywords)
+                    .rename_axis('keyword').reset_index(name='count'),
+    }
+    rollups["by_time"] = rollups["by_time"].sort_values('bucket')
+    rollups["by_video"] = rollups["by_video"].sort_values('total', ascending=False)
+    rollups["by_creator"] = rollups["by_creator"].sort_values('total', ascending=False)
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name, filename in ROLLUP_FILES.items():
+        rollups[name].to_csv(os.path.join(out_dir, filename), index=False)
+
+    print(f"Built sentiment rollups from {rows} comments in {timer() - start:.2f}s -> {out_dir}")
+    return rollups
+
+def load_rollups(rollup_dir=ROLLUP_DIR):
+    """Reads the rollup tables back; returns None if they have not been built."""
+    paths = {name: os.path.join(rollup_dir, filename) for name, filename in ROLLUP_FILES.items()}
+    if not all(os.path.exists(p) for p in paths.values()):
+        return None
+    rollups = {name: pd.read_csv(path) for name, path in paths.items()}
+    rollups["by_time"]['bucket'] = pd.to_datetime(rollups["by_time"]['bucket'], utc=True)
+    return rollups
+
+if __name__ == "__main__":
+    build_rollups()
@@ -0,0 +1,354 @@
+import json
+import queue
+import threading
+import time
+import urllib.request
+import urllib.error
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# --- Configuration ---
+HOST = "127.0.0.1"
+PORT = 8765
+# A batch closes when it reaches MAX_BATCH_SIZE texts or its oldest request
+# has waited MAX_WAIT_MS, whichever comes first.
+MAX_BATCH_SIZE = 64
+MAX_WAIT_MS = 10
+# Backpressure: requests waiting beyond this are rejected with 503
+MAX_QUEUED_REQUESTS = 256
+MAX_TEXTS_PER_REQUEST = 256
+MAX_BODY_BYTES = 1 << 20
+REQUEST_TIMEOUT = 30.0
+# Client side: retries of a 503 (overloaded) reply, first backoff in seconds
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.5
+
+
+class ServiceOverloaded(Exception):
+    """Raised when the request queue is full."""
+
+
+class _Request:
+    __slots__ = ("texts", "enqueued", "done", "results", "error")
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+
+
+class ServiceMetrics:
+    """Thread-safe counters plus a rolling window of request latencies."""
+
+    def __init__(self, window=2000):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.rejected = 0
+        self.errors = 0
+        self.model_seconds = 0.0
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+
+    def record_batch(self, size, seconds):
+        with self.lock:
+            self.batches += 1
+            self.texts += size
+            self.model_seconds += seconds
+            self.batch_sizes.append(size)
+
+    def record_request(self, latency, error=False):
+        with self.lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.latencies.append(latency)
+
+    def record_rejected(self):
+        with self.lock:
+            self.rejected += 1
+
+    def snapshot(self, queue_depth=0):
+        with self.lock:
+            uptime = time.perf_counter() - self.started
+            latencies = sorted(self.latencies)
+            pct = lambda p: 1000 * latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else 0.0
+            return {
+                "uptime_seconds": round(uptime, 2),
+                "requests": self.requests,
+                "texts": self.texts,
+                "batches": self.batches,
+                "rejected": self.rejected,
+                "errors": self.errors,
+                "queue_depth": queue_depth,
+                "texts_per_second": round(self.texts / uptime, 2) if uptime else 0.0,
+                "mean_batch_size": round(sum(self.batch_sizes) / len(self.batch_sizes), 2) if self.batch_sizes else 0.0,
+                "model_seconds": round(self.model_seconds, 3),
+                "latency_ms": {"p50": round(pct(0.50), 2), "p95": round(pct(0.95), 2), "p99": round(pct(0.99), 2)},
+            }
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests into micro-batches for one warm model.
+
+    Callers block in `submit` while a single worker thread drains the queue:
+    it takes the oldest request, keeps adding requests until the batch holds
+    `max_batch_size` texts or `max_wait_ms` have passed since that request
+    arrived (requests already queued by then still join), runs `process_fn`
+    once, and hands each caller its slice.
+
+    Args:
+        process_fn (callable): List[str] -> (labels, scores), e.g. analyze_sentiment.
+        max_batch_size (int): Texts per model call (a larger single request runs alone).
+        max_wait_ms (float): Longest a request waits for others to join its batch.
+        max_queued_requests (int): Queue bound; `submit` raises ServiceOverloaded beyond it.
+    """
+
+    def __init__(self, process_fn, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS,
+                 max_queued_requests=MAX_QUEUED_REQUESTS):
+        self.process_fn = process_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue(maxsize=max_queued_requests)
+        self.metrics = ServiceMetrics()
+        self._carry = None
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, texts, timeout=REQUEST_TIMEOUT):
+        """Scores `texts`; returns [{"label", "score"}] in order."""
+        request = _Request(list(texts))
+        try:
+            self.queue.put_nowait(request)
+        except queue.Full:
+            self.metrics.record_rejected()
+            raise ServiceOverloaded(f"{self.queue.qsize()} requests queued")
+
+        if not request.done.wait(timeout):
+            raise TimeoutError(f"No result after {timeout}s")
+        self.metrics.record_request(time.perf_counter() - request.enqueued, request.error is not None)
+        if request.error is not None:
+            raise request.error
+        return request.results
+
+    def stop(self):
+        self._stop.set()
+        self._worker.join()
+
+    def _next_batch(self):
+        first = self._carry
+        self._carry = None
+        if first is None:
+            try:
+                first = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                return []
+
+        batch, size = [first], len(first.texts)
+        deadline = first.enqueued + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Past the deadline, still take whatever is already queued
+                request = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if size + len(request.texts) > self.max_batch_size:
+                self._carry = request  # Starts the next batch instead
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if not batch:
+                continue
+
+            texts = [text for request in batch for text in request.texts]
+            start = time.perf_counter()
+            try:
+                labels, scores = self.process_fn(texts)
+                error = None
+            except Exception as e:
+                error = e
+            self.metrics.record_batch(len(texts), time.perf_counter() - start)
+
+            offset = 0
+            for request in batch:
+                n = len(request.texts)
+                if error is None:
+                    request.results = [
+                        {"label": label, "score": float(score)}
+                        for label, score in zip(labels[offset:offset + n], scores[offset:offset + n])
+                    ]
+                else:
+                    request.error = error
+                offset += n
+                request.done.set()
+
+
+class _ServiceHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Default listen backlog (5) resets connections under bursts of clients
+    request_queue_size = 128
+
+def _make_handler(batcher):
+    class SentimentHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                self._send_json(200, batcher.metrics.snapshot(batcher.queue.qsize()))
+            elif self.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/analyze":
+                return self._send_json(404, {"error": "not found"})
+
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_BODY_BYTES:
+                return self._send_json(413, {"error": f"body larger than {MAX_BODY_BYTES} bytes"})
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                texts = payload["texts"] if "texts" in payload else [payload["text"]]
+                texts = [str(t) for t in texts]
+            except (ValueError, KeyError, TypeError):
+                return self._send_json(400, {"error": 'expected {"texts": [...]} or {"text": "..."}'})
+            if len(texts) > MAX_TEXTS_PER_REQUEST:
+                return self._send_json(413, {"error": f"more than {MAX_TEXTS_PER_REQUEST} texts"})
+
+            start = time.perf_counter()
+            try:
+                results = batcher.submit(texts)
+            except ServiceOverloaded as e:
+                return self._send_json(503, {"error": f"overloaded: {e}"}, {"Retry-After": "1"})
+            except TimeoutError as e:
+                return self._send_json(504, {"error": str(e)})
+            except Exception as e:
+                return self._send_json(500, {"error": str(e)})
+            self._send_json(200, {
+                "results": results,
+                "latency_ms": round(1000 * (time.perf_counter() - start), 2),
+            })
+
+        def log_message(self, format, *args):
+            pass  # One line per request would drown the metrics
+
+    return SentimentHandler
+
+def load_sentiment_fn():
+    """analyze_sentiment bound to the shared, warm sentiment pipeline."""
+    from src.data_analyzer import SENTIMENT_MODEL_ID, analyze_sentiment
+    from src.utils.model_registry import get_sentiment_pipeline
+
+    sentiment_pipeline = get_sentiment_pipeline(SENTIMENT_MODEL_ID)
+    return lambda texts: analyze_sentiment(texts, sentiment_pipeline)
+
+def make_server(process_fn=None, host=HOST, port=PORT, **batcher_kwargs):
+    """
+    Builds the HTTP server (not started). `process_fn` defaults to the real
+    sentiment model; pass any List[str] -> (labels, scores) callable to run
+    the service without it. Use port=0 to pick a free port.
+
+    Returns:
+        (ThreadingHTTPServer, MicroBatcher)
+    """
+    batcher = MicroBatcher(process_fn or load_sentiment_fn(), **batcher_kwargs)
+    server = _ServiceHTTPServer((host, port), _make_handler(batcher))
+    return server, batcher
+
+def _post_texts(texts, url, timeout):
+    request = urllib.request.Request(
+        f"{url}/analyze",
+        data=json.dumps({"texts": list(texts)}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)["results"]
+
+def analyze_remote(texts, url=f"http://{HOST}:{PORT}", timeout=REQUEST_TIMEOUT,
+                   max_retries=MAX_RETRIES, backoff=RETRY_BACKOFF):
+    """
+    Client helper: scores texts through a running service.
+
+    Texts are sent in requests of at most MAX_TEXTS_PER_REQUEST. A request
+    rejected with 503 (queue full) is retried after the server's Retry-After,
+    or an exponential backoff, up to `max_retries` times.
+
+    Returns:
+        (List[str], List[float]): labels and scores, like analyze_sentiment.
+    """
+    texts = list(texts)
+    results = []
+    for i in range(0, len(texts), MAX_TEXTS_PER_REQUEST):
+        chunk = texts[i:i + MAX_TEXTS_PER_REQUEST]
+        for attempt in range(max_retries + 1):
+            try:
+                results += _post_texts(chunk, url, timeout)
+                break
+            except urllib.error.HTTPError as e:
+                if e.code != 503 or attempt == max_retries:
+                    raise
+                retry_after = e.headers.get("Retry-After")
+                time.sleep(float(retry_after) if retry_after else backoff * 2 ** attempt)
+    return [r["label"] for r in results], [r["score"] for r in results]
+
+def load_test(url=f"http://{HOST}:{PORT}", clients=32, requests_per_client=20, texts_per_request=4):
+    """Hits a running service from concurrent clients and prints its metrics."""
+    def client(i):
+        rejected = 0
+        for j in range(requests_per_client):
+            texts = [f"client {i} request {j} comment {k}" for k in range(texts_per_request)]
+            try:
+                analyze_remote(texts, url, max_retries=0)
+            except urllib.error.HTTPError as e:
+                if e.code != 503:
+                    raise
+                rejected += 1
+        return rejected
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        rejected = sum(pool.map(client, range(clients)))
+    seconds = time.perf_counter() - start
+
+    with urllib.request.urlopen(f"{url}/metrics") as response:
+        metrics = json.load(response)
+    total = clients * requests_per_client
+    print(f"\n--- Load test: {clients} clients x {requests_per_client} requests x {texts_per_request} texts ---")
+    print(f"{total / seconds:.1f} requests/s | rejected: {rejected}")
+    print(json.dumps(metrics, indent=2))
+    return metrics
+
+if __name__ == "__main__":
+    from src.utils.model_registry import configure_threads
+
+    configure_threads()
+    server, batcher = make_server()
+    print(f"Sentiment service on http://{HOST}:{PORT} (POST /analyze, GET /metrics, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.stop()
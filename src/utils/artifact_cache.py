@@ -0,0 +1,132 @@
+import os
+import hashlib
+import threading
+from timeit import default_timer as timer
+
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+def _files(path):
+    if os.path.isdir(path):
+        for root, _, names in os.walk(path):
+            for name in sorted(names):
+                yield os.path.join(root, name)
+    elif os.path.exists(path):
+        yield path
+
+def fingerprint(paths, content_hash=False):
+    """
+    Digest identifying the current version of one or more files/directories.
+
+    By default it covers each file's path, size and mtime (cheap, one stat per
+    file). With `content_hash=True` the file bytes are hashed too, which also
+    catches rewrites that keep size and mtime. Missing paths hash as absent,
+    and files that disappear while the directory is walked are skipped.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{path}\0".encode("utf-8"))
+        for file in _files(str(path)):
+            # Builders write temp files and rename them, so a listed file can be gone by now
+            try:
+                stat = os.stat(file)
+                digest.update(f"{file}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode("utf-8"))
+                if content_hash:
+                    with open(file, "rb") as f:
+                        for block in iter(lambda: f.read(1 << 20), b""):
+                            digest.update(block)
+            except FileNotFoundError:
+                continue
+    return digest.hexdigest()[:16]
+
+
+class LiveArtifact:
+    """
+    A loaded build artifact (star map, graph, rollups) that follows its files.
+
+    A daemon thread loads the artifact as soon as the object is created, then
+    polls the fingerprint of `paths`. When it changes (and has stayed the same
+    for one more poll, so half-written files are not read), the new version is
+    loaded in the background and swapped in with a single reference
+    assignment. Readers keep getting the previous version until then, and keep
+    it if the reload fails (failed loads are retried on the next poll). If
+    there has never been a good load, `get` raises the loader's error.
+
+    Usage (one instance per process, e.g. inside st.cache_resource):
+        artifact = LiveArtifact([table_dir], load_table)
+        df = artifact.get()
+        key = artifact.version  # for caches derived from this version
+    """
+
+    def __init__(self, paths, loader, poll_interval=DEFAULT_POLL_INTERVAL, content_hash=False, name=None):
+        self.paths = [str(p) for p in paths]
+        self.loader = loader
+        self.poll_interval = poll_interval
+        self.content_hash = content_hash
+        self.name = name or os.path.basename(self.paths[0])
+        self._current = (None, None)  # (version, value), replaced atomically
+        self._error = None
+        self._loaded = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name=f"artifact-{self.name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def version(self):
+        return self._current[0]
+
+    def get(self, timeout=None):
+        """
+        Latest loaded value; only blocks until the very first load finishes.
+        Raises the loader's error if there has never been a good load.
+        """
+        return self.snapshot(timeout)[1]
+
+    def snapshot(self, timeout=None):
+        """(version, value) pair from the same load."""
+        self._loaded.wait(timeout)
+        if self._current[0] is None and self._error is not None:
+            raise self._error
+        return self._current
+
+    def stop(self):
+        self._stop.set()
+
+    def _load(self, version):
+        start = timer()
+        try:
+            value = self.loader()
+        except Exception as e:
+            self._error = e
+            print(f"⚠️ Loading {self.name} failed ({e}); keeping version {self.version}.")
+            return
+        self._current = (version, value)
+        self._error = None
+        print(f"Loaded {self.name} version {version} in {timer() - start:.2f}s")
+
+    def _poll(self, pending):
+        """One watch step; returns the fingerprint to compare against next time."""
+        seen = fingerprint(self.paths, self.content_hash)
+        if seen == pending and seen != self.version:
+            # Unchanged since the last poll: the writer is done
+            self._load(seen)
+        return seen
+
+    def _watch(self):
+        try:
+            pending = fingerprint(self.paths, self.content_hash)
+            self._load(pending)
+        except Exception as e:
+            self._error, pending = e, None
+            print(f"⚠️ Watching {self.name} failed ({e}); retrying.")
+        finally:
+            # Readers must never wait forever; they get the error instead
+            self._loaded.set()
+
+        while not self._stop.wait(self.poll_interval):
+            try:
+                pending = self._poll(pending)
+            except Exception as e:
+                print(f"⚠️ Watching {self.name} failed ({e}); keeping version {self.version}.")
@@ -0,0 +1,23 @@
+import numpy as np
+
+
+def clustered_embeddings(n, dim, n_clusters=None, noise=1.0, rng=None):
+    """
+    Synthetic embeddings for the benchmarks: `n` points scattered around
+    `n_clusters` random centers (default n // 100), so neighbor search,
+    thresholding and clustering behave roughly like real creator embeddings.
+
+    Args:
+        n (int): Number of points.
+        dim (int): Embedding dimensions.
+        n_clusters (int): Number of centers (default: n // 100, at least 1).
+        noise (float): Spread of each cluster (larger = harder to separate).
+        rng (np.random.Generator): Generator to draw from (default: seeded with 42).
+
+    Returns:
+        np.ndarray: (n, dim) float32 embeddings.
+    """
+    rng = rng if rng is not None else np.random.default_rng(42)
+    n_clusters = n_clusters or max(n // 100, 1)
+    centers = rng.normal(size=(n_clusters, dim)).astype(np.float32)
+    return centers[rng.integers(0, n_clusters, n)] + noise * rng.normal(size=(n, dim)).astype(np.float32)
@@ -0,0 +1,113 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = "schema.json"
+
+
+def save_npy(path, array):
+    """np.save via a temp file + rename: readers that memory-mapped the old
+    file keep a valid mapping while a rebuild replaces it."""
+    tmp = path + ".tmp.npy"
+    np.save(tmp, array)
+    os.replace(tmp, path)
+
+def _write_text(values, base):
+    """UTF-8 strings as one byte blob plus (N+1) offsets, so nothing is padded."""
+    encoded = [("" if pd.isna(v) else str(v)).encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    with open(base + ".utf8", "wb") as f:
+        f.write(b"".join(encoded))
+    save_npy(base + ".offsets.npy", offsets)
+
+def _read_text(base):
+    offsets = np.load(base + ".offsets.npy")
+    with open(base + ".utf8", "rb") as f:
+        blob = f.read()
+    values = np.empty(len(offsets) - 1, dtype=object)
+    values[:] = [blob[a:b].decode("utf-8") for a, b in zip(offsets[:-1], offsets[1:])]
+    return values
+
+def write_table(df, out_dir, categorical=()):
+    """
+    Saves a DataFrame as one file per column.
+
+    Layout:
+        <out_dir>/schema.json         (rows, [{name, kind}])
+        <out_dir>/<col>.npy           numeric columns (memory-mappable)
+        <out_dir>/<col>.codes.npy     categorical columns: int codes ...
+        <out_dir>/<col>.categories.json  ... and their labels
+        <out_dir>/<col>.utf8 + .offsets.npy  other text columns
+
+    Args:
+        df (pd.DataFrame): Table to save.
+        out_dir (str): Target directory (created if missing).
+        categorical (Iterable[str]): Text columns with few distinct values.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    columns = []
+    for name in df.columns:
+        base = os.path.join(out_dir, name)
+        if name in categorical:
+            values = pd.Categorical(df[name].astype(str))
+            save_npy(base + ".codes.npy", values.codes.astype(np.int32))
+            with open(base + ".categories.json", "w", encoding="utf-8") as f:
+                json.dump(list(values.categories), f, ensure_ascii=False)
+            kind = "category"
+        elif pd.api.types.is_numeric_dtype(df[name]):
+            save_npy(base + ".npy", np.ascontiguousarray(df[name].to_numpy()))
+            kind = "numeric"
+        else:
+            _write_text(df[name].to_numpy(), base)
+            kind = "text"
+        columns.append({"name": name, "kind": kind})
+
+    # Schema last: a reader never sees a half-written table as complete
+    with open(os.path.join(out_dir, SCHEMA_FILE), "w", encoding="utf-8") as f:
+        json.dump({"rows": len(df), "columns": columns}, f, indent=2)
+
+def read_table(in_dir, columns=None, mmap=True):
+    """
+    Loads column arrays written by `write_table`.
+
+    Args:
+        in_dir (str): Table directory.
+        columns (List[str]): Subset to load (default: all).
+        mmap (bool): Memory-map numeric columns instead of reading them.
+
+    Returns:
+        Dict[str, array-like]: numeric np.ndarray/memmap, categorical
+            pd.Categorical, text object arrays.
+    """
+    with open(os.path.join(in_dir, SCHEMA_FILE), "r", encoding="utf-8") as f:
+        schema = json.load(f)
+
+    table = {}
+    for column in schema["columns"]:
+        name, kind = column["name"], column["kind"]
+        if columns is not None and name not in columns:
+            continue
+        base = os.path.join(in_dir, name)
+        if kind == "numeric":
+            table[name] = np.load(base + ".npy", mmap_mode="r" if mmap else None)
+        elif kind == "category":
+            with open(base + ".categories.json", "r", encoding="utf-8") as f:
+                categories = json.load(f)
+            table[name] = pd.Categorical.from_codes(np.load(base + ".codes.npy"), categories)
+        else:
+            table[name] = _read_text(base)
+    return table
+
+def read_frame(in_dir, columns=None, mmap=False):
+    """
+    `read_table` as a DataFrame. With mmap=True the numeric columns stay
+    read-only views of the memory-mapped files (nothing is copied), so the
+    frame must not be modified in place.
+    """
+    table = read_table(in_dir, columns, mmap=mmap)
+    return pd.DataFrame(table, copy=False) if mmap else pd.DataFrame(table)
+
+def table_exists(in_dir):
+    return os.path.exists(os.path.join(in_dir, SCHEMA_FILE))
@@ -0,0 +1,199 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from timeit import default_timer as timer
+from src.utils.artifact_cache import fingerprint
+
+PIPELINE_STATE_DIR = os.path.join("data", ".pipeline")
+MAX_PARALLEL_STAGES = 2
+
+
+class Stage:
+    """
+    One step of a pipeline.
+
+    Args:
+        name (str): Unique stage name (also names its stamp file).
+        fn (callable): Runs the stage; called with no arguments.
+        inputs (List[str]): Files/directories the stage reads.
+        outputs (List[str]): Files/directories the stage writes.
+        deps (List[str]): Stages that must finish first.
+        params (dict): Settings that change the result (model, k, method...).
+        content_hash (bool): Hash input bytes instead of size + mtime.
+    """
+
+    def __init__(self, name, fn, inputs=(), outputs=(), deps=(), params=None, content_hash=False):
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        self.params = params or {}
+        self.content_hash = content_hash
+
+
+class Pipeline:
+    """
+    Runs stages as a DAG and skips the ones that are already up to date.
+
+    A stage's key is a hash of its name, params, the current fingerprint of its
+    inputs and the keys of the stages it depends on. After a stage succeeds,
+    the key and a fingerprint of its outputs are written to
+    <state_dir>/<stage>.json. On the next run a stage is skipped when its key
+    is unchanged and its outputs are still exactly what it wrote; any change
+    upstream changes the keys below it, so those stages run again.
+
+    Stages whose dependencies are done run in parallel (up to `max_workers`);
+    when one fails, everything downstream of it is reported as blocked.
+    Stage functions run on worker threads, so a stage that starts a process
+    pool must not fork (use a "forkserver"/"spawn" mp_context, as the Fandom
+    scraper's parser pool does).
+    """
+
+    def __init__(self, stages, state_dir=PIPELINE_STATE_DIR, max_workers=MAX_PARALLEL_STAGES):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_dir = state_dir
+        self.max_workers = max_workers
+        for stage in stages:
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        state = {}
+
+        def visit(name):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Pipeline has a cycle through '{name}'")
+            state[name] = "visiting"
+            for dep in self.stages[name].deps:
+                visit(dep)
+            state[name] = "done"
+
+        for name in self.stages:
+            visit(name)
+
+    def _stamp_path(self, name):
+        return os.path.join(self.state_dir, f"{name}.json")
+
+    def _read_stamp(self, name):
+        try:
+            with open(self._stamp_path(name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_stamp(self, name, stamp):
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp = self._stamp_path(name) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(stamp, f, indent=2)
+        os.replace(tmp, self._stamp_path(name))
+
+    def stage_key(self, stage, dep_keys):
+        digest = hashlib.sha256()
+        digest.update(stage.name.encode("utf-8"))
+        digest.update(json.dumps(stage.params, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(fingerprint(stage.inputs, stage.content_hash).encode("utf-8"))
+        for dep in sorted(stage.deps):
+            digest.update(f"{dep}={dep_keys[dep]}".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def _up_to_date(self, stage, key):
+        stamp = self._read_stamp(stage.name)
+        if stamp is None or stamp.get("key") != key:
+            return False
+        if not all(os.path.exists(path) for path in stage.outputs):
+            return False
+        return stamp.get("outputs") == fingerprint(stage.outputs)
+
+    def _execute(self, stage, key, force):
+        """Runs (or skips) one stage in a worker thread; returns (status, seconds)."""
+        if not force and self._up_to_date(stage, key):
+            return "skipped", 0.0
+        print(f"\n-- [{stage.name}] running --")
+        start = timer()
+        stage.fn()
+        seconds = timer() - start
+        missing = [path for path in stage.outputs if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"Stage '{stage.name}' did not write {missing}")
+        self._write_stamp(stage.name, {
+            "key": key,
+            "outputs": fingerprint(stage.outputs),
+            "params": stage.params,
+            "seconds": round(seconds, 3),
+        })
+        return "ran", seconds
+
+    def run(self, targets=None, force=()):
+        """
+        Runs `targets` (default: every stage) and whatever they depend on.
+
+        Args:
+            targets (List[str]): Stage names to bring up to date.
+            force (List[str] | bool): Stages to run even if up to date (True = all).
+
+        Returns:
+            Dict[str, dict]: Per stage, {"status": ran/skipped/failed/blocked, "seconds": float}.
+        """
+        selected = self._with_dependencies(targets or list(self.stages))
+        remaining = {name: set(self.stages[name].deps) for name in selected}
+        keys, results, running = {}, {}, {}
+        start = timer()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while remaining or running:
+                # Anything downstream of a failure can't run
+                for name in [n for n, deps in remaining.items()
+                             if any(results.get(d, {}).get("status") in ("failed", "blocked") for d in deps)]:
+                    results[name] = {"status": "blocked", "seconds": 0.0}
+                    del remaining[name]
+
+                ready = [n for n, deps in remaining.items() if all(d in results for d in deps)]
+                for name in ready:
+                    del remaining[name]
+                    stage = self.stages[name]
+                    # Inputs are fingerprinted only now, after upstream stages wrote them
+                    keys[name] = self.stage_key(stage, keys)
+                    is_forced = force is True or name in force
+                    running[pool.submit(self._execute, stage, keys[name], is_forced)] = name
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        status, seconds = future.result()
+                    except Exception as e:
+                        print(f"❌ Stage '{name}' failed: {e}")
+                        status, seconds = "failed", 0.0
+                    results[name] = {"status": status, "seconds": seconds}
+
+        self.report(results, timer() - start)
+        return results
+
+    def _with_dependencies(self, targets):
+        selected, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'")
+            if name not in selected:
+                selected.add(name)
+                stack.extend(self.stages[name].deps)
+        return selected
+
+    def report(self, results, total_seconds):
+        """Prints one line per stage: status and wall time."""
+        print("\n--- Pipeline stages ---")
+        for name in self.stages:
+            if name in results:
+                result = results[name]
+                print(f"  {name:<16} {result['status']:<8} {result['seconds']:>9.2f}s")
+        print(f"Pipeline finished in {total_seconds:.2f}s")
@@ -1,7 +1,7 @@
 # src/scraper.py
 import os
 import yaml
-from youtube_utils import get_channel_id_from_youtube
+from src.utils.youtube_utils import get_channel_id_from_youtube
 
 
 # --- Main Functions ---
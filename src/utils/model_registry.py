@@ -0,0 +1,95 @@
+import os
+import threading
+import torch
+from timeit import default_timer as timer
+
+# Loaded models and how long each took, keyed by (kind, model_id)
+_MODELS = {}
+_LOAD_SECONDS = {}
+_REGISTRY_LOCK = threading.Lock()
+_KEY_LOCKS = {}
+_DEVICE = None
+
+
+def get_device():
+    """
+    Detects the best available hardware accelerator, once per process.
+    Prioritizes: NVIDIA (CUDA) > Mac (MPS) > CPU
+
+    Returns: str ("cuda", "mps" or "cpu")
+    """
+    global _DEVICE
+    if _DEVICE is None:
+        if torch.cuda.is_available():
+            _DEVICE = "cuda"
+        elif torch.backends.mps.is_available():
+            _DEVICE = "mps"
+        else:
+            _DEVICE = "cpu"
+        print(f"Device: {_DEVICE.upper()}")
+    return _DEVICE
+
+def configure_threads(num_threads=None):
+    """
+    Sets the CPU thread count torch uses for inference.
+    Defaults to $TORCH_NUM_THREADS, or all cores.
+    """
+    num_threads = num_threads or int(os.environ.get("TORCH_NUM_THREADS", os.cpu_count() or 1))
+    torch.set_num_threads(num_threads)
+    print(f"Torch CPU threads: {num_threads}")
+    return num_threads
+
+def get_or_load(key, loader):
+    """
+    Returns the model registered under `key`, calling `loader()` only the first
+    time. Concurrent callers for the same key wait for a single load; different
+    keys load in parallel.
+    """
+    if key in _MODELS:
+        return _MODELS[key]
+
+    with _REGISTRY_LOCK:
+        key_lock = _KEY_LOCKS.setdefault(key, threading.Lock())
+
+    with key_lock:
+        if key not in _MODELS:
+            print(f"Loading {key[0]} '{key[1]}'...")
+            start = timer()
+            _MODELS[key] = loader()
+            _LOAD_SECONDS[key] = timer() - start
+            print(f"Loaded {key[0]} '{key[1]}' in {_LOAD_SECONDS[key]:.2f} seconds.")
+    return _MODELS[key]
+
+def get_sentence_transformer(model_id, trust_remote_code=False):
+    """Shared SentenceTransformer instance on the best device."""
+    def loader():
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_id, trust_remote_code=trust_remote_code, device=get_device())
+
+    return get_or_load(("sentence-transformer", model_id), loader)
+
+def get_keybert(model_id):
+    """KeyBERT wrapper around the shared SentenceTransformer (no second copy of the model)."""
+    def loader():
+        from keybert import KeyBERT
+        return KeyBERT(model=get_sentence_transformer(model_id))
+
+    return get_or_load(("keybert", model_id), loader)
+
+def get_sentiment_pipeline(model_id):
+    """Shared HuggingFace sentiment-analysis pipeline on the best device."""
+    def loader():
+        from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+        device = torch.device(get_device())
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        model = AutoModelForSequenceClassification.from_pretrained(model_id).to(device)
+        return pipeline(task="sentiment-analysis", model=model, tokenizer=tokenizer, device=device)
+
+    return get_or_load(("sentiment-pipeline", model_id), loader)
+
+def load_report():
+    """Prints and returns {(kind, model_id): seconds} for every model loaded so far."""
+    print("\n--- Model load times ---")
+    for (kind, model_id), seconds in _LOAD_SECONDS.items():
+        print(f"{kind:<20} {model_id:<45} {seconds:8.2f}s")
+    return dict(_LOAD_SECONDS)
@@ -0,0 +1,36 @@
+import os
+import sqlite3
+
+
+def write_texts(db_path, ids, texts, table="texts"):
+    """
+    Writes {id: text} into a SQLite file, replacing any existing rows.
+    Used for long per-creator fields (bios) that the apps only show one at a time.
+    """
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, text TEXT)")
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {table} (id, text) VALUES (?, ?)",
+            ((str(i), "" if t is None else str(t)) for i, t in zip(ids, texts)),
+        )
+    conn.close()
+
+
+class TextStore:
+    """Read-only lookup of texts by ID; safe to share across Streamlit sessions."""
+
+    def __init__(self, db_path, table="texts"):
+        self.db_path = db_path
+        self.table = table
+        uri = f"file:{db_path}?mode=ro"
+        self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    def get(self, item_id, default=""):
+        row = self.conn.execute(
+            f"SELECT text FROM {self.table} WHERE id = ?", (str(item_id),)
+        ).fetchone()
+        return row[0] if row else default
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,204 @@
+import os
+import io
+import json
+import hashlib
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from timeit import default_timer as timer
+
+# --- Configuration ---
+# Under ./static so Streamlit serves the files itself (server.enableStaticServing
+# in .streamlit/config.toml): ./static/<path> is served at /app/static/<path>
+STATIC_DIR = "static"
+STATIC_URL_PREFIX = "/app/static"
+THUMBNAIL_DIR = os.path.join(STATIC_DIR, "thumbnails")
+# Longest side after resizing; avatars are shown at 100-150 px
+THUMBNAIL_SIZE = 160
+JPEG_QUALITY = 85
+FETCH_TIMEOUT = 10
+PREFETCH_WORKERS = 8
+HEADERS = {"User-Agent": "Mozilla/5.0 (thumbnail cache)"}
+
+
+def resize_image(data, max_side=THUMBNAIL_SIZE):
+    """
+    Downscales image bytes to JPEG with the longest side <= max_side.
+    Returns (bytes, extension). Without Pillow the original bytes are kept.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return data, None
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGB")
+        image.thumbnail((max_side, max_side))
+        out = io.BytesIO()
+        image.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    return out.getvalue(), "jpg"
+
+def _sniff_extension(data):
+    if data.startswith(b"\x89PNG"):
+        return "png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data.startswith(b"GIF8"):
+        return "gif"
+    return "jpg"
+
+
+class ThumbnailCache:
+    """
+    Local, content-addressed store of resized creator thumbnails.
+
+    Layout:
+        <cache_dir>/objects/<aa>/<sha256>.<ext>  image bytes, named by their hash
+        <cache_dir>/index.json                   {url: "objects/<aa>/<sha256>.<ext>"}
+
+    Identical images behind different URLs are stored once. Lookups never
+    touch the network; `prefetch` (run at build time) fills the store.
+    """
+
+    def __init__(self, cache_dir=THUMBNAIL_DIR, max_side=THUMBNAIL_SIZE):
+        self.cache_dir = cache_dir
+        self.max_side = max_side
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self.index = {}
+        self._index_mtime = None
+        self._lock = threading.Lock()
+        self._reload_index()
+
+    def _reload_index(self):
+        """Re-reads index.json if another process (a builder) has updated it."""
+        try:
+            mtime = os.path.getmtime(self.index_file)
+        except OSError:
+            return
+        if mtime != self._index_mtime:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+            self._index_mtime = mtime
+
+    def save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self.index_file + ".tmp"
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.index, f)
+            os.replace(tmp, self.index_file)
+            self._index_mtime = os.path.getmtime(self.index_file)
+
+    def local_path(self, url):
+        """Path of the cached image for `url`, or None if it is not cached."""
+        if not url:
+            return None
+        relative = self.index.get(url)
+        if relative is None:
+            self._reload_index()
+            relative = self.index.get(url)
+        if relative is None:
+            return None
+        path = os.path.join(self.cache_dir, relative)
+        return path if os.path.exists(path) else None
+
+    def image_source(self, url):
+        """What to hand to st.image: the local file if cached, else the original URL."""
+        return self.local_path(url) or url
+
+    def static_url(self, url):
+        """
+        Short same-origin URL of the cached image (for agraph nodes), falling
+        back to the original URL. Only valid while the cache lives under STATIC_DIR.
+        """
+        path = self.local_path(url)
+        if path is None:
+            return url
+        relative = os.path.relpath(path, STATIC_DIR).replace(os.sep, "/")
+        return f"{STATIC_URL_PREFIX}/{relative}"
+
+    def store(self, url, data):
+        """Resizes and stores downloaded bytes; returns the local path."""
+        data, extension = resize_image(data, self.max_side)
+        digest = hashlib.sha256(data).hexdigest()
+        relative = os.path.join("objects", digest[:2], f"{digest}.{extension or _sniff_extension(data)}")
+        path = os.path.join(self.cache_dir, relative)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        with self._lock:
+            self.index[url] = relative
+        return path
+
+    def fetch(self, url, session=None, timeout=FETCH_TIMEOUT):
+        """Downloads one URL into the cache (no-op if cached). Returns the local path."""
+        path = self.local_path(url)
+        if path is not None:
+            return path
+        response = (session or requests).get(url, headers=HEADERS, timeout=timeout)
+        response.raise_for_status()
+        return self.store(url, response.content)
+
+    def prefetch(self, urls, max_workers=PREFETCH_WORKERS, max_pending=None, timeout=FETCH_TIMEOUT):
+        """
+        Downloads every uncached URL with a bounded thread pool.
+
+        At most `max_pending` downloads (default 4 x workers) are in flight or
+        queued at once, so huge URL lists don't pile up futures. Failed URLs
+        are reported and skipped; the index is saved at the end.
+
+        Returns:
+            dict: counts of cached / fetched / failed URLs.
+        """
+        start = timer()
+        urls = list(dict.fromkeys(u for u in urls if isinstance(u, str) and u.startswith("http")))
+        missing = [u for u in urls if self.local_path(u) is None]
+        stats = {"cached": len(urls) - len(missing), "fetched": 0, "failed": 0}
+        max_pending = max_pending or 4 * max_workers
+        print(f"Thumbnails: {stats['cached']} cached, fetching {len(missing)}...")
+
+        session = requests.Session()
+        pending = set()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for url in missing:
+                pending.add(pool.submit(self.fetch, url, session, timeout))
+                if len(pending) >= max_pending:
+                    self._drain(pending, stats, wait_for=1)
+            self._drain(pending, stats)
+
+        self.save_index()
+        print(f"Thumbnails: fetched {stats['fetched']}, failed {stats['failed']} "
+              f"in {timer() - start:.2f}s -> {self.cache_dir}")
+        return stats
+
+    def _drain(self, pending, stats, wait_for=None):
+        """Collects finished downloads (at least `wait_for` of them, or all)."""
+        done = 0
+        for future in as_completed(list(pending)):
+            pending.discard(future)
+            try:
+                future.result()
+                stats["fetched"] += 1
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"  thumbnail failed: {e}")
+            done += 1
+            if wait_for is not None and done >= wait_for:
+                break
+
+if __name__ == "__main__":
+    # Warm the cache for the Fandom graph and the star map
+    import pandas as pd
+
+    urls = []
+    graph_file = os.path.join("data", "graph", "fandom_graph_data_combined.json")
+    if os.path.exists(graph_file):
+        with open(graph_file, "r", encoding="utf-8") as f:
+            urls += [n.get('image') for n in json.load(f)['nodes']]
+    starmap_file = os.path.join("data", "processed", "plotly", "starmap_data_tsne_trimmed_120_labeled.csv")
+    if os.path.exists(starmap_file):
+        urls += pd.read_csv(starmap_file, usecols=['thumbnail'])['thumbnail'].tolist()
+    ThumbnailCache().prefetch(urls)
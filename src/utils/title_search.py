@@ -0,0 +1,114 @@
+import re
+import unicodedata
+import numpy as np
+from timeit import default_timer as timer
+
+
+def normalize_title(text):
+    """Lowercase, strip accents and punctuation: "Pokémon-Fan!" -> "pokemon fan"."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return re.sub(r"[\W_]+", " ", text).strip()
+
+def trigrams(text):
+    """Set of character trigrams of a normalized string, padded so short names still match."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleSearchIndex:
+    """
+    Typo-tolerant title lookup over character trigrams.
+
+    Posting lists are stored CSR-style (`offsets[t]:offsets[t+1]` into `postings`),
+    so a query touches only the titles that share a trigram with it. Candidates
+    are ranked by Dice similarity of trigram sets, with a bonus for exact
+    substring and prefix matches:
+
+        score = 2 * shared / (|query| + |title|) + 0.5 * substring + 0.5 * prefix
+    """
+
+    def __init__(self, titles):
+        start = timer()
+        self.titles = [normalize_title(t) for t in titles]
+        vocab = {}
+        doc_ids, gram_ids = [], []
+        self.gram_counts = np.empty(len(self.titles), dtype=np.int32)
+        for doc, title in enumerate(self.titles):
+            grams = trigrams(title)
+            self.gram_counts[doc] = len(grams)
+            for gram in grams:
+                gram_ids.append(vocab.setdefault(gram, len(vocab)))
+                doc_ids.append(doc)
+
+        gram_ids = np.asarray(gram_ids, dtype=np.int64)
+        order = np.argsort(gram_ids, kind="stable")
+        self.vocab = vocab
+        self.postings = np.asarray(doc_ids, dtype=np.int32)[order]
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(gram_ids, minlength=len(vocab)))))
+        self.build_seconds = timer() - start
+
+    def __len__(self):
+        return len(self.titles)
+
+    def search(self, query, limit=20, min_score=0.3, max_candidates=200):
+        """
+        Ranked matches for a free-text query.
+
+        Args:
+            query (str): Creator name, possibly misspelled or partial.
+            limit (int): Maximum results.
+            min_score (float): Drop matches scoring below this.
+            max_candidates (int): Titles (by shared trigrams) that get fully scored.
+
+        Returns:
+            (np.ndarray, np.ndarray): row indices and scores, best first.
+        """
+        query = normalize_title(query)
+        grams = [self.vocab[g] for g in trigrams(query) if g in self.vocab]
+        if not query or not grams:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        hits = np.concatenate([self.postings[self.offsets[g]:self.offsets[g + 1]] for g in grams])
+        candidates, shared = np.unique(hits, return_counts=True)
+        if len(candidates) > max_candidates:
+            keep = np.argpartition(-shared, max_candidates - 1)[:max_candidates]
+            candidates, shared = candidates[keep], shared[keep]
+
+        n_query = len(trigrams(query))
+        scores = 2 * shared / (n_query + self.gram_counts[candidates])
+        for i, doc in enumerate(candidates):
+            title = self.titles[doc]
+            if query in title:
+                scores[i] += 0.5
+                if title.startswith(query):
+                    scores[i] += 0.5
+
+        keep = scores >= min_score
+        candidates, scores = candidates[keep], scores[keep]
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return candidates[order].astype(np.int64), scores[order].astype(np.float32)
+
+def benchmark_title_search(n=100_000, n_queries=200, seed=42):
+    """Build time, query latency and hit rate for misspelled queries on synthetic names."""
+    rng = np.random.default_rng(seed)
+    syllables = ["ka", "zu", "mi", "ro", "tech", "play", "gam", "er", "vlog", "xo", "lin", "ster", "pro", "daily"]
+    titles = ["".join(rng.choice(syllables, rng.integers(2, 5))).title() + f" {i % 97}" for i in range(n)]
+
+    index = TitleSearchIndex(titles)
+    print(f"\n--- Title search benchmark (N={n}) ---")
+    print(f"Build: {index.build_seconds:.2f}s | {len(index.vocab)} trigrams")
+
+    hits = 0
+    start = timer()
+    for row in rng.choice(n, n_queries, replace=False):
+        typo = list(titles[row])
+        pos = rng.integers(0, len(typo))
+        typo[pos] = "q"  # one substituted character
+        found, _ = index.search("".join(typo), limit=10)
+        hits += row in found
+    latency = 1000 * (timer() - start) / n_queries
+    print(f"Query: {latency:.2f} ms | misspelled name in top 10: {hits / n_queries:.3f}")
+
+if __name__ == "__main__":
+    benchmark_title_search()
@@ -0,0 +1,331 @@
+import os
+import json
+import time
+import heapq
+import argparse
+from datetime import datetime, timezone
+import pandas as pd
+from src.utils.load_data import load_channel_info
+from src.scrapers.youtube.youtube import (
+    setup_youtube_client, fetch_batch_channel_details, fetch_recent_uploads, fetch_new_comments,
+)
+from src.sentiment_rollups import SENTIMENTS
+
+# --- Configuration ---
+YAML_DIR = "yamls"
+WATCH_DIR = os.path.join("data", "watch")
+STATE_FILE = os.path.join(WATCH_DIR, "watch_state.json")
+# Every scored comment, same columns as analyzed_data.csv plus channel_id,
+# so build_rollups(analyzed_csv=WATCH_COMMENTS_FILE) also fills by_creator
+WATCH_COMMENTS_FILE = os.path.join(WATCH_DIR, "watch_comments.csv")
+CREATOR_STATE_FILE = os.path.join(WATCH_DIR, "creator_state.csv")
+ALERTS_FILE = os.path.join(WATCH_DIR, "alerts.csv")
+
+# Uploads are re-listed this often; the newest RECENT_UPLOADS per channel are watched
+CHANNEL_POLL_SECONDS = 30 * 60
+RECENT_UPLOADS = 5
+MAX_VIDEO_AGE_DAYS = 7
+# Per-video poll interval: aim for about TARGET_COMMENTS_PER_POLL new comments
+# per poll, so busy videos are polled often and quiet ones rarely.
+# Each poll costs at least 1 unit of the 10k/day YouTube API quota.
+MIN_POLL_SECONDS = 60
+MAX_POLL_SECONDS = 60 * 60
+TARGET_COMMENTS_PER_POLL = 200
+VELOCITY_SMOOTHING = 0.3
+MAX_PAGES_PER_POLL = 10
+# Early warning: a poll whose negative share is far above the creator's baseline
+ALERT_MIN_COMMENTS = 30
+ALERT_NEGATIVE_PCT = 40.0
+ALERT_MARGIN_PCT = 15.0
+
+
+def _now():
+    return time.time()
+
+def _utc_iso(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _append_csv(df, path):
+    """Appends rows, writing the header only when the file is new."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_csv(path, mode='a', header=not os.path.exists(path), index=False, encoding='utf-8')
+
+def next_poll_interval(velocity, smoothed_velocity):
+    """
+    Seconds until a video's next poll, from its comment velocity (comments/s).
+
+    The larger of the latest and the smoothed velocity is used, so a video
+    whose comments are speeding up is polled sooner straight away, while one
+    that goes quiet slows down gradually.
+    """
+    rate = max(velocity, smoothed_velocity)
+    if rate <= 0:
+        return MAX_POLL_SECONDS
+    return min(MAX_POLL_SECONDS, max(MIN_POLL_SECONDS, TARGET_COMMENTS_PER_POLL / rate))
+
+
+class Watcher:
+    """
+    Long-running monitor for the channels in channel_ids.yaml.
+
+    Every CHANNEL_POLL_SECONDS it lists each channel's recent uploads. Each
+    watched video has its own schedule: a poll reads only comments newer than
+    the last one seen, scores just those, appends them to WATCH_COMMENTS_FILE
+    and adds them to the per-creator counters. The video's next poll is set
+    from its comment velocity (see `next_poll_interval`). All of this lives in
+    STATE_FILE, so a restarted watcher resumes where it stopped.
+
+    Args:
+        youtube: The authenticated YouTube service object.
+        score_fn (callable): List[str] -> (labels, scores); analyze_sentiment
+            bound to a pipeline, or `analyze_remote` for the sentiment service.
+        keyword_fn (callable): Optional List[str] -> List[str] for negative comments.
+        channels (dict): {name: channel_id}; defaults to channel_ids.yaml.
+    """
+
+    def __init__(self, youtube, score_fn, keyword_fn=None, channels=None, state_file=STATE_FILE):
+        self.youtube = youtube
+        self.score_fn = score_fn
+        self.keyword_fn = keyword_fn
+        self.state_file = state_file
+        self.state = self._load_state()
+        channels = channels if channels is not None else load_channel_info(YAML_DIR)
+        for name, channel_id in channels.items():
+            self.state["channels"].setdefault(channel_id, {
+                "name": name,
+                "uploads_playlist_id": None,
+                "counts": {s: 0 for s in SENTIMENTS},
+                "comments": 0,
+                "last_comment_at": None,
+            })
+        # (due time, video_id); stale entries are skipped when popped
+        self.queue = [(v["next_poll"], video_id) for video_id, v in self.state["videos"].items()]
+        heapq.heapify(self.queue)
+
+    # --- State ---
+    def _load_state(self):
+        if os.path.exists(self.state_file):
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {"channels": {}, "videos": {}, "last_channel_poll": 0}
+
+    def save_state(self):
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp = self.state_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.state_file)
+
+        rows = []
+        for channel_id, c in self.state["channels"].items():
+            rows.append({"channel_id": channel_id, "name": c["name"], **c["counts"], "total": c["comments"],
+                         "negative_pct": round(100 * c["counts"]["Negative"] / max(c["comments"], 1), 2),
+                         "last_comment_at": c["last_comment_at"]})
+        pd.DataFrame(rows).to_csv(CREATOR_STATE_FILE, index=False)
+
+    # --- Channels ---
+    def poll_channels(self):
+        """Resolves uploads playlists once, then adds new uploads and drops old ones."""
+        channels = self.state["channels"]
+        unresolved = [cid for cid, c in channels.items() if not c["uploads_playlist_id"]]
+        for i in range(0, len(unresolved), 50):  # API limit per request
+            for details in fetch_batch_channel_details(self.youtube, unresolved[i:i + 50]):
+                channels[details["id"]]["uploads_playlist_id"] = details["uploads_playlist_id"]
+
+        now = _now()
+        cutoff = _utc_iso(now - MAX_VIDEO_AGE_DAYS * 86400)
+        videos = self.state["videos"]
+        added = 0
+        for channel_id, c in channels.items():
+            if not c["uploads_playlist_id"]:
+                continue
+            try:
+                uploads = fetch_recent_uploads(self.youtube, c["uploads_playlist_id"], RECENT_UPLOADS)
+            except Exception as e:
+                print(f"Error listing uploads for {c['name']}: {e}")
+                continue
+            for upload in uploads:
+                if upload["video_id"] in videos or upload["published_at"] < cutoff:
+                    continue
+                videos[upload["video_id"]] = {
+                    "channel_id": channel_id,
+                    "title": upload["title"],
+                    "published_at": upload["published_at"],
+                    "last_comment_at": None,
+                    "seen_ids": [],
+                    "last_poll": None,
+                    "velocity": 0.0,
+                    "next_poll": now,
+                }
+                heapq.heappush(self.queue, (now, upload["video_id"]))
+                added += 1
+
+        for video_id in [v for v, info in videos.items() if info["published_at"] < cutoff]:
+            del videos[video_id]
+        self.state["last_channel_poll"] = now
+        print(f"Channels polled: {added} new uploads, watching {len(videos)} videos.")
+
+    # --- Videos ---
+    def poll_video(self, video_id):
+        """
+        Reads, scores and records the comments posted since the last poll.
+        Raises if fetching or scoring fails; the video's state is then left
+        as it was, so the next attempt re-reads the same comments.
+        """
+        video = self.state["videos"][video_id]
+        channel = self.state["channels"][video["channel_id"]]
+        now = _now()
+        comments = fetch_new_comments(
+            self.youtube, video_id, video["last_comment_at"], video["seen_ids"], MAX_PAGES_PER_POLL
+        )
+
+        if comments:
+            df = self.score(pd.DataFrame(comments))
+            df.insert(1, 'channel_id', video["channel_id"])
+            _append_csv(df, WATCH_COMMENTS_FILE)
+            self._update_creator(channel, df)
+
+            # The comments are recorded: only now move the video's read position
+            newest = max(c['timestamp_utc'] for c in comments)
+            if newest != video["last_comment_at"]:
+                video["seen_ids"] = []
+            video["seen_ids"] += [c['comment_id'] for c in comments if c['timestamp_utc'] == newest]
+            video["last_comment_at"] = newest
+            self._check_alert(video, channel, df)
+
+        # Velocity in comments/s since the previous poll (the first poll only seeds it)
+        if video["last_poll"] is not None:
+            velocity = len(comments) / max(now - video["last_poll"], 1.0)
+            smoothed = VELOCITY_SMOOTHING * velocity + (1 - VELOCITY_SMOOTHING) * video["velocity"]
+        else:
+            velocity = smoothed = 0.0
+        interval = next_poll_interval(velocity, smoothed) if video["last_poll"] is not None else MIN_POLL_SECONDS
+        video.update(last_poll=now, velocity=smoothed, next_poll=now + interval, failures=0)
+        heapq.heappush(self.queue, (video["next_poll"], video_id))
+        print(f"  {channel['name']} / {video_id}: {len(comments)} new comments, "
+              f"{60 * velocity:.1f}/min, next poll in {interval:.0f}s")
+
+    def score(self, df):
+        """Adds sentiment (all comments) and keywords (negative ones) like run_analysis."""
+        df['body'] = df['body'].astype(str)
+        labels, scores = self.score_fn(df['body'].tolist())
+        df['sentiment_label'] = labels
+        df['sentiment_score'] = scores
+        df['keywords'] = ""
+        negative_mask = df['sentiment_label'] == 'Negative'
+        if self.keyword_fn is not None and negative_mask.any():
+            df.loc[negative_mask, 'keywords'] = self.keyword_fn(df.loc[negative_mask, 'body'].tolist())
+        return df
+
+    def _update_creator(self, channel, df):
+        counts = df['sentiment_label'].value_counts()
+        for sentiment in SENTIMENTS:
+            channel["counts"][sentiment] += int(counts.get(sentiment, 0))
+        channel["comments"] += len(df)
+        newest = df['timestamp_utc'].max()
+        if channel["last_comment_at"] is None or newest > channel["last_comment_at"]:
+            channel["last_comment_at"] = newest
+
+    def _check_alert(self, video, channel, df):
+        """Flags a poll whose negative share is high and well above the creator's baseline."""
+        if len(df) < ALERT_MIN_COMMENTS:
+            return
+        negative_pct = 100 * (df['sentiment_label'] == 'Negative').mean()
+        previous = channel["comments"] - len(df)
+        baseline = 100 * (channel["counts"]["Negative"] - (df['sentiment_label'] == 'Negative').sum()) / previous \
+            if previous else 0.0
+        if negative_pct >= ALERT_NEGATIVE_PCT and negative_pct - baseline >= ALERT_MARGIN_PCT:
+            print(f"🚨 {channel['name']}: {negative_pct:.0f}% negative across {len(df)} new comments on "
+                  f"'{video['title']}' (baseline {baseline:.0f}%)")
+            top = df.loc[df['sentiment_label'] == 'Negative', 'keywords']
+            _append_csv(pd.DataFrame([{
+                "detected_at": _utc_iso(_now()),
+                "channel_id": video["channel_id"],
+                "name": channel["name"],
+                "video_id": df['video_id'].iloc[0],
+                "comments": len(df),
+                "negative_pct": round(negative_pct, 2),
+                "baseline_pct": round(baseline, 2),
+                "keywords": ", ".join(top[top != ""].head(10)),
+            }]), ALERTS_FILE)
+
+    # --- Main loop ---
+    def _retry_later(self, video_id, error):
+        """Reschedules a failed poll with a growing delay; velocity and position are kept."""
+        video = self.state["videos"][video_id]
+        video["failures"] = video.get("failures", 0) + 1
+        delay = min(MAX_POLL_SECONDS, MIN_POLL_SECONDS * 2 ** (video["failures"] - 1))
+        video["next_poll"] = _now() + delay
+        heapq.heappush(self.queue, (video["next_poll"], video_id))
+        print(f"⚠️ Polling {video_id} failed ({error}); retrying in {delay:.0f}s.")
+
+    def run_once(self):
+        """Polls channels if due, then every video that is due; returns seconds until the next poll."""
+        now = _now()
+        if now - self.state["last_channel_poll"] >= CHANNEL_POLL_SECONDS:
+            try:
+                self.poll_channels()
+            except Exception as e:
+                # Try again next cycle; videos already watched keep their schedule
+                self.state["last_channel_poll"] = now - CHANNEL_POLL_SECONDS + MIN_POLL_SECONDS
+                print(f"⚠️ Polling channels failed ({e}); retrying in {MIN_POLL_SECONDS}s.")
+
+        while self.queue and self.queue[0][0] <= _now():
+            due, video_id = heapq.heappop(self.queue)
+            video = self.state["videos"].get(video_id)
+            if video is None or video["next_poll"] != due:
+                continue  # Dropped, or rescheduled since this entry was pushed
+            try:
+                self.poll_video(video_id)
+            except Exception as e:
+                self._retry_later(video_id, e)
+        self.save_state()
+
+        next_channel_poll = self.state["last_channel_poll"] + CHANNEL_POLL_SECONDS
+        next_due = min([next_channel_poll] + [due for due, _ in self.queue[:1]])
+        return max(0.0, next_due - _now())
+
+    def run(self):
+        print(f"Watching {len(self.state['channels'])} channels (state in {self.state_file}).")
+        try:
+            while True:
+                try:
+                    wait = self.run_once()
+                except Exception as e:
+                    # e.g. the state file could not be written; keep watching
+                    print(f"⚠️ Watch cycle failed ({e}); retrying in {MIN_POLL_SECONDS}s.")
+                    wait = MIN_POLL_SECONDS
+                print(f"Sleeping {wait:.0f}s...")
+                time.sleep(wait)
+        except KeyboardInterrupt:
+            self.save_state()
+            print("Watcher stopped.")
+
+def load_scorers(service_url=None, keywords=True):
+    """
+    (score_fn, keyword_fn) for the watcher. With a service URL comments are
+    scored by the running sentiment service; otherwise the models are loaded
+    here, once, and stay warm between polls.
+    """
+    keyword_fn = None
+    if keywords:
+        from src.data_analyzer import KEYWORD_MODEL_ID, extract_keywords
+        from src.utils.model_registry import get_keybert
+        keyword_model = get_keybert(KEYWORD_MODEL_ID)
+        keyword_fn = lambda texts: extract_keywords(texts, keyword_model, top_n=3)
+
+    if service_url:
+        from src.sentiment_service import analyze_remote
+        return (lambda texts: analyze_remote(texts, service_url)), keyword_fn
+
+    from src.sentiment_service import load_sentiment_fn
+    return load_sentiment_fn(), keyword_fn
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Continuously monitor channel comments.")
+    parser.add_argument("--service", help="Sentiment service URL (default: load the model in-process).")
+    parser.add_argument("--no-keywords", action="store_true", help="Skip keyword extraction.")
+    args = parser.parse_args()
+
+    score_fn, keyword_fn = load_scorers(args.service, keywords=not args.no_keywords)
+    Watcher(setup_youtube_client(), score_fn, keyword_fn).run()
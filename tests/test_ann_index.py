@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from src.embeddings.ann_index import IVFIndex
+from src.graph.similarity_edges import normalize_rows
+from src.utils.benchmark_data import clustered_embeddings
+
+
+def _recall(index, embeddings, ids, queries, k, nprobe):
+    normed = normalize_rows(embeddings)
+    hits = 0
+    for q in queries:
+        exact = set(ids[np.argpartition(-(normed @ normed[q]), k - 1)[:k]])
+        found, _ = index.search(embeddings[q], k, nprobe)
+        hits += len(exact & set(found))
+    return hits / (k * len(queries))
+
+
+@pytest.mark.parametrize("storage, min_recall", [("float32", 0.95), ("int8", 0.9)])
+def test_search_recall_against_brute_force(storage, min_recall):
+    rng = np.random.default_rng(0)
+    embeddings = clustered_embeddings(5000, 32, noise=0.6, rng=rng)
+    ids = np.array([f"creator_{i}" for i in range(len(embeddings))])
+    queries = rng.choice(len(embeddings), 50, replace=False)
+
+    index = IVFIndex.build(embeddings, ids, storage=storage)
+    assert _recall(index, embeddings, ids, queries, k=10, nprobe=8) >= min_recall
+    # Probing every list is an exhaustive scan
+    assert _recall(index, embeddings, ids, queries, k=10, nprobe=len(index.centroids)) >= min_recall
+
+
+def test_added_and_reloaded_vectors_are_searchable(tmp_path):
+    embeddings = clustered_embeddings(2000, 16, noise=0.6, rng=np.random.default_rng(1))
+    index = IVFIndex.build(embeddings[:1500], [f"c{i}" for i in range(1500)])
+    index.add(embeddings[1500:], [f"c{i}" for i in range(1500, 2000)])
+
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    reloaded = IVFIndex.load(path)
+    for row in (3, 1700, 1999):
+        found, scores = reloaded.search(embeddings[row], k=1, nprobe=len(reloaded.centroids))
+        assert found[0] == f"c{row}" and scores[0] == pytest.approx(1.0, abs=1e-5)
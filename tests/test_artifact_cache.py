@@ -0,0 +1,58 @@
+import time
+import pytest
+from src.utils.artifact_cache import LiveArtifact, fingerprint
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+def test_fingerprint_tracks_changes(tmp_path):
+    path = tmp_path / "data.txt"
+    missing = fingerprint([str(path)])
+    path.write_text("v1")
+    first = fingerprint([str(path)])
+    assert first != missing
+    assert fingerprint([str(path)]) == first
+    path.write_text("version 2")
+    assert fingerprint([str(path)]) != first
+
+
+def test_reloads_when_the_file_changes(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("v1")
+    artifact = LiveArtifact([str(path)], path.read_text, poll_interval=0.02)
+    try:
+        assert artifact.get(timeout=5) == "v1"
+        first_version = artifact.version
+
+        path.write_text("version 2")
+        _wait_for(lambda: artifact.get() == "version 2")
+        version, value = artifact.snapshot()
+        assert version != first_version and value == "version 2"
+    finally:
+        artifact.stop()
+
+
+def test_keeps_last_good_value_and_reports_first_load_errors(tmp_path):
+    path = tmp_path / "data.txt"
+    artifact = LiveArtifact([str(path)], path.read_text, poll_interval=0.02)
+    try:
+        # Never loaded: readers get the loader's error instead of waiting forever
+        with pytest.raises(FileNotFoundError):
+            artifact.get(timeout=5)
+
+        path.write_text("v1")
+        _wait_for(lambda: artifact.version is not None)
+        assert artifact.get() == "v1"
+
+        # A failing reload keeps serving the previous version
+        path.unlink()
+        time.sleep(0.2)
+        assert artifact.get() == "v1"
+    finally:
+        artifact.stop()
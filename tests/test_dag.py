@@ -0,0 +1,67 @@
+from src.utils.dag import Stage, Pipeline
+
+
+def _pipeline(tmp_path, calls, threshold=1):
+    source = tmp_path / "source.txt"
+    middle = tmp_path / "middle.txt"
+    final = tmp_path / "final.txt"
+
+    def copy():
+        calls.append("copy")
+        middle.write_text(source.read_text())
+
+    def count():
+        calls.append("count")
+        final.write_text(str(len(middle.read_text()) >= threshold))
+
+    return Pipeline([
+        Stage("copy", copy, inputs=[str(source)], outputs=[str(middle)]),
+        Stage("count", count, inputs=[str(middle)], outputs=[str(final)], deps=["copy"],
+              params={"threshold": threshold}),
+    ], state_dir=str(tmp_path / "state"))
+
+
+def _statuses(results):
+    return {name: result["status"] for name, result in results.items()}
+
+
+def test_up_to_date_stages_are_skipped(tmp_path):
+    (tmp_path / "source.txt").write_text("hello")
+    calls = []
+    assert _statuses(_pipeline(tmp_path, calls).run()) == {"copy": "ran", "count": "ran"}
+    assert _statuses(_pipeline(tmp_path, calls).run()) == {"copy": "skipped", "count": "skipped"}
+    assert calls == ["copy", "count"]
+
+
+def test_changed_input_param_or_output_reruns(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_text("hello")
+    calls = []
+    _pipeline(tmp_path, calls).run()
+
+    # A changed input re-runs its stage and everything downstream
+    source.write_text("hello again")
+    _pipeline(tmp_path, calls).run()
+    assert calls[2:] == ["copy", "count"]
+
+    # A changed param only re-runs that stage
+    _pipeline(tmp_path, calls, threshold=3).run()
+    assert calls[4:] == ["count"]
+
+    # An output edited by hand no longer matches its stamp
+    (tmp_path / "final.txt").write_text("edited")
+    _pipeline(tmp_path, calls, threshold=3).run()
+    assert calls[5:] == ["count"]
+
+
+def test_force_and_failures(tmp_path):
+    (tmp_path / "source.txt").write_text("hello")
+    calls = []
+    _pipeline(tmp_path, calls).run()
+
+    results = _pipeline(tmp_path, calls).run(targets=["count"], force=["count"])
+    assert _statuses(results) == {"copy": "skipped", "count": "ran"}
+
+    (tmp_path / "source.txt").unlink()  # copy now fails, so count is blocked
+    results = _pipeline(tmp_path, calls).run(force=True)
+    assert _statuses(results) == {"copy": "failed", "count": "blocked"}
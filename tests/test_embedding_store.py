@@ -0,0 +1,17 @@
+import numpy as np
+from src.embeddings.store import EmbeddingStore
+
+
+def test_add_skips_duplicate_and_existing_texts(tmp_path):
+    store = EmbeddingStore("test-model", store_dir=str(tmp_path))
+    store.add(["a", "b"], np.array([[1, 0], [0, 1]]))
+
+    # "a" is already stored and "c" is repeated: only the first "c" is appended
+    store.add(["a", "c", "c", "d"], np.array([[9, 9], [2, 2], [7, 7], [3, 3]]))
+
+    assert len(store) == 4
+    np.testing.assert_array_equal(store.get(["a", "b", "c", "d"]), [[1, 0], [0, 1], [2, 2], [3, 3]])
+
+    # The index on disk agrees with the matrix after a reload
+    reloaded = EmbeddingStore("test-model", store_dir=str(tmp_path))
+    np.testing.assert_array_equal(reloaded.get(["d", "c", "a"]), [[3, 3], [2, 2], [1, 0]])
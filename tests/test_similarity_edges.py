@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+from src.graph.similarity_edges import similarity_edges
+
+
+@pytest.mark.parametrize("kwargs", [{"top_k": 5}, {"threshold": 0.5}, {"top_k": 5, "threshold": 0.5}])
+def test_single_node_has_no_edges(kwargs):
+    sources, targets, weights = similarity_edges(np.ones((1, 8), dtype=np.float32), **kwargs)
+    assert len(sources) == len(targets) == len(weights) == 0
+    assert sources.dtype == np.int64 and weights.dtype == np.float32
+
+def test_top_k_keeps_each_pair_once():
+    embeddings = np.random.default_rng(0).normal(size=(20, 8)).astype(np.float32)
+    sources, targets, _ = similarity_edges(embeddings, top_k=3)
+    assert np.all(sources < targets)
+    assert len(set(zip(sources, targets))) == len(sources)